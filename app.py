@@ -1,13 +1,69 @@
-import json
+import profiling  # First, so startup timing starts as early as possible
+import queue
+import threading
 import customtkinter as ctk
 from ui.sidebar_frame import Sidebar
+from ui.splash_screen import SplashScreen
+from ui.image_cache import image_cache
 from ui.home_ui.home_screen import HomeScreen
 from ui.ingredients_ui.ingredient_screen import IngredientScreen
 from ui.data_ui.data_screen import DataScreen
 from viewmodel.nutrition_viewmodel import NutritionViewModel
 from model.user_nutrition_model import UserNutritionModel
+from model.serving_events import ServingEventStore
+from model.ingredient_catalog import IngredientCatalog
+from model.data_manager import read_user_config
+from model.persistence import persistence_worker
 from config import *
 
+
+def load_app_data(report_progress):
+    """
+    Load everything the home screen needs; runs on the bootstrap thread, so it must not touch Tk.
+    :param report_progress: Called with (fraction, message) as loading advances.
+    :return: (user_nutrition_model, ingredient_catalog, [(image path, thumbnail)] for the first cards)
+    """
+    report_progress(0.0, "Loading profile...")
+    user_config_data = read_user_config()
+    image_cache.prune()
+
+    report_progress(0.1, "Loading ingredients...")
+    # Parse the ingredient catalog once and share it between all screens
+    ingredient_catalog = IngredientCatalog()
+
+    report_progress(0.35, "Loading today's intake...")
+    user_nutrition_model = UserNutritionModel(
+        date=user_config_data["date"],
+        weight=user_config_data["weight"],
+        goal_protein=user_config_data["goal_protein"],
+        goal_carbohydrate=user_config_data["goal_carbohydrate"],
+        goal_fat=user_config_data["goal_fat"],
+        goal_calories=user_config_data["goal_calories"],
+        log_path=user_config_data.get("log_path", ""),
+        nutrition_data=user_config_data.get("nutrition_data", {}),
+        consumed_ingredients=user_config_data.get("consumed_ingredients", {}),
+        serving_events=ServingEventStore(),
+        ingredient_catalog=ingredient_catalog,  # Backfills macros of the old consumed_ingredients format
+    )
+
+    report_progress(0.4, "Loading images...")
+    # Warm the thumbnails of the cards the home screen shows first
+    image_paths = []
+    for ingredient in ingredient_catalog.sorted_view("frequency_of_use"):
+        if ingredient.get("image") and ingredient["image"] not in image_paths:
+            image_paths.append(ingredient["image"])
+        if len(image_paths) >= IMAGE_CACHE_SIZE:
+            break
+    thumbnails = []
+    for index, image_path in enumerate(image_paths):
+        report_progress(0.4 + 0.6 * index / len(image_paths), f"Loading images ({index + 1}/{len(image_paths)})...")
+        thumbnail = image_cache.load_thumbnail(image_path, (100, 100))
+        if thumbnail is not None:
+            thumbnails.append((image_path, thumbnail))
+    report_progress(1.0, "Ready")
+    return user_nutrition_model, ingredient_catalog, thumbnails
+
+
 class App(ctk.CTk):
     """
     The main application window for NutriFlow.
@@ -17,12 +73,58 @@ class App(ctk.CTk):
 
         self.title("NutriFlow")
         self.center_window(WIDTH, HEIGHT)
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
 
         # Configure grid layout (2 columns: Sidebar + Main Content)
         self.grid_columnconfigure(0, weight=0)  # Fixed width for Sidebar
         self.grid_columnconfigure(1, weight=1)  # Expandable main content area
         self.grid_rowconfigure(0, weight=1)  # Expandable row
 
+        self.screens = {}
+        self.current_screen = None
+
+        # Show the splash while the data loads on a background thread
+        self.splash_screen = SplashScreen(self)
+        self.bootstrap_queue = queue.Queue()
+        threading.Thread(target=self.run_bootstrap, name="bootstrap", daemon=True).start()
+        self.after(BOOTSTRAP_POLL_MS, self.check_bootstrap)
+        self.after_idle(lambda: profiling.mark("first paint"))
+
+    def run_bootstrap(self):
+        """Bootstrap thread: load the data and pass progress and the result to the main thread."""
+        try:
+            data = load_app_data(lambda fraction, message: self.bootstrap_queue.put(("progress", fraction, message)))
+            self.bootstrap_queue.put(("done", data))
+        except Exception as e:
+            self.bootstrap_queue.put(("error", e))
+
+    def check_bootstrap(self):
+        """Poll the bootstrap thread from the Tk main loop, so the window stays responsive."""
+        while True:
+            try:
+                message = self.bootstrap_queue.get_nowait()
+            except queue.Empty:
+                break
+            if message[0] == "progress":
+                self.splash_screen.set_progress(message[1], message[2])
+            elif message[0] == "done":
+                self.finish_bootstrap(*message[1])
+                return
+            else:
+                print(f"Error loading data in the background: {message[1]}")
+                # Retry on the main thread so a real failure surfaces as it did before
+                self.finish_bootstrap(*load_app_data(self.splash_screen.set_progress))
+                return
+        self.after(BOOTSTRAP_POLL_MS, self.check_bootstrap)
+
+    def finish_bootstrap(self, user_nutrition_model, ingredient_catalog, thumbnails):
+        """Hand off from the splash to the home screen once the data is ready."""
+        self.ingredient_catalog = ingredient_catalog
+        self.nutrition_view_model = NutritionViewModel(user_nutrition_model, self.ingredient_catalog)
+        for image_path, thumbnail in thumbnails:
+            image_cache.put(image_path, (100, 100), thumbnail)
+        profiling.mark("models loaded")
+
         # Tabs and event handling methods
         tabs = ["Home", "Data", "Ingredients"]
 
@@ -33,35 +135,18 @@ class App(ctk.CTk):
         )
         self.sidebar.grid(row=0, column=0, sticky="nsew")
 
-        user_config_data = self.read_user_profile_from_json()
-        user_nutrition_model = UserNutritionModel(
-            date=user_config_data["date"],
-            weight=user_config_data["weight"],
-            goal_protein=user_config_data["goal_protein"],
-            goal_carbohydrate=user_config_data["goal_carbohydrate"],
-            goal_fat=user_config_data["goal_fat"],
-            goal_calories=user_config_data["goal_calories"],
-            log_path=user_config_data.get("log_path", ""),
-            nutrition_data=user_config_data.get("nutrition_data", {}),
-            consumed_ingredients=user_config_data.get("consumed_ingredients", {})
-        )
-        nutrition_view_model = NutritionViewModel(user_nutrition_model)
-
-        # Initialize screens
-        self.screens = {
-            "Home": HomeScreen(self, nutrition_view_model),
-            "Data": DataScreen(self, nutrition_view_model),
-            "Ingredients": IngredientScreen(self),
+        # Screens are built on first use (see get_screen)
+        self.screen_factories = {
+            "Home": lambda: HomeScreen(self, self.nutrition_view_model, self.ingredient_catalog),
+            "Data": lambda: DataScreen(self, self.nutrition_view_model),
+            "Ingredients": lambda: IngredientScreen(self, self.ingredient_catalog),
         }
 
-        # Add screens to Column 1 and hide them initially
-        for screen in self.screens.values():
-            screen.grid(row=0, column=1, sticky="nsew")
-            screen.grid_remove()  # Hide all screens initially
-
         # Display the Home screen by default
-        self.current_screen = "Home"
-        self.screens[self.current_screen].grid()
+        self.show_screen("Home")
+        self.splash_screen.hide()
+        profiling.mark("home screen built")
+        self.after_idle(self.wait_until_interactive)
 
     def center_window(self, width, height):
         """Center the application window on the screen."""
@@ -71,13 +156,46 @@ class App(ctk.CTk):
         y = (screen_height - height) // 2
         self.geometry(f"{width}x{height}+{x}+{y}")
     
-    def read_user_profile_from_json(self):
-        try:
-            with open(USER_CONFIG_PATH, "r") as file:
-                return json.load(file)
-        except FileNotFoundError:
-            print(f"Error: {USER_CONFIG_PATH} not found.")
-            return {}
+    def get_screen(self, name):
+        """Return the named screen, building it (hidden) the first time it is needed."""
+        if name not in self.screens:
+            screen = self.screen_factories[name]()
+            screen.grid(row=0, column=1, sticky="nsew")
+            screen.grid_remove()
+            self.screens[name] = screen
+        return self.screens[name]
+
+    def show_screen(self, name):
+        if name == self.current_screen:
+            return
+        screen = self.get_screen(name)
+        if self.current_screen is not None:
+            self.screens[self.current_screen].grid_remove()
+        self.current_screen = name
+        screen.grid()
+
+    def wait_until_interactive(self):
+        """Once the home screen's first cards are shown, report startup and pre-warm the other screens."""
+        home_screen = self.screens["Home"]
+        if home_screen.ingredients_frame.render_scheduler.is_running():
+            self.after(RENDER_FRAME_MS, self.wait_until_interactive)
+            return
+        profiling.mark("interactive")
+        profiling.report()
+        if PREWARM_SCREENS:
+            self.after(PREWARM_DELAY_MS, self.prewarm_screens)
+
+    def prewarm_screens(self):
+        """Build the screens not built yet, one per callback, so input is never blocked for long."""
+        pending = [name for name in self.screen_factories if name not in self.screens]
+        if pending:
+            self.get_screen(pending[0])
+            self.after(PREWARM_DELAY_MS, self.prewarm_screens)
+
+    def on_close(self):
+        """Write any pending background saves before the window goes away."""
+        persistence_worker.flush()
+        self.destroy()
 
 if __name__ == "__main__":
     window = App()
@@ -7,12 +7,54 @@ WIDTH = 1200
 HEIGHT = 800
 ADD_INGREDIENT_WIDTH=256
 ADD_INGREDIENT_HEIGHT=512
+SUGGESTION_WINDOW_WIDTH=480
+SUGGESTION_WINDOW_HEIGHT=520
+INGREDIENT_CARD_WIDTH = 150
+INGREDIENT_CARD_HEIGHT = 250
+INGREDIENT_CARD_PADDING = 5
+INGREDIENT_GRID_OVERSCAN_ROWS = 1  # Card rows kept bound above and below the visible area
+RENDER_BUDGET_MS = 8  # Time spent building widgets per tick before yielding to Tk
+RENDER_FRAME_MS = 16  # Delay between render ticks, leaving Tk time to draw and handle input
+PREWARM_SCREENS = os.environ.get("NUTRIFLOW_PREWARM", "1") != "0"  # Build hidden screens in idle time
+PREWARM_DELAY_MS = 300  # Wait after the home screen is interactive before pre-warming
+ANIMATION_FRAME_MS = 16  # Tick of the shared animation clock
+PROGRESS_ANIMATION_MS = 600  # Duration of a progress bar animation, whatever the distance
 
 ROOT_PATH = os.path.dirname(os.path.abspath(__file__))
 LOG_PATH = os.path.join(ROOT_PATH, "nutrition_logs")
 IMG_FOLDER_PATH = os.path.join(ROOT_PATH, "data", "image")
 USER_CONFIG_PATH = os.path.join(ROOT_PATH, "data", "user_config.json")
 INGREDIENTS_JSON_PATH = os.path.join(ROOT_PATH, "data", "ingredients.json")
+SQLITE_PATH = os.path.join(ROOT_PATH, "data", "nutriflow.db")
+# "json" keeps the JSON/CSV files; "sqlite" uses SQLITE_PATH (run `python -m model.sqlite_store` first)
+STORAGE_BACKEND = os.environ.get("NUTRIFLOW_STORAGE", "json")
+THUMBNAIL_PATH = os.path.join(ROOT_PATH, "data", "thumbnails")  # Resized ingredient images
+THUMBNAIL_CACHE_LIMIT = 4096  # Thumbnails kept on disk; the least recently used are pruned at startup
+IMAGE_CACHE_SIZE = 256  # Ready CTkImages kept in memory per (path, size)
+IMAGE_DECODE_WORKERS = min(4, os.cpu_count() or 1)  # Threads decoding and resizing images
+IMAGE_POLL_MS = 16  # How often the Tk main thread picks up decoded images
+INGREDIENTS_JOURNAL_PATH = os.path.join(ROOT_PATH, "data", "ingredients_journal.jsonl")
+SERVING_EVENTS_PATH = os.path.join(ROOT_PATH, "data", "serving_events.jsonl")
+SERVING_EVENTS_LIMIT = 5000  # Individual servings kept in the serving history
+RECENT_SERVINGS_SHOWN = 8  # Servings listed on the Data screen
+RECENT_SERVINGS_CACHED = 100  # Newest servings kept in memory, so listing them never reads the file
+HISTORY_PATH = os.path.join(ROOT_PATH, "data", "history.json")  # One compact record per logged day
+HISTORY_WINDOWS = (7, 30, 90)  # Rolling trend windows in days
+RECIPES_PATH = os.path.join(ROOT_PATH, "data", "recipes.json")  # Saved meals made of catalog ingredients
+SOLVER_BUDGET_MS = 50  # Deadline of one portion suggestion; later search stages are skipped past it
+SOLVER_TOP_K = 5  # Portion combinations suggested
+SOLVER_MAX_GRAMS = 300  # Upper bound of a suggested portion per ingredient
+SOLVER_MIN_GRAMS = 5  # Smaller portions are dropped from a suggestion
+SOLVER_PAIR_CANDIDATES = 40  # Best single ingredients combined into pairs
+SOLVER_TRIPLE_CANDIDATES = 15  # Best single ingredients combined into triples
+SOLVER_FREQUENT_LIMIT = 50  # Ingredients searched when restricted to frequently used ones
+JOURNAL_COMPACT_THRESHOLD = 200  # Journal records appended before a background compaction
+PERSIST_DEBOUNCE_SECONDS = 0.3  # Quiet period before pending saves are written in the background
+PERSIST_MAX_DELAY_SECONDS = 2.0  # Upper bound on how long a save can be postponed by newer ones
+REPORT_WORKERS = min(8, os.cpu_count() or 1)  # Threads parsing nutrition logs for a report
+REPORT_PARSE_WINDOW = REPORT_WORKERS * 4  # Parsed report rows kept in flight while streaming
+REPORT_MANIFEST_NAME = ".report_manifest.json"  # Index of the cached parsed rows, stored inside LOG_PATH
+REPORT_ROWS_NAME = ".report_rows.jsonl"  # Cached parsed rows, one JSON line each, stored inside LOG_PATH
 DARK_MODE_IMG = "data/image/dark-mode.png"
 ADD_INGREDIENT_IMG = "data/image/add-ingredient.png"
 
@@ -23,4 +65,9 @@ CONSUMED_PROTEIN = "consumed_protein"
 CONSUMED_CARBOHYDRATE = "consumed_carbohydrate"
 CONSUMED_FAT = "consumed_fat"
 CONSUMED_CALORIES = "consumed_calories"
-LOADING_TIME = 300
\ No newline at end of file
+
+# Column order of the catalog nutrition matrix and of nutrient total vectors
+NUTRIENTS = ("protein", "carbohydrate", "fat", "calories")
+# Key of each nutrient's consumed amount, e.g. CONSUMED_PROTEIN for "protein"
+CONSUMED_KEYS = {nutrient: f"consumed_{nutrient}" for nutrient in NUTRIENTS}
+BOOTSTRAP_POLL_MS = 50  # How often the splash screen checks on the background loaders
\ No newline at end of file
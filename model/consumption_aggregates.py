@@ -0,0 +1,129 @@
+from array import array
+from config import NUTRIENTS
+
+
+class ConsumptionAggregates:
+    """
+    Running per-ingredient totals of the current day: serving count, grams and the macro vector
+    (aligned with NUTRIENTS). Values live in flat typed arrays, one slot per ingredient, so the
+    size depends on how many ingredients were eaten, not how many servings were logged.
+    """
+    def __init__(self):
+        self.names = []
+        self.slots = {}  # ingredient name -> slot in the arrays
+        self.counts = array("q")
+        self.grams = array("d")
+        self.macros = array("d")  # len(NUTRIENTS) values per slot
+
+    @classmethod
+    def from_dict(cls, data, catalog=None):
+        """
+        Build from the user_config.json shape. Accepts the current format
+        ({name: {"count", "grams", "macros"}}), a plain total of grams, and the old format
+        (a list of every serving in grams). Entries without macros get them from the catalog,
+        when given, so later undos subtract real contributions; otherwise they start at 0.
+        """
+        aggregates = cls()
+        for name, value in (data or {}).items():
+            if isinstance(value, dict):
+                grams, macros, count = float(value.get("grams", 0.0)), value.get("macros"), value.get("count", 1)
+            elif isinstance(value, (list, tuple)):
+                grams, macros, count = sum(float(amount) for amount in value), None, len(value)
+            else:
+                grams, macros, count = float(value), None, 1
+            if macros is None:
+                macros = cls.catalog_macros(catalog, name, grams)
+            aggregates.add(name, grams, macros, count)
+        return aggregates
+
+    @staticmethod
+    def catalog_macros(catalog, name, grams):
+        """Macro contribution of grams of a catalog ingredient, computed like UserNutritionModel.intake_delta."""
+        ingredient = catalog.get(name) if catalog is not None else None
+        if ingredient is None:
+            return None
+        nutrition = ingredient.get("nutrition", {})
+        serving_ratio = grams / ingredient.get("reference_serving_size", 99.0)
+        return [(nutrition.get(nutrient) or 0.0) * serving_ratio for nutrient in NUTRIENTS]
+
+    def to_dict(self):
+        """Return the user_config.json shape, one small entry per ingredient."""
+        return {
+            name: {"count": count, "grams": grams, "macros": list(macros)}
+            for name, count, grams, macros in self.items()
+        }
+
+    def add(self, name, grams, macros=None, count=1):
+        """Add servings of an ingredient; macros is its contribution aligned with NUTRIENTS."""
+        slot = self.slots.get(name)
+        if slot is None:
+            slot = len(self.names)
+            self.slots[name] = slot
+            self.names.append(name)
+            self.counts.append(0)
+            self.grams.append(0.0)
+            self.macros.extend([0.0] * len(NUTRIENTS))
+        self.counts[slot] += int(count)
+        self.grams[slot] += float(grams)
+        if macros is not None:
+            offset = slot * len(NUTRIENTS)
+            for index, amount in enumerate(macros):
+                self.macros[offset + index] += float(amount)
+
+    def subtract(self, name, grams, macros=None, count=1):
+        """Take servings added by add() back out; the ingredient is dropped once no serving is left."""
+        slot = self.slots.get(name)
+        if slot is None:
+            return
+        if self.counts[slot] <= int(count):
+            self._drop(slot)
+            return
+        self.counts[slot] -= int(count)
+        self.grams[slot] -= float(grams)
+        if macros is not None:
+            offset = slot * len(NUTRIENTS)
+            for index, amount in enumerate(macros):
+                self.macros[offset + index] -= float(amount)
+
+    def get(self, name):
+        """Return (count, grams, macros) of an ingredient, or None if it was not eaten."""
+        slot = self.slots.get(name)
+        if slot is None:
+            return None
+        return self.counts[slot], self.grams[slot], self.macro_vector(slot)
+
+    def total_grams(self, name):
+        slot = self.slots.get(name)
+        return self.grams[slot] if slot is not None else 0.0
+
+    def macro_vector(self, slot):
+        offset = slot * len(NUTRIENTS)
+        return tuple(self.macros[offset:offset + len(NUTRIENTS)])
+
+    def items(self):
+        """Yield (name, count, grams, macros) in the order ingredients were first eaten."""
+        for slot, name in enumerate(self.names):
+            yield name, self.counts[slot], self.grams[slot], self.macro_vector(slot)
+
+    def _drop(self, slot):
+        del self.slots[self.names.pop(slot)]
+        del self.counts[slot]
+        del self.grams[slot]
+        del self.macros[slot * len(NUTRIENTS):(slot + 1) * len(NUTRIENTS)]
+        for later in range(slot, len(self.names)):
+            self.slots[self.names[later]] = later
+
+    def clear(self):
+        self.__init__()
+
+    def __len__(self):
+        return len(self.names)
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __contains__(self, name):
+        return name in self.slots
+
+    def __repr__(self):
+        return f"ConsumptionAggregates({self.to_dict()})"
@@ -1,13 +1,68 @@
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-import pandas as pd
+import csv
 import json
+import re
 from config import *
 import sys
-from tkinter import filedialog
+import threading
+from model.consumption_aggregates import ConsumptionAggregates
+from model.history_store import HistoryStore
+from model.intake_journal import IntakeJournal
+from model.report_cache import ReportCache
+from model.persistence import atomic_write_json, persistence_worker
 
+ingredients_journal = IntakeJournal()
+sqlite_store = None
+sqlite_store_lock = threading.Lock()
+history_store = None
+history_store_lock = threading.Lock()
+
+# Usage updates waiting for the persistence worker, oldest first
+usage_buffer = []
+usage_buffer_lock = threading.Lock()
+
+
+def get_sqlite_store():
+    """
+    Return the shared SQLiteStore, opening it on first use.
+    An empty database is filled from the JSON and CSV files first, as `python -m model.sqlite_store` does.
+    """
+    global sqlite_store
+    if sqlite_store is None:
+        with sqlite_store_lock:
+            if sqlite_store is None:
+                from model.sqlite_store import SQLiteStore
+                store = SQLiteStore()
+                if not store.has_profile():
+                    print(f"{store.db_path} has no data yet; importing the JSON and CSV files.")
+                    try:
+                        store.migrate_from_files()
+                    except (OSError, ValueError) as e:
+                        store.close()
+                        raise RuntimeError(
+                            f"The SQLite database {store.db_path} is empty and importing the JSON data failed "
+                            f"({e}). Run `python -m model.sqlite_store` once the JSON files are in place, "
+                            f"or unset NUTRIFLOW_STORAGE."
+                        ) from e
+                sqlite_store = store
+    return sqlite_store
+
+
+def get_history_store():
+    """Return the shared HistoryStore, loading history.json on first use."""
+    global history_store
+    if history_store is None:
+        # Reached from the history sync thread and the Tk main thread; only one of them may build it
+        with history_store_lock:
+            if history_store is None:
+                history_store = HistoryStore()
+    return history_store
 
 
 def restart_app():
+        persistence_worker.flush()  # os.execv does not run atexit handlers
         print("Restarting the application...")
         os.execv(sys.executable, [sys.executable, "app.py"])
 
@@ -23,19 +78,27 @@ def get_unique_filename(file_name):
 
     return file_name
 
-def create_new_log_file(data, file_name):
-    file_path = filedialog.asksaveasfilename(
-        title="Save Nutrition Log As",
+def ask_save_path(file_name, title="Save Nutrition Log As"):
+    """Ask where to save a CSV file. Must run on the Tk main thread; returns '' if cancelled."""
+    from tkinter import filedialog
+
+    return filedialog.asksaveasfilename(
+        title=title,
         initialfile=file_name,
         defaultextension=".csv",
         filetypes=(("CSV Files", "*.csv"), ("All Files", "*.*"))
     )
 
+def create_new_log_file(data, file_name):
+    file_path = ask_save_path(file_name)
+
     if not file_path:
         print("No new file created.")
         return None  # Return None if no file is created
 
     try:
+        import pandas as pd  # Deferred: only the CSV paths need pandas, keep it off the startup path
+
         df = pd.DataFrame(data)
         df.to_csv(file_path, index=False, header=False)
         created_file_name = os.path.basename(file_path)  # Extract just the file name
@@ -48,8 +111,10 @@ def create_new_log_file(data, file_name):
 
 
 def load_from_ingredients_json():
-    with open(INGREDIENTS_JSON_PATH, "r") as file:
-        data = json.load(file)
+    if STORAGE_BACKEND == "sqlite":
+        data = get_sqlite_store().load_ingredients()
+    else:
+        data = ingredients_journal.load()
     ingredients = []
     for ingredient_name, details in data.items():
         ingredient_details = details.copy()
@@ -59,74 +124,95 @@ def load_from_ingredients_json():
         ingredients.append(ingredient_details)
     return ingredients
 
-def sort_ingredients(ingredients, criteria="frequency_of_use", descending=True):
-    if criteria in ["protein", "carbohydrate"]:
-        return sorted(
-            ingredients, 
-            key=lambda x: x["nutrition"].get(criteria, 0), 
-            reverse=descending
-        )
-    return sorted(
-        ingredients, 
-        key=lambda x: x.get(criteria, 0), 
-        reverse=descending
-    )
 def write_to_ingredients_json(selected_ingredients):
+    """
+    Record usage of the selected ingredients; a 'frequency_delta' of -1 takes an undone use back.
+    The update is buffered and written by the persistence worker, either to the append-only
+    journal (merged on load, compacted into ingredients.json) or to the SQLite backend.
+    """
+    with usage_buffer_lock:
+        for ingredient in selected_ingredients:
+            record = {"name": ingredient.get("name"), "last_used_date": ingredient.get("last_used_date")}
+            if "custom_serving_size" in ingredient:
+                record["custom_serving_size"] = ingredient["custom_serving_size"]
+            if "frequency_delta" in ingredient:
+                record["frequency_delta"] = ingredient["frequency_delta"]
+            usage_buffer.append(record)
+    persistence_worker.schedule("ingredient_usage", flush_ingredient_usage)
+
+def flush_ingredient_usage():
+    """Write all buffered usage updates in one batch."""
+    with usage_buffer_lock:
+        records = usage_buffer[:]
+        usage_buffer.clear()
+    if not records:
+        return
     try:
-        with open(INGREDIENTS_JSON_PATH, 'r+') as file:
-            data = json.load(file)            
-            df = pd.DataFrame.from_dict(data, orient='index')
-            for ingredient in selected_ingredients:
-                ingredient_name = ingredient.get("name")
-                
-                if ingredient_name in df.index:
-                    if "frequency_of_use" in df.columns:
-                        df.at[ingredient_name, "frequency_of_use"] = df.at[ingredient_name, "frequency_of_use"] + 1
-                    
-                    if "last_used_date" in df.columns:
-                        df.at[ingredient_name, "last_used_date"] = datetime.now().isoformat()
-                    
-                    if "custom_serving_size" in ingredient:
-                        df.at[ingredient_name, "custom_serving_size"] = ingredient["custom_serving_size"]
-                else:
-                    print(f"Ingredient {ingredient_name} not found in data.")
-            
-            df.to_json(INGREDIENTS_JSON_PATH, orient='index', indent=4)
-            # print("ingredient.json updated successfully.")
-
+        if STORAGE_BACKEND == "sqlite":
+            get_sqlite_store().record_usage(records)
+        else:
+            ingredients_journal.append(records)
     except Exception as e:
-        print(f"Error updating ingredient.json: {e}")
+        print(f"Error updating ingredient journal: {e}")
+
+def read_user_config():
+    """Return the stored user profile (user_config.json or the SQLite profile table)."""
+    try:
+        if STORAGE_BACKEND == "sqlite":
+            return get_sqlite_store().read_profile()
+        with open(USER_CONFIG_PATH, "r") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        print(f"Error: {USER_CONFIG_PATH} not found.")
+        return {}
+
+def update_user_config(fields):
+    """
+    Merge top-level fields into the stored user profile.
+    With the SQLite backend only the given fields are rewritten.
+    """
+    if STORAGE_BACKEND == "sqlite":
+        get_sqlite_store().write_profile(fields)
+        return
+    with open(USER_CONFIG_PATH, 'r') as file:
+        data = json.load(file)
+    fields = dict(fields)
+    if "nutrition_data" in fields:
+        data.setdefault("nutrition_data", {}).update(fields.pop("nutrition_data"))
+    data.update(fields)
+    atomic_write_json(USER_CONFIG_PATH, data)
 
 def write_to_user_config(nutrition_view_model):
     """
     Update the user_config.json with consumed ingredients and nutrition data.
+    The fields are captured now and written by the persistence worker; rapid updates coalesce.
     """
-    try:
-        # Load the user configuration data
-        with open(USER_CONFIG_PATH, 'r') as file:
-            data = json.load(file)
-        data["date"] = nutrition_view_model.get_date()
-        data["weight"] = nutrition_view_model.get_weight()
-        data["log_path"] = nutrition_view_model.get_log_path()
-        
-        nutrition_data = nutrition_view_model.get_nutrition_data()
-        data["nutrition_data"].update({
+    nutrition_data = nutrition_view_model.get_nutrition_data()
+    fields = {
+        "date": nutrition_view_model.get_date(),
+        "weight": nutrition_view_model.get_weight(),
+        "log_path": nutrition_view_model.get_log_path(),
+        "nutrition_data": {
             CONSUMED_PROTEIN: float(nutrition_data.get(CONSUMED_PROTEIN, 0.0)),
             CONSUMED_CARBOHYDRATE: float(nutrition_data.get(CONSUMED_CARBOHYDRATE, 0.0)),
             CONSUMED_CALORIES: float(nutrition_data.get(CONSUMED_CALORIES, 0.0)),
             CONSUMED_FAT: float(nutrition_data.get(CONSUMED_FAT, 0.0)),
-        })
-        data["consumed_ingredients"] = nutrition_view_model.get_consumed_ingredients()
+        },
+        "consumed_ingredients": nutrition_view_model.get_consumed_ingredients().to_dict(),
+    }
 
-        # Write updated data back to the user config file
-        with open(USER_CONFIG_PATH, 'w') as file:
-            json.dump(data, file, indent=4)
+    def save():
+        try:
+            update_user_config(fields)
+            # print("user_config.json updated successfully.")
+        except Exception as e:
+            print(f"Error updating user_config.json: {e}")
 
-        # print("user_config.json updated successfully.")
-    except Exception as e:
-        print(f"Error updating user_config.json: {e}")
+    persistence_worker.schedule("user_config", save)
 
 def import_nutrition_data_from_file(nutrition_view_model):
+    from tkinter import filedialog
+
     file_path = filedialog.askopenfilename(
             title="Please Select a Valid CSV File",
             initialdir=LOG_PATH,
@@ -136,6 +222,8 @@ def import_nutrition_data_from_file(nutrition_view_model):
         print("No file selected.")
         return False
     try:
+        import pandas as pd
+
         # Read the CSV file
         df = pd.read_csv(file_path, header=None)
 
@@ -163,7 +251,9 @@ def import_nutrition_data_from_file(nutrition_view_model):
         # Extracting consumed ingredients
         ingredients_df = df.iloc[13:, :2]
         consumed_amount = [json.loads(ingredient) for ingredient in ingredients_df.iloc[:, 1]]
-        user_nutrition_model.consumed_ingredients = dict(zip(ingredients_df[0], consumed_amount))
+        user_nutrition_model.consumed_ingredients = ConsumptionAggregates.from_dict(
+            dict(zip(ingredients_df[0], consumed_amount)), nutrition_view_model.ingredient_catalog
+        )
 
         # print(f"User Profile updated: {user_nutrition_model.__dict__}\n")
         return True
@@ -206,8 +296,8 @@ def export_nutrition_data_to_file(nutrition_view_model):
 
         # Add consumed ingredients data
     consumed_ingredients = nutrition_view_model.get_consumed_ingredients()
-    for ingredient, consumed_amounts in consumed_ingredients.items():
-        csv_data.append([ingredient, consumed_amounts])
+    for ingredient, _, consumed_grams, _ in consumed_ingredients.items():
+        csv_data.append([ingredient, round(consumed_grams, 2)])
     
     return create_new_log_file(csv_data, nutrition_view_model.get_log_path())
 
@@ -238,146 +328,226 @@ def new_nutrition_data_to_file(nutrition_view_model):
         created_file_name = create_new_log_file(csv_data, file_name)
         if not created_file_name:
             return
+        # Keep the finished day queryable by date before the profile is reset. Its log and the new
+        # empty one are marked as sources, so sync_history_with_logs never re-imports their CSVs
+        finished_day = build_report_row(nutrition_view_model)
+        history = get_history_store()
+        history.record_day(
+            HistoryStore.record_from_report_row(finished_day),
+            source=os.path.basename(nutrition_view_model.get_log_path()),
+        )
+        history.add_source(created_file_name)
+        if STORAGE_BACKEND == "sqlite":
+            get_sqlite_store().record_daily_log(nutrition_view_model.get_log_path(), finished_day)
         fresh_user_config(nutrition_view_model, created_file_name)
 
 
 def fresh_user_config(nutrition_view_model, new_file_name):
-    try:
-        with open(USER_CONFIG_PATH, 'r') as file:
-            data = json.load(file)
-        timestamp = datetime.now().strftime("%Y-%m-%d")
-        data["date"] = timestamp
-        data["weight"] = nutrition_view_model.get_weight()
-        data["log_path"] = new_file_name        
-        data["nutrition_data"].update({
+    timestamp = datetime.now().strftime("%Y-%m-%d")
+    fields = {
+        "date": timestamp,
+        "weight": nutrition_view_model.get_weight(),
+        "log_path": new_file_name,
+        "nutrition_data": {
             CONSUMED_PROTEIN: 0.0,
             CONSUMED_CARBOHYDRATE: 0.0,
             CONSUMED_CALORIES: 0.0,
             CONSUMED_FAT: 0.0,
-        })
-        data["consumed_ingredients"] = {}
-
-        # Write updated data back to the user config file
-        with open(USER_CONFIG_PATH, 'w') as file:
-            json.dump(data, file, indent=4)
-
-        print("user_config.json refreshed successfully.")
-    except Exception as e:
-        print(f"Error refreshing user_config.json: {e}")
+        },
+        "consumed_ingredients": {},
+    }
+
+    def save():
+        try:
+            update_user_config(fields)
+            print("user_config.json refreshed successfully.")
+        except Exception as e:
+            print(f"Error refreshing user_config.json: {e}")
+
+    # Shares the "user_config" slot so an older pending save cannot overwrite the fresh profile
+    persistence_worker.schedule("user_config", save)
     
     
-def export_all_logs_to_report(file_name):
-    log_files = [
-        f for f in os.listdir(LOG_PATH)
-        if f.startswith("nutrition_log") and f.endswith(".csv")
+REPORT_TITLES = [
+    "Date",
+    "Weight (kg)",
+    "Protein Goal (g)",
+    "Carbohydrate Goal (g)",
+    "Fat Goal (g)",
+    "Calories Goal (kcal)",
+    "Protein Consumed (g)",
+    "Carbohydrate Consumed (g)",
+    "Fat Consumed (g)",
+    "Calories Consumed (kcal)",
+    "Protein Percentage (%)",
+    "Carbohydrate Percentage (%)",
+    "Fat Percentage (%)",
+    "Calories Percentage (%)",
+    "Consumed Ingredients",
+    "Consumed Amounts (g)",
+]
+
+def build_report_row(nutrition_view_model):
+    """Summarize the current day of the view model as a report row (see REPORT_TITLES)."""
+    user_nutrition_model = nutrition_view_model.user_nutrition_model
+    nutrition_data = nutrition_view_model.get_nutrition_data()
+    percentages = nutrition_view_model.get_nutrition_percentages()
+    consumed_keys = (CONSUMED_PROTEIN, CONSUMED_CARBOHYDRATE, CONSUMED_FAT, CONSUMED_CALORIES)
+    consumed_ingredients = nutrition_view_model.get_consumed_ingredients()
+    return [
+        user_nutrition_model.date,
+        float(user_nutrition_model.weight),
+        float(user_nutrition_model.goal_protein),
+        float(user_nutrition_model.goal_carbohydrate),
+        float(user_nutrition_model.goal_fat),
+        float(user_nutrition_model.goal_calories),
+        *[float(nutrition_data[key]) for key in consumed_keys],
+        *[float(percentages[key]) for key in consumed_keys],
+        ",".join(consumed_ingredients),
+        ",".join(str(float(grams)) for _, _, grams, _ in consumed_ingredients.items()),
     ]
 
-    if not log_files:
-        print("No nutrition log files found.")
-        return False
+def list_log_files(log_path=LOG_PATH):
+    """Return the nutrition log file names in log_path, oldest date first."""
+    def date_order(file_name):
+        # nutrition_log_2025-02-10.csv, then nutrition_log_2025-02-10(1).csv, ...
+        match = re.match(r"nutrition_log_(\d{4}-\d{2}-\d{2})(?:\((\d+)\))?\.csv$", file_name)
+        if not match:
+            return file_name, 0
+        return match.group(1), int(match.group(2) or 0)
 
-    try:
-        titles = [
-            "Date",
-            "Weight (kg)",
-            "Protein Goal (g)",
-            "Carbohydrate Goal (g)",
-            "Fat Goal (g)",
-            "Calories Goal (kcal)",
-            "Protein Consumed (g)",
-            "Carbohydrate Consumed (g)",
-            "Fat Consumed (g)",
-            "Calories Consumed (kcal)",
-            "Protein Percentage (%)",
-            "Carbohydrate Percentage (%)",
-            "Fat Percentage (%)",
-            "Calories Percentage (%)",
-            "Consumed Ingredients",
-            "Consumed Amounts (g)",
-        ]
+    return sorted(
+        (f for f in os.listdir(log_path) if f.startswith("nutrition_log") and f.endswith(".csv")),
+        key=date_order,
+    )
 
-        csv_data = [titles]
+def parse_log_file(file_path):
+    """
+    Parse one nutrition log CSV into a single report row (see REPORT_TITLES).
+    The log layout is fixed: date/weight on line 1, goals on 4, consumed on 7, percentages on 10
+    and one consumed ingredient per line from 13 onwards.
+    """
+    ingredients = []
+    amounts = []
+    rows = {}
+    with open(file_path, "r") as f:
+        for line_number, line in enumerate(f):
+            if line_number < 13:
+                if line_number in (1, 4, 7, 10):
+                    rows[line_number] = line.strip().split(",")
+                continue
 
-        for log_file in log_files:
-            file_path = os.path.join(LOG_PATH, log_file)
-            with open(file_path, "r") as f:
-                lines = f.readlines()
+            # Consumed ingredients and amounts (index 13 onwards)
+            items = line.strip().split(",", 1)  # Only split on the first comma
+            if len(items) > 1:
+                ingredient = items[0].strip()
+                raw_amount = items[1].strip().rstrip(",")  # Remove trailing commas
+
+                if raw_amount.startswith("\"[") and raw_amount.endswith("]\""):
+                    raw_amount = raw_amount[2:-2]  # Remove the extra quotes and brackets
+                elif raw_amount.startswith("[") and raw_amount.endswith("]"):
+                    raw_amount = raw_amount[1:-1]  # Remove just the brackets
+
+                # Now split by commas and sum the amounts
+                amount_list = raw_amount.split(",")
+                try:
+                    total_amount = sum([float(amt.strip()) for amt in amount_list])  # Sum all the amounts
+                    formatted_amount = str(total_amount)  # Convert sum to string
+                except ValueError as e:
+                    print(f"Error converting amount to float: {e}")
+                    formatted_amount = "0.0"  # Set to 0.0 if conversion fails
 
-            date = lines[1].strip().split(",")[0]  # Date from the second row
-            weight_kg = float(lines[1].strip().split(",")[1])  # Weight (kg) from the second row
+                # Append the ingredient and formatted amount
+                ingredients.append(ingredient)
+                amounts.append(formatted_amount)
 
-            goals_row = lines[4].strip().split(",")
-            protein_goal = float(goals_row[0])
-            carbohydrate_goal = float(goals_row[1])
-            fat_goal = float(goals_row[2])
-            calories_goal = float(goals_row[3])
+    date = rows[1][0]  # Date from the second row
+    weight_kg = float(rows[1][1])  # Weight (kg) from the second row
+    goals = [float(value) for value in rows[4][:4]]
+    consumed = [float(value) for value in rows[7][:4]]
+    percentages = [float(value) for value in rows[10][:4]]
 
-            consumed_row = lines[7].strip().split(",")
-            protein_consumed = float(consumed_row[0])
-            carbohydrate_consumed = float(consumed_row[1])
-            fat_consumed = float(consumed_row[2])
-            calories_consumed = float(consumed_row[3])
+    return [date, weight_kg, *goals, *consumed, *percentages, ",".join(ingredients), ",".join(amounts)]
 
-            percentages_row = lines[10].strip().split(",")
-            protein_percentage = float(percentages_row[0])
-            carbohydrate_percentage = float(percentages_row[1])
-            fat_percentage = float(percentages_row[2])
-            calories_percentage = float(percentages_row[3])
+def sync_history_with_logs(log_path=LOG_PATH, current_log=None):
+    """
+    Add the days of nutrition logs not imported into the history store yet; logs of the same date
+    replace each other in file order. Only new logs are parsed.
+    :param current_log: File name of the day in progress; its CSV is not final, so it is skipped.
+    :return: The number of logs imported.
+    """
+    history = get_history_store()
+    imported = 0
+    for log_file in list_log_files(log_path):
+        if log_file == current_log or history.has_source(log_file):
+            continue
+        try:
+            row = parse_log_file(os.path.join(log_path, log_file))
+            history.record_day(HistoryStore.record_from_report_row(row), source=log_file)
+            imported += 1
+        except (OSError, KeyError, IndexError, ValueError) as e:
+            print(f"Error adding {log_file} to the history: {e}")
+    return imported
+
+def export_all_logs_to_report(file_path):
+    """
+    Build a report with one row per nutrition log and stream it to file_path.
+    Logs are parsed in a thread pool while rows are written in date order as they complete;
+    at most REPORT_PARSE_WINDOW parsed rows are held in memory at any time.
+    Rows of logs unchanged since the last report are read back one by one from the ReportCache.
+    Safe to call off the Tk main thread; ask for file_path with ask_save_path first.
+    """
+    log_files = list_log_files()
 
-            # Consumed ingredients and amounts (index 13 onwards)
-            ingredients = []
-            amounts = []
-
-            for line in lines[13:]:
-                items = line.strip().split(",", 1)  # Only split on the first comma
-                if len(items) > 1:
-                    ingredient = items[0].strip()
-                    raw_amount = items[1].strip().rstrip(",")  # Remove trailing commas
-
-                    if raw_amount.startswith("\"[") and raw_amount.endswith("]\""):
-                        raw_amount = raw_amount[2:-2]  # Remove the extra quotes and brackets
-                    elif raw_amount.startswith("[") and raw_amount.endswith("]"):
-                        raw_amount = raw_amount[1:-1]  # Remove just the brackets
-
-                    # Now split by commas and sum the amounts
-                    amount_list = raw_amount.split(",")
-                    try:
-                        total_amount = sum([float(amt.strip()) for amt in amount_list])  # Sum all the amounts
-                        formatted_amount = str(total_amount)  # Convert sum to string
-                    except ValueError as e:
-                        print(f"Error converting amount to float: {e}")
-                        formatted_amount = "0.0"  # Set to 0.0 if conversion fails
-
-                    # Append the ingredient and formatted amount
-                    ingredients.append(ingredient)
-                    amounts.append(formatted_amount)
-
-            ingredients = ",".join(ingredients)
-            amounts = ",".join(amounts)
-
-            # Append extracted row to csv_data
-            csv_data.append([
-                date,
-                weight_kg,
-                protein_goal,
-                carbohydrate_goal,
-                fat_goal,
-                calories_goal,
-                protein_consumed,
-                carbohydrate_consumed,
-                fat_consumed,
-                calories_consumed,
-                protein_percentage,
-                carbohydrate_percentage,
-                fat_percentage,
-                calories_percentage,
-                ingredients,
-                amounts,
-            ])
-        create_new_log_file(csv_data, file_name)
+    if not log_files:
+        print("No nutrition log files found.")
+        return False
+
+    report_cache = ReportCache()
+    try:
+        parsed_count = 0
+
+        with ThreadPoolExecutor(max_workers=REPORT_WORKERS) as executor, \
+                open(file_path, "w", newline="") as report:
+            writer = csv.writer(report)
+            writer.writerow(REPORT_TITLES)
+            pending = deque()
+
+            def write_next():
+                log_file, stat, row = pending.popleft()
+                try:
+                    if isinstance(row, Future):
+                        row = row.result()
+                    report_cache.store(log_file, stat, row)
+                    writer.writerow(row)
+                except Exception as e:
+                    print(f"Skipping unreadable log {log_file}: {e}")
+
+            for log_file in log_files:
+                log_file_path = os.path.join(LOG_PATH, log_file)
+                try:
+                    stat = os.stat(log_file_path)
+                except OSError as e:
+                    print(f"Skipping unreadable log {log_file}: {e}")  # Deleted or renamed since listing
+                    continue
+                row = report_cache.lookup(log_file, stat)
+                if row is None:
+                    row = executor.submit(parse_log_file, log_file_path)
+                    parsed_count += 1
+                pending.append((log_file, stat, row))
+                if len(pending) >= REPORT_PARSE_WINDOW:
+                    write_next()
+            while pending:
+                write_next()
+
+        report_cache.save()
+        print(f"Parsed {parsed_count} of {len(log_files)} logs; the rest came from the report cache.")
+
+        print(f"Report created: {os.path.basename(file_path)}")
         return True
 
     except Exception as e:
+        report_cache.discard()
         print(f"Failed to export logs: {e}")
         return False
     
@@ -385,20 +555,6 @@ def export_all_logs_to_report(file_name):
     
 def add_ingredient_to_ingredients_json(new_ingredient):
     try:
-        # Load existing JSON data
-        if os.path.exists(INGREDIENTS_JSON_PATH):
-            with open(INGREDIENTS_JSON_PATH, 'r+', encoding='utf-8') as file:
-                try:
-                    data = json.load(file)
-                except json.JSONDecodeError:
-                    data = {}  # Handle empty or invalid JSON files
-        else:
-            data = {}
-
-        # Get the last ID and increment it
-        last_id = max([int(v["id"]) for v in data.values()], default=0)
-        new_id = last_id + 1
-
         # Generate key from name
         raw_name = new_ingredient["name"]
         key_name = raw_name.lower().replace(" ", "_")
@@ -415,9 +571,9 @@ def add_ingredient_to_ingredients_json(new_ingredient):
             for key, value in new_ingredient["nutrition"].items()
             if key in nutrition_mapping
         }
-        # Create the new ingredient entry
+        # Create the new ingredient entry; the id is assigned by the storage backend below
         new_entry = {
-            "id": new_id,
+            "id": None,
             "name": raw_name,
             "reference_serving_size": 100,
             "custom_serving_size": 0,
@@ -427,14 +583,38 @@ def add_ingredient_to_ingredients_json(new_ingredient):
             "last_used_date": None  # Explicitly set to null
         }
 
-        # Add new ingredient to the dictionary
-        data[key_name] = new_entry
+        if STORAGE_BACKEND == "sqlite":
+            store = get_sqlite_store()
+            new_entry["id"] = store.next_ingredient_id()
+            store.add_ingredient(key_name, new_entry)
+            print(f"Added ingredient: {raw_name}")
+            return key_name, new_entry
+
+        # Serialize with journal compaction, which also rewrites ingredients.json
+        with ingredients_journal.write_lock:
+            # Load existing JSON data
+            if os.path.exists(INGREDIENTS_JSON_PATH):
+                with open(INGREDIENTS_JSON_PATH, 'r+', encoding='utf-8') as file:
+                    try:
+                        data = json.load(file)
+                    except json.JSONDecodeError:
+                        data = {}  # Handle empty or invalid JSON files
+            else:
+                data = {}
+
+            # Get the last ID and increment it
+            last_id = max([int(v["id"]) for v in data.values()], default=0)
+            new_entry["id"] = last_id + 1
 
-        # Save updated JSON
-        with open(INGREDIENTS_JSON_PATH, 'w', encoding='utf-8') as file:
-            json.dump(data, file, indent=4)
+            # Add new ingredient to the dictionary
+            data[key_name] = new_entry
 
-        print(f"Added ingredient: {raw_name}")
+            # Save updated JSON
+            atomic_write_json(INGREDIENTS_JSON_PATH, data)
+
+            print(f"Added ingredient: {raw_name}")
+            return key_name, new_entry
 
     except Exception as e:
-        print(f"Error adding ingredient: {e}")
\ No newline at end of file
+        print(f"Error adding ingredient: {e}")
+        return None
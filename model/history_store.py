@@ -0,0 +1,193 @@
+import json
+import threading
+from array import array
+from datetime import date as date_type
+from config import HISTORY_PATH, HISTORY_WINDOWS, NUTRIENTS
+from model.persistence import atomic_write_json, persistence_worker
+
+# Per-day values summed by the prefix arrays: recorded days, weight, consumed and goals per nutrient
+FIELD_COUNT = 2 + 2 * len(NUTRIENTS)
+CONSUMED_OFFSET = 2
+GOALS_OFFSET = 2 + len(NUTRIENTS)
+
+
+class HistoryStore:
+    """
+    One compact record per day (weight, goals and consumed macros), persisted to HISTORY_PATH.
+    Days are kept in calendar slots with running prefix sums, so the totals and averages of any
+    date range, including the rolling HISTORY_WINDOWS, are two lookups instead of a log scan.
+    Appending a newer day extends the prefix sums in O(1).
+    """
+    def __init__(self, history_path=HISTORY_PATH):
+        self.history_path = history_path
+        self.lock = threading.RLock()
+        self.first_day = None  # date ordinal of slot 0
+        self.days = []  # slot -> record dict, or None for a day without a record
+        self.prefix = array("d", [0.0] * FIELD_COUNT)  # FIELD_COUNT sums per slot boundary
+        self.sources = set()  # Log files already imported
+        self._load()
+
+    @staticmethod
+    def record_from_report_row(row):
+        """Build a day record from a report row (see REPORT_TITLES in data_manager)."""
+        count = len(NUTRIENTS)
+        return {
+            "date": str(row[0])[:10],
+            "weight": float(row[1]),
+            "goals": [float(value) for value in row[2:2 + count]],
+            "consumed": [float(value) for value in row[2 + count:2 + 2 * count]],
+        }
+
+    def record_day(self, record, source=None):
+        """Add or replace the record of record['date']; source is the log file it came from."""
+        with self.lock:
+            ordinal = date_type.fromisoformat(record["date"]).toordinal()
+            if self.first_day is None:
+                self.first_day = ordinal
+            if ordinal < self.first_day:
+                # Older than everything so far: shift the slots and rebuild
+                self.days = [None] * (self.first_day - ordinal) + self.days
+                self.first_day = ordinal
+                self.days[0] = record
+                self._rebuild_prefix(0)
+            else:
+                slot = ordinal - self.first_day
+                if slot < len(self.days):
+                    self.days[slot] = record
+                    self._rebuild_prefix(slot)
+                else:
+                    while len(self.days) < slot:
+                        self._append_slot(None)
+                    self._append_slot(record)
+            if source:
+                self.sources.add(source)
+        persistence_worker.schedule("history", self.save)
+
+    def add_source(self, source):
+        """Mark a log file as known without importing it, e.g. the log of the day in progress."""
+        with self.lock:
+            self.sources.add(source)
+        persistence_worker.schedule("history", self.save)
+
+    def has_source(self, source):
+        with self.lock:
+            return source in self.sources
+
+    def get(self, day):
+        """Return the record of a date string, or None."""
+        with self.lock:
+            if not self.days:
+                return None
+            slot = self._slot(day)
+            return self.days[slot] if 0 <= slot < len(self.days) else None
+
+    def query(self, start_date, end_date):
+        """
+        Summarize the recorded days with start_date <= date <= end_date (ISO date strings).
+        :return: dict with 'days', 'weight', 'consumed' and 'goals' averages per recorded day,
+                 'totals' of consumed per nutrient, and the range actually covered.
+        """
+        with self.lock:
+            if not self.days:
+                return self._summary(None, None, [0.0] * FIELD_COUNT)
+            first = max(0, self._slot(start_date))
+            last = min(len(self.days) - 1, self._slot(end_date))
+            if first > last:
+                return self._summary(None, None, [0.0] * FIELD_COUNT)
+            return self._summary(first, last, self._range_sums(first, last))
+
+    def records_between(self, start_date, end_date):
+        """Return the day records with start_date <= date <= end_date, oldest first."""
+        with self.lock:
+            if not self.days:
+                return []
+            first = max(0, self._slot(start_date))
+            last = min(len(self.days) - 1, self._slot(end_date))
+            return [record for record in self.days[first:last + 1] if record is not None]
+
+    def rolling(self, window):
+        """Summary of the last window calendar days, ending at the newest recorded day."""
+        with self.lock:
+            if not self.days:
+                return self._summary(None, None, [0.0] * FIELD_COUNT)
+            last = len(self.days) - 1
+            first = max(0, last - window + 1)
+            return self._summary(first, last, self._range_sums(first, last))
+
+    def trends(self):
+        """Return {window: rolling(window)} for every HISTORY_WINDOWS."""
+        return {window: self.rolling(window) for window in HISTORY_WINDOWS}
+
+    def save(self):
+        with self.lock:
+            data = {
+                "records": [record for record in self.days if record is not None],
+                "sources": sorted(self.sources),
+            }
+        try:
+            atomic_write_json(self.history_path, data, indent=None)
+        except OSError as e:
+            print(f"Error saving history: {e}")
+
+    def __len__(self):
+        with self.lock:
+            return sum(1 for record in self.days if record is not None)
+
+    def _slot(self, day):
+        return date_type.fromisoformat(str(day)[:10]).toordinal() - self.first_day
+
+    def _values(self, record):
+        if record is None:
+            return [0.0] * FIELD_COUNT
+        return [1.0, record["weight"], *record["consumed"], *record["goals"]]
+
+    def _append_slot(self, record):
+        self.days.append(record)
+        offset = len(self.prefix) - FIELD_COUNT
+        self.prefix.extend(
+            self.prefix[offset + index] + value for index, value in enumerate(self._values(record))
+        )
+
+    def _rebuild_prefix(self, slot):
+        del self.prefix[(slot + 1) * FIELD_COUNT:]
+        records = self.days[slot:]
+        del self.days[slot:]
+        for record in records:
+            self._append_slot(record)
+
+    def _range_sums(self, first, last):
+        start = first * FIELD_COUNT
+        end = (last + 1) * FIELD_COUNT
+        return [self.prefix[end + index] - self.prefix[start + index] for index in range(FIELD_COUNT)]
+
+    def _summary(self, first, last, sums):
+        days = int(sums[0])
+        average = (lambda value: round(value / days, 2)) if days else (lambda value: 0.0)
+        return {
+            "start": date_type.fromordinal(self.first_day + first).isoformat() if first is not None else None,
+            "end": date_type.fromordinal(self.first_day + last).isoformat() if last is not None else None,
+            "days": days,
+            "weight": average(sums[1]),
+            "totals": {nutrient: round(sums[CONSUMED_OFFSET + index], 2) for index, nutrient in enumerate(NUTRIENTS)},
+            "consumed": {nutrient: average(sums[CONSUMED_OFFSET + index]) for index, nutrient in enumerate(NUTRIENTS)},
+            "goals": {nutrient: average(sums[GOALS_OFFSET + index]) for index, nutrient in enumerate(NUTRIENTS)},
+        }
+
+    def _load(self):
+        try:
+            with open(self.history_path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Error reading history: {e}")
+            return
+        records = sorted(data.get("records", []), key=lambda record: record["date"])
+        if records:
+            self.first_day = date_type.fromisoformat(records[0]["date"]).toordinal()
+            for record in records:
+                slot = date_type.fromisoformat(record["date"]).toordinal() - self.first_day
+                while len(self.days) < slot:
+                    self._append_slot(None)
+                self._append_slot(record)
+        self.sources = set(data.get("sources", []))
@@ -0,0 +1,265 @@
+import os
+from datetime import datetime
+from config import INGREDIENTS_JSON_PATH, NUTRIENTS, STORAGE_BACKEND
+from model.data_manager import (
+    add_ingredient_to_ingredients_json,
+    get_sqlite_store,
+    ingredients_journal,
+    load_from_ingredients_json,
+    write_to_ingredients_json,
+)
+from model.persistence import persistence_worker
+from model.recipe_book import RecipeBook
+from model.search_index import SearchIndex
+from model.sorted_views import ChainedView, SortedViews
+
+
+class IngredientCatalog:
+    """
+    Shared in-memory ingredient catalog, owned by the App and passed to every screen.
+    ingredients.json is parsed once and only re-read when the file changes on disk.
+    Recipes (see RecipeBook) live alongside the ingredients in `recipes`.
+    """
+    def __init__(self, catalog_path=INGREDIENTS_JSON_PATH, journal=ingredients_journal):
+        self.catalog_path = catalog_path
+        self.journal = journal
+        self.ingredients = []  # Ingredient dictionaries in file order
+        self.by_key = {}
+        self.by_id = {}
+        self.positions = {}  # ingredient key -> file order
+        self.sorted_views = SortedViews(self.by_key, self.positions)
+        self.search_index = SearchIndex()
+        self.matrix = None  # Cached (nutrition matrix, reference serving sizes), rows in file order
+        self.file_stamp = None
+        self.load()
+        self.recipes = RecipeBook(self)
+
+    def load(self):
+        """Parse ingredients.json (with pending journal records) and rebuild the indexes."""
+        self.ingredients = load_from_ingredients_json()
+        self.by_key = {ingredient["name"]: ingredient for ingredient in self.ingredients}
+        self.by_id = {ingredient["id"]: ingredient for ingredient in self.ingredients}
+        self.positions = {ingredient["name"]: index for index, ingredient in enumerate(self.ingredients)}
+        self.sorted_views.reset(self.by_key, self.positions)
+        self.search_index.clear()
+        for ingredient in self.ingredients:
+            self.index_ingredient(ingredient)
+        self.matrix = None
+        self.file_stamp = self._file_stamp()
+        if hasattr(self, "recipes"):
+            self.recipes.invalidate()  # Every ingredient entry was replaced
+
+    def refresh(self):
+        """
+        Reload the catalog only if ingredients.json changed on disk since it was last read.
+        :return: True if the catalog was reloaded.
+        """
+        stamp = self._file_stamp()
+        if stamp == self.file_stamp:
+            return False
+        if stamp == self.journal.compacted_stamp:
+            # Our own compaction rewrote the file with records the catalog already holds
+            self.file_stamp = stamp
+            return False
+        persistence_worker.flush()  # Land buffered usage updates so the reload includes them
+        self.load()
+        return True
+
+    def all(self):
+        """Return every ingredient in file order. The list is shared and must not be mutated."""
+        return self.ingredients
+
+    def get(self, key):
+        return self.by_key.get(key)
+
+    def get_by_id(self, ingredient_id):
+        return self.by_id.get(ingredient_id)
+
+    def sorted_view(self, criteria):
+        """
+        Return a live, read-only view of the catalog in the given order.
+        'name' is ascending; 'frequency_of_use', 'last_used_date', 'protein' and 'carbohydrate'
+        are descending. Ties keep file order.
+        """
+        return self.sorted_views.view(criteria)
+
+    def nutrition_matrix(self):
+        """
+        Return the catalog's nutrition as compact float arrays, built once and cached.
+        :return: (matrix, reference_serving_sizes) where matrix is ingredients x NUTRIENTS per
+                 reference serving and rows follow file order (see row_of).
+        """
+        if self.matrix is None:
+            import numpy as np  # Deferred until the first nutrition total, keeping it off the startup path
+
+            count = len(self.ingredients)
+            matrix = np.zeros((count, len(NUTRIENTS)), dtype=np.float64)
+            reference_serving_sizes = np.empty(count, dtype=np.float64)
+            for row, ingredient in enumerate(self.ingredients):
+                nutrition = ingredient.get("nutrition", {})
+                matrix[row] = [nutrition.get(nutrient) or 0.0 for nutrient in NUTRIENTS]
+                reference_serving_sizes[row] = ingredient.get("reference_serving_size") or 100.0
+            self.matrix = (matrix, reference_serving_sizes)
+        return self.matrix
+
+    def row_of(self, key):
+        """Return the nutrition matrix row of an ingredient key."""
+        return self.positions[key]
+
+    def selection_totals(self, ingredients, serving_sizes=None):
+        """
+        Total nutrients of a selection as one vectorized dot product.
+        :param ingredients: Ingredient dictionaries (or keys) from this catalog.
+        :param serving_sizes: Grams per ingredient; defaults to each ingredient's custom_serving_size.
+        :return: A float array aligned with NUTRIENTS.
+        """
+        import numpy as np
+
+        matrix, reference_serving_sizes = self.nutrition_matrix()
+        entries = [self.by_key[item] if isinstance(item, str) else item for item in ingredients]
+        if serving_sizes is None:
+            serving_sizes = [entry.get("custom_serving_size", 0.0) for entry in entries]
+        totals = np.zeros(len(NUTRIENTS), dtype=np.float64)
+        if any(entry.get("recipe") for entry in entries):
+            # A recipe is one add of its cached per-100g vector
+            for entry, grams in zip(entries, serving_sizes):
+                if entry.get("recipe"):
+                    totals += np.asarray(self.recipes.nutrition_vector(entry)) * (float(grams) / 100.0)
+            pairs = [(entry, grams) for entry, grams in zip(entries, serving_sizes) if not entry.get("recipe")]
+            entries = [entry for entry, _ in pairs]
+            serving_sizes = [grams for _, grams in pairs]
+        rows = np.fromiter(
+            (self.positions[entry["name"]] for entry in entries), dtype=np.intp, count=len(entries)
+        )
+        grams = np.asarray(serving_sizes, dtype=np.float64)
+        return totals + (grams / reference_serving_sizes[rows]) @ matrix[rows]
+
+    def expand_recipes(self, selected_ingredients):
+        """Replace the recipes of a selection by their components, scaled to the grams typed on the recipe card."""
+        expanded = []
+        for ingredient in selected_ingredients:
+            if ingredient.get("recipe"):
+                expanded.extend(self.recipes.expand(ingredient))
+            else:
+                expanded.append(ingredient)
+        return expanded
+
+    def with_recipes(self, ingredients, query=None):
+        """Return the recipes (matching query, if given) followed by ingredients, without copying them."""
+        return ChainedView(self.recipes.entries(query), ingredients)
+
+    def search(self, query):
+        """Return ingredients matching the query, ranked best match first."""
+        return [self.by_key[key] for key in self.search_index.search(query)]
+
+    def index_ingredient(self, ingredient):
+        """Make an ingredient findable by its name and any 'aliases' listed in ingredients.json."""
+        key = ingredient["name"]
+        self.search_index.add(key, [key.replace("_", " "), *ingredient.get("aliases", [])])
+
+    def __len__(self):
+        return len(self.ingredients)
+
+    def __iter__(self):
+        return iter(self.ingredients)
+
+    def __contains__(self, key):
+        return key in self.by_key
+
+    def record_usage(self, selected_ingredients):
+        """
+        Apply an intake to the in-memory entries and append it to the usage journal.
+        :param selected_ingredients: Ingredient dictionaries taken from this catalog.
+        :return: The usage changes, one dict per ingredient, for revert_usage and apply_usage.
+        """
+        timestamp = datetime.now().isoformat()
+        usage = []
+        for ingredient in selected_ingredients:
+            if ingredient.get("recipe"):
+                # A recipe uses each of its components, keeping their own typed serving sizes
+                targets = [{"name": key} for key, _ in ingredient["components"]]
+            else:
+                targets = [ingredient]
+            for target in targets:
+                entry = self.by_key.get(target.get("name"))
+                if entry is None:
+                    continue
+                change = {
+                    "name": entry["name"],
+                    "last_used_date": timestamp,
+                    "previous_last_used_date": entry.get("last_used_date"),
+                }
+                if "custom_serving_size" in target:
+                    change["custom_serving_size"] = target["custom_serving_size"]
+                usage.append(change)
+        self.apply_usage(usage)
+        return usage
+
+    def apply_usage(self, usage, sign=1):
+        """
+        Bump (sign=1) or take back (sign=-1) usage changes from record_usage, in memory and in the
+        journal. Taking back restores the previous last_used_date; the typed serving size stays.
+        """
+        records = []
+        for change in usage:
+            entry = self.by_key.get(change["name"])
+            if entry is None:
+                continue
+            entry["frequency_of_use"] = max(0, entry.get("frequency_of_use", 0) + sign)
+            entry["last_used_date"] = change["last_used_date"] if sign > 0 else change["previous_last_used_date"]
+            record = {"name": change["name"], "last_used_date": entry["last_used_date"]}
+            if sign > 0 and "custom_serving_size" in change:
+                entry["custom_serving_size"] = change["custom_serving_size"]
+                record["custom_serving_size"] = change["custom_serving_size"]
+            if sign != 1:
+                record["frequency_delta"] = sign
+            records.append(record)
+            self.sorted_views.update(entry)
+        write_to_ingredients_json(records)
+
+    def revert_usage(self, usage):
+        """Undo the usage changes returned by record_usage."""
+        self.apply_usage(list(reversed(usage)), sign=-1)
+
+    def add(self, new_ingredient):
+        """
+        Persist a new ingredient from the Add Ingredient window and insert it into the catalog.
+        :return: The new ingredient dictionary, or None if it could not be saved or the name is used by a recipe.
+        """
+        # Same key as add_ingredient_to_ingredients_json; recipes and ingredients share one key space
+        key_name = new_ingredient["name"].lower().replace(" ", "_")
+        if key_name in self.recipes:
+            print(f"Cannot add ingredient {new_ingredient['name']}: the name is used by a recipe.")
+            return None
+        result = add_ingredient_to_ingredients_json(new_ingredient)
+        if result is None:
+            return None
+        key_name, details = result
+        ingredient = details.copy()
+        ingredient["name"] = key_name
+
+        previous = self.by_key.get(key_name)
+        if previous is not None:
+            self.ingredients[self.ingredients.index(previous)] = ingredient
+            self.by_id.pop(previous["id"], None)
+        else:
+            self.ingredients.append(ingredient)
+            self.positions[key_name] = len(self.positions)
+        self.by_key[key_name] = ingredient
+        self.by_id[ingredient["id"]] = ingredient
+        self.sorted_views.update(ingredient)
+        self.index_ingredient(ingredient)
+        self.matrix = None
+        self.recipes.invalidate(key_name)
+        self.file_stamp = self._file_stamp()
+        return ingredient
+
+    def _file_stamp(self):
+        if STORAGE_BACKEND == "sqlite":
+            # Only commits from other connections bump data_version, so our own writes never force a reload
+            return "sqlite", get_sqlite_store().data_version()
+        try:
+            stat = os.stat(self.catalog_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
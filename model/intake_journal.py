@@ -0,0 +1,157 @@
+import json
+import os
+import threading
+from datetime import datetime
+from config import INGREDIENTS_JSON_PATH, INGREDIENTS_JOURNAL_PATH, JOURNAL_COMPACT_THRESHOLD
+
+
+class IntakeJournal:
+    """
+    Append-only journal of ingredient usage updates.
+    Each intake appends one small JSON line per ingredient instead of rewriting ingredients.json.
+    Records are merged into the catalog on load and folded back into the JSON file by compact().
+    """
+    def __init__(self, journal_path=INGREDIENTS_JOURNAL_PATH, catalog_path=INGREDIENTS_JSON_PATH,
+                 compact_threshold=JOURNAL_COMPACT_THRESHOLD):
+        self.journal_path = journal_path
+        self.pending_path = f"{journal_path}.compacting"
+        self.catalog_path = catalog_path
+        self.compact_threshold = compact_threshold
+
+        # `lock` guards journal file transitions, `write_lock` serializes rewrites of the catalog file
+        self.lock = threading.RLock()
+        self.write_lock = threading.Lock()
+        self.record_count = None
+        self.compaction_thread = None
+        self.compacted_stamp = None  # (mtime_ns, size) of the catalog file after our last compaction
+
+    def append(self, selected_ingredients):
+        """
+        Append one usage record per selected ingredient.
+        :param selected_ingredients: A list of ingredient dictionaries containing at least 'name'.
+                                     'last_used_date' defaults to now when missing, unless the
+                                     record carries a 'frequency_delta' (an undone use).
+        """
+        timestamp = datetime.now().isoformat()
+        lines = []
+        for ingredient in selected_ingredients:
+            record = {"name": ingredient.get("name"), "last_used_date": ingredient.get("last_used_date") or timestamp}
+            if "custom_serving_size" in ingredient:
+                record["custom_serving_size"] = ingredient["custom_serving_size"]
+            if "frequency_delta" in ingredient:
+                # An undo restores the previous date, which may be None
+                record["last_used_date"] = ingredient.get("last_used_date")
+                record["frequency_delta"] = ingredient["frequency_delta"]
+            lines.append(json.dumps(record) + "\n")
+
+        if not lines:
+            return
+        with self.lock:
+            if self.record_count is None:
+                self.record_count = self.count_records()
+            with open(self.journal_path, "a", encoding="utf-8") as file:
+                file.writelines(lines)
+            self.record_count += len(lines)
+            # Decided under the lock: a running compaction may reset record_count to None
+            should_compact = self.record_count >= self.compact_threshold
+
+        if should_compact:
+            self.compact_in_background()
+
+    def read_records(self):
+        """Return all journal records that have not been compacted yet, oldest first."""
+        records = []
+        with self.lock:
+            for path in (self.pending_path, self.journal_path):
+                records.extend(self._read_file(path))
+        return records
+
+    def count_records(self):
+        with self.lock:
+            return sum(len(self._read_file(path)) for path in (self.pending_path, self.journal_path))
+
+    def load(self):
+        """Load ingredients.json with all pending journal records applied."""
+        with self.lock:
+            with open(self.catalog_path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+            return self.apply(data, self.read_records())
+
+    @staticmethod
+    def apply(data, records):
+        """
+        Merge usage records into the raw ingredients dictionary (keyed by ingredient key).
+        Unknown ingredients are reported and skipped, matching the old DataFrame update.
+        """
+        for record in records:
+            details = data.get(record.get("name"))
+            if details is None:
+                print(f"Ingredient {record.get('name')} not found in data.")
+                continue
+            details["frequency_of_use"] = max(0, details.get("frequency_of_use", 0) + record.get("frequency_delta", 1))
+            details["last_used_date"] = record.get("last_used_date")
+            if "custom_serving_size" in record:
+                details["custom_serving_size"] = record["custom_serving_size"]
+        return data
+
+    def compact_in_background(self):
+        """Start a compaction on a daemon thread unless one is already running."""
+        with self.lock:
+            if self.compaction_thread is not None and self.compaction_thread.is_alive():
+                return
+            self.compaction_thread = threading.Thread(target=self.compact, daemon=True)
+            self.compaction_thread.start()
+
+    def compact(self):
+        """Fold all journal records into ingredients.json and clear the journal."""
+        with self.write_lock:
+            with self.lock:
+                # Rotate the live journal so new appends do not wait for the rewrite below
+                if os.path.exists(self.journal_path):
+                    if os.path.exists(self.pending_path):
+                        with open(self.journal_path, "r", encoding="utf-8") as source, \
+                                open(self.pending_path, "a", encoding="utf-8") as target:
+                            target.write(source.read())
+                        os.remove(self.journal_path)
+                    else:
+                        os.replace(self.journal_path, self.pending_path)
+                if not os.path.exists(self.pending_path):
+                    return
+                records = self._read_file(self.pending_path)
+
+            try:
+                with open(self.catalog_path, "r", encoding="utf-8") as file:
+                    data = json.load(file)
+                data = self.apply(data, records)
+
+                temp_path = f"{self.catalog_path}.tmp"
+                with open(temp_path, "w", encoding="utf-8") as file:
+                    json.dump(data, file, indent=4)
+                    file.flush()
+                    os.fsync(file.fileno())
+
+                with self.lock:
+                    os.replace(temp_path, self.catalog_path)
+                    os.remove(self.pending_path)
+                    self.record_count = None
+                    stat = os.stat(self.catalog_path)
+                    self.compacted_stamp = (stat.st_mtime_ns, stat.st_size)
+            except Exception as e:
+                print(f"Error compacting ingredient journal: {e}")
+
+    @staticmethod
+    def _read_file(path):
+        if not os.path.exists(path):
+            return []
+        records = []
+        with open(path, "r", encoding="utf-8") as file:
+            for line in file:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # A torn final line from an interrupted append carries no usable update
+                    print(f"Skipping malformed journal record in {path}.")
+        return records
@@ -0,0 +1,80 @@
+import copy
+import uuid
+
+
+class IntakeLog:
+    """
+    Event log of the intakes committed this session, with undo and redo.
+    Each event keeps the nutrition delta (totals aligned with NUTRIENTS), the servings behind it
+    and the catalog usage it changed, so undo and redo apply or invert one event in O(1) instead of
+    reloading the day. The consumed state is always snapshot + every applied event, in order.
+    """
+    def __init__(self, snapshot):
+        self.snapshot = snapshot  # UserNutritionModel.snapshot() before the first event
+        self.events = []  # Applied events, oldest first
+        self.undone = []  # Undone events, the next one to redo last
+
+    def record(self, servings, totals, usage):
+        """
+        Append a committed intake; recording a new intake drops the redo history.
+        :param servings: (name, grams, contribution) per ingredient, from UserNutritionModel.intake_delta.
+        :param totals: The nutrient delta vector of the intake.
+        :param usage: The catalog usage changes, from IngredientCatalog.record_usage.
+        """
+        # Ids are unique across sessions, since the serving history refers to them
+        event = {"id": uuid.uuid4().hex, "servings": servings, "totals": totals, "usage": usage}
+        self.events.append(event)
+        self.undone.clear()
+        return event
+
+    def undo(self):
+        """Move the newest event to the redo history; return it, or None if there is nothing to undo."""
+        if not self.events:
+            return None
+        event = self.events.pop()
+        self.undone.append(event)
+        return event
+
+    def redo(self):
+        """Re-apply the last undone event; return it, or None if there is nothing to redo."""
+        if not self.undone:
+            return None
+        event = self.undone.pop()
+        self.events.append(event)
+        return event
+
+    def can_undo(self):
+        return bool(self.events)
+
+    def can_redo(self):
+        return bool(self.undone)
+
+    def replay(self, user_nutrition_model):
+        """Rebuild the consumed state of user_nutrition_model from the snapshot and the applied events."""
+        user_nutrition_model.restore_snapshot(self.snapshot)
+        for event in self.events:
+            user_nutrition_model.apply_intake(event["servings"], event["totals"], log_servings=False)
+
+    def verify(self, user_nutrition_model, tolerance=1e-6):
+        """
+        Replay into a copy of user_nutrition_model and compare with its live state. This is O(events),
+        so it is meant for explicit consistency checks, not for the undo/redo path.
+        :return: True if the consumed totals and per-ingredient aggregates match.
+        """
+        replayed = copy.copy(user_nutrition_model)  # replay replaces the copy's state, not the live one
+        self.replay(replayed)
+        if any(abs(replayed.nutrition_data[key] - value) > tolerance
+               for key, value in user_nutrition_model.nutrition_data.items()):
+            return False
+        live = user_nutrition_model.consumed_ingredients
+        if set(live) != set(replayed.consumed_ingredients):
+            return False
+        for name, count, grams, macros in live.items():
+            replayed_count, replayed_grams, replayed_macros = replayed.consumed_ingredients.get(name)
+            if count != replayed_count or abs(grams - replayed_grams) > tolerance \
+                    or any(abs(a - b) > tolerance for a, b in zip(macros, replayed_macros)):
+                return False
+        return True
+
+    def __len__(self):
+        return len(self.events)
@@ -0,0 +1,137 @@
+import time
+from itertools import combinations
+import numpy as np
+from config import (
+    NUTRIENTS,
+    SOLVER_BUDGET_MS,
+    SOLVER_FREQUENT_LIMIT,
+    SOLVER_MAX_GRAMS,
+    SOLVER_MIN_GRAMS,
+    SOLVER_PAIR_CANDIDATES,
+    SOLVER_TOP_K,
+    SOLVER_TRIPLE_CANDIDATES,
+)
+
+
+class MacroSolver:
+    """
+    Suggests portions of catalog ingredients that close the gap to the remaining goals.
+    Deviation is the squared error per nutrient, relative to that nutrient's goal, so grams of
+    protein and kcal weigh alike. Portions are bounded to [0, max_grams] per ingredient.
+    The search runs in stages, each vectorized over the catalog's nutrition matrix:
+    every single ingredient in closed form, then pairs and triples of the best candidates as
+    small bounded least-squares problems. A stage is skipped once the deadline has passed.
+    """
+    def __init__(self, catalog):
+        self.catalog = catalog
+
+    def suggest(self, remaining, goals, top_k=SOLVER_TOP_K, frequent_only=False,
+                max_grams=SOLVER_MAX_GRAMS, budget_ms=SOLVER_BUDGET_MS):
+        """
+        :param remaining: {nutrient: amount still to eat}, nutrients as in NUTRIENTS.
+        :param goals: {nutrient: daily goal}, used to weigh the nutrients.
+        :param frequent_only: Only search the SOLVER_FREQUENT_LIMIT most used ingredients.
+        :return: Up to top_k suggestions, best first, each a dict with 'portions' (list of
+                 (ingredient dict, grams)), 'totals' (aligned with NUTRIENTS) and 'deviation'
+                 (root mean square deviation from the remaining amounts, as a fraction of the goals).
+        """
+        deadline = time.perf_counter() + budget_ms / 1000.0
+        matrix, reference_serving_sizes = self.catalog.nutrition_matrix()
+        rows = self.candidate_rows(frequent_only)
+        if not len(rows) or not any(remaining.get(nutrient, 0) > 0 for nutrient in NUTRIENTS):
+            return []
+
+        weights = 1.0 / np.array([max(float(goals.get(nutrient) or 0.0), 1.0) for nutrient in NUTRIENTS])
+        target = np.array([max(float(remaining.get(nutrient) or 0.0), 0.0) for nutrient in NUTRIENTS])
+        per_gram = matrix[rows] / reference_serving_sizes[rows, None]
+        scaled = per_gram * weights  # Rows: weighted nutrients per gram
+        scaled_target = target * weights
+
+        # Single ingredients: g = clip(b.t / b.b) minimizes |g b - t|^2 on the segment
+        norms = np.einsum("ij,ij->i", scaled, scaled)
+        projections = scaled @ scaled_target
+        with np.errstate(divide="ignore", invalid="ignore"):
+            grams = np.clip(np.where(norms > 0, projections / norms, 0.0), 0.0, max_grams)
+        residuals = scaled_target @ scaled_target - 2 * grams * projections + grams * grams * norms
+        useful = np.flatnonzero(grams >= SOLVER_MIN_GRAMS)
+        candidates = [((index,), (grams[index],)) for index in useful[np.argsort(residuals[useful])][:top_k * 4]]
+
+        for size, limit in ((2, SOLVER_PAIR_CANDIDATES), (3, SOLVER_TRIPLE_CANDIDATES)):
+            if time.perf_counter() > deadline or len(useful) < size:
+                break
+            pool = self.candidate_pool(scaled, residuals, useful, limit)
+            combos = np.array(list(combinations(pool, size)), dtype=np.intp)
+            combo_grams = self.solve_bounded(scaled[combos], scaled_target, max_grams)
+            combo_residuals = self.residuals(scaled[combos], combo_grams, scaled_target)
+            for position in np.argsort(combo_residuals)[:top_k * 4]:
+                candidates.append((tuple(combos[position]), tuple(combo_grams[position])))
+
+        return self.rank(candidates, rows, per_gram, weights, target, top_k)
+
+    def candidate_rows(self, frequent_only):
+        """Return the nutrition matrix rows to search."""
+        if frequent_only:
+            view = self.catalog.sorted_view("frequency_of_use")
+            keys = [ingredient["name"] for ingredient in view[:SOLVER_FREQUENT_LIMIT]]
+            return np.array([self.catalog.row_of(key) for key in keys], dtype=np.intp)
+        return np.arange(len(self.catalog), dtype=np.intp)
+
+    @staticmethod
+    def candidate_pool(scaled, residuals, useful, limit):
+        """
+        Pick the ingredients to combine: the best singles plus the densest source of each
+        nutrient, so complementary ingredients (e.g. a protein and a carbohydrate) meet.
+        """
+        best = list(useful[np.argsort(residuals[useful])][:limit // 2])
+        lengths = np.linalg.norm(scaled[useful], axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            purity = np.where(lengths[:, None] > 0, scaled[useful] / lengths[:, None], 0.0)
+        per_nutrient = max(1, (limit - len(best)) // len(NUTRIENTS))
+        for column in range(len(NUTRIENTS)):
+            best.extend(useful[np.argsort(-purity[:, column])][:per_nutrient])
+        return list(dict.fromkeys(int(index) for index in best))[:limit]
+
+    @staticmethod
+    def solve_bounded(vectors, target, max_grams, passes=3):
+        """
+        Least squares for a batch of small combinations, vectors shaped (combos, size, nutrients):
+        the unconstrained normal equations, clipped to [0, max_grams], then a few passes of
+        projected coordinate descent to settle the clipped coordinates.
+        """
+        gram = vectors @ vectors.transpose(0, 2, 1)
+        rhs = vectors @ target
+        size = gram.shape[-1]
+        ridge = 1e-9 * (np.trace(gram, axis1=1, axis2=2)[:, None, None] + 1.0) * np.eye(size)
+        grams = np.clip(np.linalg.solve(gram + ridge, rhs[..., None])[..., 0], 0.0, max_grams)
+        diagonal = np.diagonal(gram, axis1=1, axis2=2)
+        for _ in range(passes):
+            for coordinate in range(size):
+                others = np.einsum("ij,ij->i", gram[:, coordinate, :], grams) - diagonal[:, coordinate] * grams[:, coordinate]
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    value = np.where(diagonal[:, coordinate] > 0, (rhs[:, coordinate] - others) / diagonal[:, coordinate], 0.0)
+                grams[:, coordinate] = np.clip(value, 0.0, max_grams)
+        return grams
+
+    @staticmethod
+    def residuals(vectors, grams, target):
+        totals = np.einsum("ij,ijk->ik", grams, vectors)
+        return np.sum((totals - target) ** 2, axis=1)
+
+    def rank(self, candidates, rows, per_gram, weights, target, top_k):
+        """Round portions to whole grams, drop tiny ones and duplicates, and keep the top_k."""
+        suggestions = {}
+        for indexes, grams in candidates:
+            portions = [(index, round(float(amount))) for index, amount in zip(indexes, grams)
+                        if amount >= SOLVER_MIN_GRAMS]
+            if not portions:
+                continue
+            key = frozenset(index for index, _ in portions)
+            totals = sum(per_gram[index] * amount for index, amount in portions)
+            deviation = float(np.sqrt(np.mean(((totals - target) * weights) ** 2)))
+            if key not in suggestions or deviation < suggestions[key]["deviation"]:
+                suggestions[key] = {
+                    "portions": [(self.catalog.all()[rows[index]], amount) for index, amount in portions],
+                    "totals": [float(amount) for amount in totals],
+                    "deviation": deviation,
+                }
+        return sorted(suggestions.values(), key=lambda suggestion: suggestion["deviation"])[:top_k]
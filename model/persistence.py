@@ -0,0 +1,86 @@
+import atexit
+import json
+import os
+import threading
+import time
+from config import PERSIST_DEBOUNCE_SECONDS, PERSIST_MAX_DELAY_SECONDS
+
+
+def atomic_write_json(path, data, indent=4):
+    """Write JSON to a temp file, fsync it and rename it over path, so readers never see a partial file."""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump(data, file, indent=indent)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
+
+
+class PersistenceWorker:
+    """
+    Write-behind saver. Saves are scheduled under a name; a newer save with the same name replaces
+    the pending one, and everything pending is written on a background thread once no new save
+    arrived for the debounce period (or max_delay after the first one).
+    """
+    def __init__(self, debounce=PERSIST_DEBOUNCE_SECONDS, max_delay=PERSIST_MAX_DELAY_SECONDS):
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.pending = {}  # name -> callable, in scheduling order
+        self.first_scheduled = None
+        self.last_scheduled = None
+        self.condition = threading.Condition()
+        self.run_lock = threading.Lock()  # Held while saves run, so flush() waits for an in-flight write
+        self.thread = None
+
+    def schedule(self, name, task):
+        """Queue task() to run in the background, replacing any pending task with the same name."""
+        with self.condition:
+            self.pending.pop(name, None)
+            self.pending[name] = task
+            now = time.monotonic()
+            if self.first_scheduled is None:
+                self.first_scheduled = now
+            self.last_scheduled = now
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._run, name="persistence-worker", daemon=True)
+                self.thread.start()
+            self.condition.notify()
+
+    def flush(self):
+        """Run every pending save now on the calling thread. Call before exiting or restarting."""
+        with self.run_lock:
+            self._run_tasks(self._take_pending())
+
+    def _take_pending(self):
+        with self.condition:
+            tasks = list(self.pending.values())
+            self.pending.clear()
+            self.first_scheduled = None
+            self.last_scheduled = None
+        return tasks
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while not self.pending:
+                    self.condition.wait()
+                while self.pending:
+                    deadline = min(self.last_scheduled + self.debounce, self.first_scheduled + self.max_delay)
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.condition.wait(remaining)
+            with self.run_lock:
+                self._run_tasks(self._take_pending())
+
+    @staticmethod
+    def _run_tasks(tasks):
+        for task in tasks:
+            try:
+                task()
+            except Exception as e:
+                print(f"Error saving data in the background: {e}")
+
+
+persistence_worker = PersistenceWorker()
+atexit.register(persistence_worker.flush)
@@ -0,0 +1,163 @@
+import json
+from config import NUTRIENTS, RECIPES_PATH
+from model.persistence import atomic_write_json, persistence_worker
+
+
+class RecipeBook:
+    """
+    Saved meals made of catalog ingredients, stored in RECIPES_PATH as
+    {key: {"components": [[ingredient key, grams], ...]}}.
+    Each recipe is exposed as an ingredient-shaped entry ('recipe' is True) so it can be shown and
+    selected as a single card. Its 'nutrition' is the per-100g vector of the whole meal, computed
+    once and cached until invalidate() is called for one of its components.
+    """
+    def __init__(self, catalog, recipes_path=RECIPES_PATH):
+        self.catalog = catalog
+        self.recipes_path = recipes_path
+        self.recipes = {}  # recipe key -> entry
+        self.dependents = {}  # ingredient key -> keys of the recipes using it
+        self.stale = set()  # Recipes whose nutrition vector must be recomputed
+        self._load()
+
+    def entries(self, query=None):
+        """Return the recipe entries, optionally only those whose name contains query."""
+        self.refresh()
+        if not query:
+            return list(self.recipes.values())
+        query = query.lower().replace(" ", "_")
+        return [entry for key, entry in self.recipes.items() if query in key]
+
+    def get(self, key):
+        entry = self.recipes.get(key)
+        if entry is not None and key in self.stale:
+            self.refresh()
+        return entry
+
+    def add(self, name, components):
+        """
+        Save a recipe, replacing one with the same name.
+        :param components: (ingredient key, grams) pairs; repeated ingredients are merged.
+        :return: The recipe entry, or None if the name is taken by an ingredient or nothing is in it.
+        """
+        key = name.strip().lower().replace(" ", "_")
+        if not key or key in self.catalog:
+            print(f"Cannot save recipe {name}: the name is empty or used by an ingredient.")
+            return None
+        grams_by_key = {}
+        for ingredient_key, grams in components:
+            if ingredient_key in self.catalog and float(grams) > 0:
+                grams_by_key[ingredient_key] = grams_by_key.get(ingredient_key, 0.0) + float(grams)
+        if not grams_by_key:
+            print(f"Cannot save recipe {name}: it has no ingredients.")
+            return None
+
+        if key in self.recipes:
+            self._unlink(key)
+        self.recipes[key] = self._entry(key, [[ingredient_key, grams] for ingredient_key, grams in grams_by_key.items()])
+        self.refresh()
+        persistence_worker.schedule("recipes", self.save)
+        return self.recipes[key]
+
+    def invalidate(self, ingredient_key=None):
+        """Mark the recipes using ingredient_key (every recipe when None) for recomputation."""
+        if ingredient_key is None:
+            self.stale.update(self.recipes)
+        else:
+            self.stale.update(self.dependents.get(ingredient_key, ()))
+
+    def refresh(self):
+        """Recompute the nutrition of stale recipes; a no-op while every cached vector is valid."""
+        for key in self.stale:
+            entry = self.recipes.get(key)
+            if entry is None:
+                continue
+            total_grams = entry["total_grams"]
+            totals = [0.0] * len(NUTRIENTS)
+            image = None
+            for ingredient_key, grams in entry["components"]:
+                ingredient = self.catalog.get(ingredient_key)
+                if ingredient is None:
+                    continue
+                ratio = grams / (ingredient.get("reference_serving_size") or 100.0)
+                nutrition = ingredient.get("nutrition", {})
+                for index, nutrient in enumerate(NUTRIENTS):
+                    totals[index] += (nutrition.get(nutrient) or 0.0) * ratio
+                image = image or ingredient.get("image")
+            entry["vector"] = [amount * 100.0 / total_grams for amount in totals]
+            entry["nutrition"] = {nutrient: round(amount, 2) for nutrient, amount in zip(NUTRIENTS, entry["vector"])}
+            entry["image"] = image
+        self.stale.clear()
+
+    def nutrition_vector(self, entry):
+        """Return the cached per-100g nutrition of a recipe entry, aligned with NUTRIENTS."""
+        if entry["name"] in self.stale:
+            self.refresh()
+        return entry["vector"]
+
+    def expand(self, entry):
+        """
+        Return the components of a recipe entry as ingredient-shaped dicts, scaled to the grams
+        typed on its card, e.g. for UserNutritionModel.intake_delta.
+        """
+        scale = entry.get("custom_serving_size", entry["total_grams"]) / entry["total_grams"]
+        components = []
+        for ingredient_key, grams in entry["components"]:
+            ingredient = self.catalog.get(ingredient_key)
+            if ingredient is None:
+                continue
+            components.append({
+                "name": ingredient_key,
+                "nutrition": ingredient.get("nutrition", {}),
+                "reference_serving_size": ingredient.get("reference_serving_size") or 100.0,
+                "custom_serving_size": grams * scale,
+            })
+        return components
+
+    def save(self):
+        data = {key: {"components": entry["components"]} for key, entry in self.recipes.items()}
+        try:
+            atomic_write_json(self.recipes_path, data)
+        except OSError as e:
+            print(f"Error saving recipes: {e}")
+
+    def __len__(self):
+        return len(self.recipes)
+
+    def __contains__(self, key):
+        return key in self.recipes
+
+    def _entry(self, key, components):
+        for ingredient_key, _ in components:
+            self.dependents.setdefault(ingredient_key, set()).add(key)
+        self.stale.add(key)
+        total_grams = sum(grams for _, grams in components)
+        return {
+            "id": f"recipe:{key}",
+            "name": key,
+            "recipe": True,
+            "components": components,
+            "total_grams": total_grams,
+            "reference_serving_size": 100,
+            "custom_serving_size": total_grams,
+            "nutrition": {nutrient: 0.0 for nutrient in NUTRIENTS},
+            "vector": [0.0] * len(NUTRIENTS),
+            "image": None,
+        }
+
+    def _unlink(self, key):
+        for ingredient_key, _ in self.recipes[key]["components"]:
+            self.dependents.get(ingredient_key, set()).discard(key)
+
+    def _load(self):
+        try:
+            with open(self.recipes_path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Error reading recipes: {e}")
+            return
+        for key, recipe in data.items():
+            components = [[ingredient_key, float(grams)] for ingredient_key, grams in recipe.get("components", [])]
+            if components and sum(grams for _, grams in components) > 0:
+                self.recipes[key] = self._entry(key, components)
@@ -0,0 +1,89 @@
+import json
+import os
+from config import LOG_PATH, REPORT_MANIFEST_NAME, REPORT_ROWS_NAME
+
+
+class ReportCache:
+    """
+    Persisted cache of parsed report rows, stored next to the nutrition logs.
+    The manifest only indexes the rows ({file name: mtime, size, offset and length}); the rows
+    themselves live in a JSON-lines file and are read one at a time with a seek, so a report never
+    holds more rows in memory than its parse window.
+    An entry is reused while its log's file name, mtime and size are unchanged, so regenerating a
+    report only re-parses new or modified logs. Each report rewrites the rows file with the rows it
+    wrote, which also drops the entries of deleted logs.
+    """
+    def __init__(self, log_path=LOG_PATH):
+        self.manifest_path = os.path.join(log_path, REPORT_MANIFEST_NAME)
+        self.rows_path = os.path.join(log_path, REPORT_ROWS_NAME)
+        self.entries = self._load()
+        self.new_entries = {}
+        self.rows_file = None  # Previous rows, opened on the first lookup
+        self.new_rows_file = None  # Rows of this report, written to a temp file
+
+    def lookup(self, file_name, stat):
+        """Return the cached report row for a log, or None if it is missing or stale."""
+        entry = self.entries.get(file_name)
+        if entry is None or "offset" not in entry \
+                or entry["mtime_ns"] != stat.st_mtime_ns or entry["size"] != stat.st_size:
+            return None
+        try:
+            if self.rows_file is None:
+                self.rows_file = open(self.rows_path, "rb")
+            self.rows_file.seek(entry["offset"])
+            return json.loads(self.rows_file.read(entry["length"]))
+        except (OSError, ValueError):
+            return None
+
+    def store(self, file_name, stat, row):
+        """Keep the row of a log written to this report, parsed or taken from the cache."""
+        if self.new_rows_file is None:
+            self.new_rows_file = open(f"{self.rows_path}.tmp", "wb")
+        line = (json.dumps(row) + "\n").encode("utf-8")
+        self.new_entries[file_name] = {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "offset": self.new_rows_file.tell(),
+            "length": len(line),
+        }
+        self.new_rows_file.write(line)
+
+    def save(self):
+        """Replace the cache with the rows stored by this report."""
+        self.close()
+        if self.new_entries == self.entries:
+            self.discard()  # Same rows at the same offsets; the current files stay valid
+            return
+        try:
+            if self.new_entries:
+                os.replace(f"{self.rows_path}.tmp", self.rows_path)
+            temp_path = f"{self.manifest_path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump(self.new_entries, file)
+            os.replace(temp_path, self.manifest_path)
+            self.entries = self.new_entries
+        except OSError as e:
+            print(f"Error saving report manifest: {e}")
+
+    def discard(self):
+        """Drop the rows stored by this report, e.g. after it failed."""
+        self.close()
+        try:
+            os.remove(f"{self.rows_path}.tmp")
+        except FileNotFoundError:
+            pass
+
+    def close(self):
+        for file in (self.rows_file, self.new_rows_file):
+            if file is not None:
+                file.close()
+        self.rows_file = None
+        self.new_rows_file = None
+
+    def _load(self):
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as file:
+                entries = json.load(file)
+            return entries if isinstance(entries, dict) else {}
+        except (OSError, json.JSONDecodeError):
+            return {}
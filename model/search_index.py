@@ -0,0 +1,128 @@
+import heapq
+import re
+from collections import Counter, defaultdict
+
+
+class SearchIndex:
+    """
+    Trigram index over ingredient names and aliases.
+    Lookups only touch the postings of the query's trigrams, so search cost does not grow with
+    catalog size, and partial trigram overlap makes results tolerant of typos.
+    A single typed character has no trigram yet, so characters are indexed too (word initials and
+    the rest); one-letter queries return only the SHORT_QUERY_LIMIT best of those postings.
+    """
+    # Fraction of query trigrams a name has to share to be returned
+    MIN_SCORE = 0.5
+    # Results of a one-letter query, which can match most of the catalog
+    SHORT_QUERY_LIMIT = 200
+
+    def __init__(self):
+        self.postings = defaultdict(set)  # trigram -> ingredient keys
+        self.initials = defaultdict(set)  # first letter of each word -> ingredient keys
+        self.texts = {}  # ingredient key -> normalized searchable text
+        self.grams = {}  # ingredient key -> trigrams of that text
+        self.letters = defaultdict(set)  # character -> keys containing it, not at a word start
+
+    @staticmethod
+    def normalize(text):
+        """Lowercase and reduce text to space-separated alphanumeric words."""
+        return " ".join(re.findall(r"[a-z0-9]+", str(text).lower()))
+
+    @staticmethod
+    def word_grams(word, complete=True):
+        """
+        Return the trigrams of a padded word.
+        :param complete: False for the word still being typed, so no trailing boundary is assumed.
+        """
+        padded = f" {word} " if complete else f" {word}"
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+    def add(self, key, names):
+        """
+        Index (or re-index) an ingredient.
+        :param key: The ingredient key, e.g. 'chicken_breast'.
+        :param names: Names and aliases the ingredient should be found by.
+        """
+        self.remove(key)
+        text = " ".join(filter(None, (self.normalize(name) for name in names)))
+        words = set(text.split())
+        grams = set()
+        for word in words:
+            grams |= self.word_grams(word)
+            self.initials[word[0]].add(key)
+        for gram in grams:
+            self.postings[gram].add(key)
+        self.texts[key] = text
+        self.grams[key] = grams
+        for letter, initial in self.key_letters(text):
+            if not initial:
+                self.letters[letter].add(key)
+
+    def remove(self, key):
+        if key not in self.texts:
+            return
+        text = self.texts.pop(key)
+        for gram in self.grams.pop(key):
+            self.postings[gram].discard(key)
+        for word in set(text.split()):
+            self.initials[word[0]].discard(key)
+        for letter, initial in self.key_letters(text):
+            if not initial:
+                self.letters[letter].discard(key)
+
+    def clear(self):
+        self.postings.clear()
+        self.initials.clear()
+        self.texts.clear()
+        self.grams.clear()
+        self.letters.clear()
+
+    @staticmethod
+    def key_letters(text):
+        """Yield (character, starts a word) for each distinct character of a normalized text."""
+        initials = {word[0] for word in text.split()}
+        for letter in set(text.replace(" ", "")):
+            yield letter, letter in initials
+
+    def search(self, query):
+        """
+        Return ingredient keys matching the query, best match first.
+        Exact substring matches rank above fuzzy ones, then shorter names first.
+        """
+        query = self.normalize(query)
+        words = query.split()
+        if not words:
+            return []
+
+        query_grams = set()
+        for index, word in enumerate(words):
+            query_grams |= self.word_grams(word, complete=index < len(words) - 1)
+
+        if not query_grams:
+            # A single typed letter has no trigram yet: the best words starting with it, then names containing it
+            return self.short_search(query)
+
+        hits = Counter()
+        for gram in query_grams:
+            hits.update(self.postings.get(gram, ()))
+        candidates = {
+            key: count / len(query_grams)
+            for key, count in hits.items()
+            if count / len(query_grams) >= self.MIN_SCORE
+        }
+
+        def rank(key):
+            text = self.texts[key]
+            return (query not in text, -candidates[key], len(text), text)
+
+        return sorted(candidates, key=rank)
+
+    def short_search(self, letter, limit=SHORT_QUERY_LIMIT):
+        """Return up to limit keys for a one-letter query, picked from the letter's postings without a full sort."""
+        def rank(key):
+            return len(self.texts[key]), self.texts[key], key
+
+        keys = heapq.nsmallest(limit, self.initials.get(letter, ()), key=rank)
+        if len(keys) < limit:
+            keys += heapq.nsmallest(limit - len(keys), self.letters.get(letter, ()), key=rank)
+        return keys
@@ -0,0 +1,103 @@
+import json
+import os
+import threading
+from collections import deque
+from datetime import datetime
+from config import RECENT_SERVINGS_CACHED, SERVING_EVENTS_LIMIT, SERVING_EVENTS_PATH
+from model.persistence import persistence_worker
+
+
+class ServingEventStore:
+    """
+    Bounded history of individual servings, kept apart from user_config.json.
+    Events are appended to a JSON-lines file by the persistence worker; once the file holds twice
+    the limit, it is rewritten with only the newest max_events.
+    The newest servings that were not undone are also kept in memory, filled from the file once and
+    then on every append, so recent() neither waits for pending writes nor reads the file.
+    """
+    def __init__(self, events_path=SERVING_EVENTS_PATH, max_events=SERVING_EVENTS_LIMIT,
+                 recent_limit=RECENT_SERVINGS_CACHED):
+        self.events_path = events_path
+        self.max_events = max_events
+        self.pending = []  # Events not written yet, oldest first
+        self.lock = threading.Lock()
+        self.recent_events = deque(maxlen=recent_limit)  # Newest servings not undone, oldest first
+        self.line_count = None  # Lines in the file, counted when loading
+        self._load()
+
+    def append(self, name, grams, logged_at=None, intake=None):
+        """
+        Record one serving; it is written in the background.
+        :param intake: Id of the IntakeLog event the serving belongs to, so an undo can refer to it.
+        """
+        logged_at = logged_at or datetime.now().isoformat()
+        event = {"logged_at": logged_at, "date": logged_at[:10], "name": name, "grams": float(grams)}
+        if intake is not None:
+            event["intake"] = intake
+        self._queue(event)
+
+    def append_undo(self, intake, logged_at=None):
+        """Record that the servings of an intake were undone; recent() leaves them out."""
+        logged_at = logged_at or datetime.now().isoformat()
+        self._queue({"logged_at": logged_at, "date": logged_at[:10], "undo": intake})
+
+    def _queue(self, event):
+        with self.lock:
+            self.pending.append(event)
+            self._remember(event)
+        persistence_worker.schedule("serving_events", self.flush)
+
+    def _remember(self, event):
+        if "undo" in event:
+            # Drops the servings of the intake logged (or redone) before this undo
+            kept = [serving for serving in self.recent_events if serving.get("intake") != event["undo"]]
+            self.recent_events.clear()
+            self.recent_events.extend(kept)
+        else:
+            self.recent_events.append(event)
+
+    def flush(self):
+        with self.lock:
+            events = self.pending[:]
+            self.pending.clear()
+        if not events:
+            return
+        try:
+            with open(self.events_path, "a", encoding="utf-8") as file:
+                for event in events:
+                    file.write(json.dumps(event) + "\n")
+            self.line_count += len(events)
+            if self.line_count > 2 * self.max_events:
+                self._trim()
+        except OSError as e:
+            print(f"Error saving serving events: {e}")
+
+    def recent(self, limit=None):
+        """Return the newest servings that were not undone (up to limit), oldest first."""
+        with self.lock:
+            events = list(self.recent_events)
+        return events[-limit:] if limit else events
+
+    def _load(self):
+        lines = self._read_lines()
+        self.line_count = len(lines)
+        for line in lines:
+            try:
+                self._remember(json.loads(line))
+            except json.JSONDecodeError:
+                continue  # Skip a line torn by a crash
+
+    def _trim(self):
+        lines = self._read_lines()[-self.max_events:]
+        temp_path = f"{self.events_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            file.writelines(line + "\n" for line in lines)
+        os.replace(temp_path, self.events_path)
+        self.line_count = len(lines)
+
+    def _read_lines(self):
+        try:
+            with open(self.events_path, "r", encoding="utf-8") as file:
+                return [line.rstrip("\n") for line in file if line.strip()]
+        except FileNotFoundError:
+            return []
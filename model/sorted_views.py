@@ -0,0 +1,114 @@
+from bisect import bisect_left, insort
+from datetime import datetime
+
+
+def parse_timestamp(value):
+    """Convert an ISO date string to a POSIX timestamp; missing or invalid dates sort as oldest."""
+    if not value:
+        return float("-inf")
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except (TypeError, ValueError):
+        return float("-inf")
+
+
+# Normalized sort keys, all ascending: descending criteria are negated so a single
+# ascending list per criterion gives the display order directly.
+SORT_KEYS = {
+    "frequency_of_use": lambda ingredient: -(ingredient.get("frequency_of_use") or 0),
+    "name": lambda ingredient: ingredient["name"].lower(),
+    "last_used_date": lambda ingredient: -parse_timestamp(ingredient.get("last_used_date")),
+    "protein": lambda ingredient: -(ingredient["nutrition"].get("protein") or 0),
+    "carbohydrate": lambda ingredient: -(ingredient["nutrition"].get("carbohydrate") or 0),
+}
+
+
+class SortedView:
+    """
+    Read-only, live sequence of ingredients in one sort order.
+    Indexing resolves entries on demand, so handing a view to the UI costs O(1).
+    """
+    def __init__(self, entries, by_key):
+        self.entries = entries
+        self.by_key = by_key
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.by_key[entry[-1]] for entry in self.entries[index]]
+        return self.by_key[self.entries[index][-1]]
+
+    def __iter__(self):
+        for entry in self.entries:
+            yield self.by_key[entry[-1]]
+
+
+class SortedViews:
+    """
+    Maintains one ordered list of (sort key, file position, ingredient key) per criterion.
+    Lists are built on first use; afterwards a change to one ingredient only repositions that
+    ingredient with a binary search instead of re-sorting the catalog.
+    """
+    def __init__(self, by_key, positions):
+        self.by_key = by_key
+        self.positions = positions  # ingredient key -> file order, the tie-breaker of every sort
+        self.entries = {}  # criterion -> {ingredient key: entry tuple}
+        self.orders = {}  # criterion -> sorted list of entry tuples
+
+    def reset(self, by_key, positions):
+        self.by_key = by_key
+        self.positions = positions
+        self.entries.clear()
+        self.orders.clear()
+
+    def view(self, criteria):
+        if criteria not in SORT_KEYS:
+            raise ValueError(f"Unknown sort criteria: {criteria}")
+        if criteria not in self.orders:
+            entries = {key: self._entry(criteria, ingredient) for key, ingredient in self.by_key.items()}
+            self.entries[criteria] = entries
+            self.orders[criteria] = sorted(entries.values())
+        return SortedView(self.orders[criteria], self.by_key)
+
+    def update(self, ingredient):
+        """Insert a new ingredient or move a changed one into place in every built order."""
+        key = ingredient["name"]
+        for criteria, order in self.orders.items():
+            entries = self.entries[criteria]
+            new_entry = self._entry(criteria, ingredient)
+            old_entry = entries.get(key)
+            if old_entry == new_entry:
+                continue
+            if old_entry is not None:
+                del order[bisect_left(order, old_entry)]
+            insort(order, new_entry)
+            entries[key] = new_entry
+
+    def _entry(self, criteria, ingredient):
+        key = ingredient["name"]
+        return SORT_KEYS[criteria](ingredient), self.positions[key], key
+
+
+class ChainedView:
+    """Read-only sequence of one sequence followed by another, e.g. recipes before a sorted view."""
+    def __init__(self, first, second):
+        self.first = first
+        self.second = second
+
+    def __len__(self):
+        return len(self.first) + len(self.second)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if index < len(self.first):
+            return self.first[index]
+        return self.second[index - len(self.first)]
+
+    def __iter__(self):
+        yield from self.first
+        yield from self.second
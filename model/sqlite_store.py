@@ -0,0 +1,250 @@
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from config import *
+
+# Ingredient columns besides the key; anything else in an entry is kept in `extra` as JSON
+INGREDIENT_COLUMNS = (
+    "id", "name", "reference_serving_size", "custom_serving_size", "image",
+    "frequency_of_use", "last_used_date",
+)
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS ingredients (
+    key TEXT PRIMARY KEY,
+    id INTEGER NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    reference_serving_size REAL NOT NULL DEFAULT 100,
+    custom_serving_size REAL NOT NULL DEFAULT 0,
+    {", ".join(f"{nutrient} REAL NOT NULL DEFAULT 0" for nutrient in NUTRIENTS)},
+    image TEXT,
+    frequency_of_use INTEGER NOT NULL DEFAULT 0,
+    last_used_date TEXT,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_ingredients_name ON ingredients (name);
+
+CREATE TABLE IF NOT EXISTS profile (
+    field TEXT PRIMARY KEY,
+    value TEXT
+);
+
+CREATE TABLE IF NOT EXISTS intakes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    date TEXT NOT NULL,
+    logged_at TEXT NOT NULL,
+    ingredient_key TEXT NOT NULL,
+    grams REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_intakes_date ON intakes (date);
+
+CREATE TABLE IF NOT EXISTS daily_logs (
+    file_name TEXT PRIMARY KEY,
+    date TEXT NOT NULL,
+    row TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_daily_logs_date ON daily_logs (date);
+"""
+
+
+class SQLiteStore:
+    """
+    Optional storage backend (STORAGE_BACKEND = "sqlite") built on the stdlib sqlite3 module.
+    Every update is a small transaction on the affected rows instead of a whole-file rewrite.
+    The connection is shared between threads and guarded by a lock.
+    """
+    def __init__(self, db_path=SQLITE_PATH):
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+    def data_version(self):
+        """Changes whenever another connection commits, e.g. the migrator or a second instance."""
+        with self.lock:
+            return self.connection.execute("PRAGMA data_version").fetchone()[0]
+
+    # Ingredient catalog
+
+    def load_ingredients(self):
+        """Return the catalog in the same shape as ingredients.json, ordered by id."""
+        with self.lock:
+            rows = self.connection.execute("SELECT * FROM ingredients ORDER BY id").fetchall()
+        data = {}
+        for row in rows:
+            entry = json.loads(row["extra"]) if row["extra"] else {}
+            entry.update({column: row[column] for column in INGREDIENT_COLUMNS})
+            entry["nutrition"] = {nutrient: row[nutrient] for nutrient in NUTRIENTS}
+            data[row["key"]] = entry
+        return data
+
+    def next_ingredient_id(self):
+        with self.lock:
+            return self.connection.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM ingredients").fetchone()[0]
+
+    def add_ingredient(self, key, entry):
+        """Insert or replace one ingredient entry in the ingredients.json shape."""
+        with self.lock, self.connection:
+            self._upsert_ingredient(key, entry)
+
+    def record_usage(self, selected_ingredients):
+        """
+        Bump usage counters of the selected ingredients and log each serving as an intake.
+        'last_used_date' of each ingredient defaults to now when missing.
+        A record with a negative 'frequency_delta' takes an undone use back: the counter drops,
+        last_used_date is restored as given and the newest intake of the ingredient is removed.
+        """
+        now = datetime.now().isoformat()
+        with self.lock, self.connection:
+            for ingredient in selected_ingredients:
+                key = ingredient.get("name")
+                delta = ingredient.get("frequency_delta", 1)
+                if delta < 0:
+                    cursor = self.connection.execute(
+                        "UPDATE ingredients SET frequency_of_use = MAX(0, frequency_of_use + ?), last_used_date = ? "
+                        "WHERE key = ?",
+                        (delta, ingredient.get("last_used_date"), key),
+                    )
+                    if cursor.rowcount == 0:
+                        print(f"Ingredient {key} not found in data.")
+                        continue
+                    self.connection.execute(
+                        "DELETE FROM intakes WHERE id = (SELECT MAX(id) FROM intakes WHERE ingredient_key = ?)",
+                        (key,),
+                    )
+                    continue
+                timestamp = ingredient.get("last_used_date") or now
+                date = timestamp[:10]
+                custom_serving_size = ingredient.get("custom_serving_size")
+                cursor = self.connection.execute(
+                    "UPDATE ingredients SET frequency_of_use = frequency_of_use + 1, last_used_date = ?, "
+                    "custom_serving_size = COALESCE(?, custom_serving_size) WHERE key = ?",
+                    (timestamp, custom_serving_size, key),
+                )
+                if cursor.rowcount == 0:
+                    print(f"Ingredient {key} not found in data.")
+                    continue
+                self.connection.execute(
+                    "INSERT INTO intakes (date, logged_at, ingredient_key, grams) VALUES (?, ?, ?, ?)",
+                    (date, timestamp, key, custom_serving_size or 0.0),
+                )
+
+    def intakes_between(self, start_date, end_date):
+        """Return (date, ingredient_key, grams) rows with start_date <= date <= end_date."""
+        with self.lock:
+            return self.connection.execute(
+                "SELECT date, ingredient_key, grams FROM intakes WHERE date BETWEEN ? AND ? ORDER BY id",
+                (start_date, end_date),
+            ).fetchall()
+
+    # User profile
+
+    def has_profile(self):
+        """Return True once a user profile was written, i.e. the database was migrated."""
+        with self.lock:
+            return self.connection.execute("SELECT 1 FROM profile LIMIT 1").fetchone() is not None
+
+    def read_profile(self):
+        """Return the user profile in the same shape as user_config.json."""
+        with self.lock:
+            rows = self.connection.execute("SELECT field, value FROM profile").fetchall()
+        return {row["field"]: json.loads(row["value"]) for row in rows}
+
+    def write_profile(self, fields):
+        """Upsert only the given top-level profile fields."""
+        with self.lock, self.connection:
+            self.connection.executemany(
+                "INSERT INTO profile (field, value) VALUES (?, ?) "
+                "ON CONFLICT(field) DO UPDATE SET value = excluded.value",
+                [(field, json.dumps(value)) for field, value in fields.items()],
+            )
+
+    # Daily history
+
+    def record_daily_log(self, file_name, row):
+        """Store one report row (see REPORT_TITLES) for a finished day."""
+        with self.lock, self.connection:
+            self.connection.execute(
+                "INSERT INTO daily_logs (file_name, date, row) VALUES (?, ?, ?) "
+                "ON CONFLICT(file_name) DO UPDATE SET date = excluded.date, row = excluded.row",
+                (file_name, row[0], json.dumps(row)),
+            )
+
+    def daily_logs_between(self, start_date, end_date):
+        """Return report rows of the days with start_date <= date <= end_date, oldest first."""
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT row FROM daily_logs WHERE date BETWEEN ? AND ? ORDER BY date, file_name",
+                (start_date, end_date),
+            ).fetchall()
+        return [json.loads(row["row"]) for row in rows]
+
+    # Migration
+
+    def migrate_from_files(self, ingredients_path=INGREDIENTS_JSON_PATH, user_config_path=USER_CONFIG_PATH,
+                           log_path=LOG_PATH):
+        """One-shot import of ingredients.json (with its journal), user_config.json and nutrition logs."""
+        from model.data_manager import ingredients_journal, list_log_files, parse_log_file
+
+        with open(ingredients_path, "r", encoding="utf-8") as file:
+            ingredients = ingredients_journal.apply(json.load(file), ingredients_journal.read_records())
+        with self.lock, self.connection:
+            for key, entry in ingredients.items():
+                self._upsert_ingredient(key, entry)
+        print(f"Migrated {len(ingredients)} ingredients.")
+
+        with open(user_config_path, "r", encoding="utf-8") as file:
+            self.write_profile(json.load(file))
+        print("Migrated user profile.")
+
+        migrated_logs = 0
+        if os.path.isdir(log_path):
+            for log_file in list_log_files(log_path):
+                try:
+                    self.record_daily_log(log_file, parse_log_file(os.path.join(log_path, log_file)))
+                    migrated_logs += 1
+                except Exception as e:
+                    print(f"Skipping unreadable log {log_file}: {e}")
+        print(f"Migrated {migrated_logs} nutrition logs.")
+
+    def _upsert_ingredient(self, key, entry):
+        nutrition = entry.get("nutrition", {})
+        extra = {
+            field: value for field, value in entry.items()
+            if field not in INGREDIENT_COLUMNS and field != "nutrition"
+        }
+        columns = ("key", *INGREDIENT_COLUMNS, *NUTRIENTS, "extra")
+        values = (
+            key,
+            entry["id"],
+            entry.get("name", key),
+            entry.get("reference_serving_size", 100),
+            entry.get("custom_serving_size", 0),
+            entry.get("image"),
+            entry.get("frequency_of_use", 0),
+            entry.get("last_used_date"),
+            *(nutrition.get(nutrient) or 0 for nutrient in NUTRIENTS),
+            json.dumps(extra) if extra else None,
+        )
+        self.connection.execute(
+            f"INSERT OR REPLACE INTO ingredients ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' for _ in columns)})",
+            values,
+        )
+
+
+if __name__ == "__main__":
+    # python -m model.sqlite_store  -> import the JSON and CSV data into SQLITE_PATH
+    store = SQLiteStore()
+    store.migrate_from_files()
+    store.close()
+    print(f"Migration complete: {store.db_path}. Set NUTRIFLOW_STORAGE=sqlite to use it.")
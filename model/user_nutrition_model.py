@@ -1,10 +1,12 @@
 from config import *
+from model.consumption_aggregates import ConsumptionAggregates
+
 class UserNutritionModel:
     """
     Represents the user profile, manages nutrition data, and tracks progress.
     """
     def __init__(self, date, weight, goal_protein, goal_carbohydrate, goal_fat, goal_calories, log_path,
-                 nutrition_data=None, consumed_ingredients=None):
+                 nutrition_data=None, consumed_ingredients=None, serving_events=None, ingredient_catalog=None):
         # User profile attributes
         self.date = date
         self.weight = weight
@@ -21,7 +23,13 @@ class UserNutritionModel:
             CONSUMED_CALORIES: 0.0,
             CONSUMED_FAT: 0.0
         }
-        self.consumed_ingredients = consumed_ingredients or {}
+        # Per-ingredient totals; accepts the user_config.json dict, including the old list-per-serving format,
+        # whose macros are backfilled from ingredient_catalog
+        if isinstance(consumed_ingredients, ConsumptionAggregates):
+            self.consumed_ingredients = consumed_ingredients
+        else:
+            self.consumed_ingredients = ConsumptionAggregates.from_dict(consumed_ingredients, ingredient_catalog)
+        self.serving_events = serving_events  # Optional ServingEventStore for the per-serving history
 
     def get_date(self):
         return self.date
@@ -32,29 +40,63 @@ class UserNutritionModel:
     def get_log_path(self):
         return self.log_path
     
-    def update_nutrition(self, selected_ingredients):
+    def update_nutrition(self, selected_ingredients, totals=None):
         """
         Update the nutrition data based on selected ingredients.
         :param selected_ingredients: A list of dictionaries, each containing 'protein', 'carbohydrate', 'fat', and 'calories' for an ingredient.
+        :param totals: Optional nutrient totals of the selection aligned with NUTRIENTS, e.g. from IngredientCatalog.selection_totals.
+        :return: (servings, totals) as built by intake_delta, for undoing the intake later.
         """
+        servings, totals = self.intake_delta(selected_ingredients, totals)
+        self.apply_intake(servings, totals)
+        return servings, totals
 
+    def intake_delta(self, selected_ingredients, totals=None):
+        """
+        Compute what an intake adds without applying it.
+        :return: (servings, totals): one (name, grams, contribution) per ingredient and the nutrient
+                 totals, both vectors aligned with NUTRIENTS.
+        """
+        servings = []
         for ingredient in selected_ingredients:
             nutrition = ingredient.get("nutrition", {})
-            custom_serving_size = ingredient.get("custom_serving_size", 0.0)
-            reference_serving_size = ingredient.get("reference_serving_size", 99.0)
-            serving_ratio = custom_serving_size / reference_serving_size
-
-            self.nutrition_data[CONSUMED_PROTEIN] += nutrition.get("protein", 0.0) * serving_ratio
-            self.nutrition_data[CONSUMED_CARBOHYDRATE] += nutrition.get("carbohydrate", 0.0) * serving_ratio
-            self.nutrition_data[CONSUMED_CALORIES] += nutrition.get("calories", 0.0) * serving_ratio
-            self.nutrition_data[CONSUMED_FAT] += nutrition.get("fat", 0.0) * serving_ratio
-            
-            name = ingredient.get("name")
-            if name in self.consumed_ingredients:
-                self.consumed_ingredients[name].append(custom_serving_size)
+            serving_ratio = ingredient.get("custom_serving_size", 0.0) / ingredient.get("reference_serving_size", 99.0)
+            contribution = [(nutrition.get(nutrient) or 0.0) * serving_ratio for nutrient in NUTRIENTS]
+            servings.append((ingredient.get("name"), ingredient.get("custom_serving_size", 0.0), contribution))
+
+        if totals is None:
+            totals = [sum(column) for column in zip(*(serving[2] for serving in servings))] or [0.0] * len(NUTRIENTS)
+        return servings, [float(amount) for amount in totals]
+
+    def apply_intake(self, servings, totals, sign=1, intake_id=None, log_servings=True):
+        """
+        Add an intake from intake_delta, or take it back out with sign=-1.
+        Servings are logged to serving_events under intake_id; undoing one logs a single undo record
+        for intake_id instead. Replays pass log_servings=False.
+        """
+        for nutrient, amount in zip(NUTRIENTS, totals):
+            self.nutrition_data[CONSUMED_KEYS[nutrient]] += sign * amount
+
+        for name, grams, contribution in servings:
+            if sign > 0:
+                self.consumed_ingredients.add(name, grams, contribution)
             else:
-                self.consumed_ingredients[name] = [custom_serving_size]
-        
+                self.consumed_ingredients.subtract(name, grams, contribution)
+            if log_servings and sign > 0 and self.serving_events is not None:
+                self.serving_events.append(name, grams, intake=intake_id)
+        if log_servings and sign < 0 and intake_id is not None and self.serving_events is not None:
+            self.serving_events.append_undo(intake_id)
+
+    def snapshot(self):
+        """Return the consumed state as plain data, for restore_snapshot."""
+        return {
+            "nutrition_data": dict(self.nutrition_data),
+            "consumed_ingredients": self.consumed_ingredients.to_dict(),
+        }
+
+    def restore_snapshot(self, snapshot):
+        self.nutrition_data = dict(snapshot["nutrition_data"])
+        self.consumed_ingredients = ConsumptionAggregates.from_dict(snapshot["consumed_ingredients"])
 
     def get_nutrition_data(self):
         """
@@ -68,13 +110,44 @@ class UserNutritionModel:
             CONSUMED_CALORIES: round(float(self.nutrition_data.get(CONSUMED_CALORIES, 0)), 2)
         }
 
+    def get_recent_servings(self, limit):
+        """
+        Returns the newest logged servings from the serving history, without reading the file.
+        :return: A list of {'logged_at', 'date', 'name', 'grams'} dictionaries, oldest first.
+        """
+        if self.serving_events is None:
+            return []
+        return self.serving_events.recent(limit)
+
     def get_consumed_ingredients(self):
         """
-        Returns the consumed ingredients with the total amounts consumed in grams.
-        :return: A dictionary with ingredient names as keys and a list of consumed amounts as values.
+        Returns the consumed ingredients with their serving counts, grams and macro contributions.
+        :return: A ConsumptionAggregates, iterable over the ingredient names.
         """
         return self.consumed_ingredients
 
+    def get_goals(self):
+        """
+        Returns the daily goals.
+        :return: A dictionary with the 'protein', 'carbohydrate', 'fat' and 'calories' goals.
+        """
+        return {
+            "protein": self.goal_protein,
+            "carbohydrate": self.goal_carbohydrate,
+            "fat": self.goal_fat,
+            "calories": self.goal_calories,
+        }
+
+    def get_remaining_nutrition(self):
+        """
+        Returns what is left to eat today; nutrients already past their goal are 0.
+        :return: A dictionary with the remaining 'protein', 'carbohydrate', 'fat' and 'calories'.
+        """
+        return {
+            nutrient: max(0.0, float(goal) - float(self.nutrition_data.get(CONSUMED_KEYS[nutrient], 0.0)))
+            for nutrient, goal in self.get_goals().items()
+        }
+
     def get_nutrition_percentages(self):
         """
         Calculates the percentage of each nutritional element (protein, carbs, fat, calories) based on the user's goals.
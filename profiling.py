@@ -0,0 +1,126 @@
+"""
+Opt-in startup profiling, enabled with NUTRIFLOW_PROFILE (comma separated):
+  startup  time from process start to first paint and to interactive
+  imports  per-module import cost, like `python -X importtime` but summarized
+Import this module before anything else so its clock starts as early as possible.
+"""
+import os
+import sys
+import time
+
+STARTED_AT = time.perf_counter()
+PROFILE_MODES = {mode.strip() for mode in os.environ.get("NUTRIFLOW_PROFILE", "").split(",") if mode.strip()}
+startup_enabled = "startup" in PROFILE_MODES
+imports_enabled = "imports" in PROFILE_MODES
+
+marks = []  # (label, perf_counter) in the order they were reached
+
+
+def process_age():
+    """Seconds between the process start and STARTED_AT (interpreter startup), where the OS tells us."""
+    try:
+        with open("/proc/self/stat", "r") as file:
+            start_ticks = int(file.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime", "r") as file:
+            uptime = float(file.read().split()[0])
+        return max(0.0, uptime - start_ticks / os.sysconf("SC_CLK_TCK") - (time.perf_counter() - STARTED_AT))
+    except (OSError, ValueError, IndexError, AttributeError):
+        return 0.0
+
+
+PROCESS_OFFSET = process_age() if startup_enabled else 0.0
+
+
+class ImportTimer:
+    """
+    Meta path finder that times every module loaded after it was installed.
+    It finds nothing itself: it asks the other finders and wraps the exec_module of the loader
+    they return, recording each module's inclusive time and its self time (minus nested imports).
+    """
+    def __init__(self):
+        self.timings = {}  # module name -> (inclusive seconds, self seconds), in load order
+        self.stack = []  # Time spent in nested imports, one entry per module being executed
+        self.finding = set()
+
+    def install(self):
+        sys.meta_path.insert(0, self)
+
+    def find_spec(self, fullname, path=None, target=None):
+        if fullname in self.finding:
+            return None
+        self.finding.add(fullname)
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self.finding.discard(fullname)
+
+        loader = spec.loader
+        # Built-in and frozen importers are classes shared by every module; leave them alone
+        if loader is None or isinstance(loader, type) or not hasattr(loader, "exec_module"):
+            return spec
+        loader.exec_module = self.timed(fullname, loader.exec_module)
+        return spec
+
+    def timed(self, fullname, exec_module):
+        def timed_exec_module(module):
+            started_at = time.perf_counter()
+            self.stack.append(0.0)
+            try:
+                exec_module(module)
+            finally:
+                nested = self.stack.pop()
+                elapsed = time.perf_counter() - started_at
+                if self.stack:
+                    self.stack[-1] += elapsed
+                self.timings[fullname] = (elapsed, elapsed - nested)
+        return timed_exec_module
+
+    def report(self, top=15):
+        if not self.timings:
+            return
+        packages = {}
+        for name, (_, self_time) in self.timings.items():
+            package = name.split(".", 1)[0]
+            packages[package] = packages.get(package, 0.0) + self_time
+        total = sum(packages.values())
+        print(f"Import cost: {len(self.timings)} modules, {total * 1000:.1f} ms")
+        print("  By top-level package (self time):")
+        for package, self_time in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]:
+            print(f"    {package:<32} {self_time * 1000:9.1f} ms")
+        print("  Slowest modules (self ms / inclusive ms):")
+        for name, (inclusive, self_time) in sorted(self.timings.items(), key=lambda item: item[1][1], reverse=True)[:top]:
+            print(f"    {name:<40} {self_time * 1000:9.1f} {inclusive * 1000:9.1f}")
+        self.timings.clear()
+
+
+import_timer = ImportTimer()
+if imports_enabled:
+    import_timer.install()
+
+
+def mark(label):
+    """Record that startup reached label."""
+    if startup_enabled:
+        marks.append((label, time.perf_counter()))
+
+
+def report():
+    """Print the recorded marks as milliseconds since process start, and the import summary."""
+    if imports_enabled:
+        import_timer.report()
+    if not startup_enabled:
+        return
+    print("Startup timing (ms since process start):")
+    previous = STARTED_AT - PROCESS_OFFSET
+    for label, reached_at in [("interpreter ready", STARTED_AT), *marks]:
+        total = (reached_at - STARTED_AT + PROCESS_OFFSET) * 1000
+        print(f"  {label:<24} {total:9.1f}  (+{(reached_at - previous) * 1000:.1f})")
+        previous = reached_at
+    marks.clear()
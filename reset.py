@@ -1,6 +1,7 @@
 import json
 from datetime import datetime
 from config import INGREDIENTS_JSON_PATH
+from model.intake_journal import IntakeJournal
 
 # Function to reset the 'frequency_of_use' or 'last_used_date' for all ingredients
 def reset_all_data(reset_type, data):
@@ -15,6 +16,9 @@ def reset_all_data(reset_type, data):
             print("Invalid reset type. Please choose 'frequency_of_use' or 'last_used_date'.")
     return data
 
+# Fold pending usage records into the JSON file so they are not replayed after the reset
+IntakeJournal().compact()
+
 # Load the data from your JSON file
 with open(INGREDIENTS_JSON_PATH, 'r') as f:
     data = json.load(f)
@@ -0,0 +1,49 @@
+import unittest
+from model.consumption_aggregates import ConsumptionAggregates
+
+
+class FakeCatalog:
+    def __init__(self, ingredients):
+        self.ingredients = ingredients
+
+    def get(self, key):
+        return self.ingredients.get(key)
+
+
+class ConsumptionAggregatesTest(unittest.TestCase):
+    def test_add_and_subtract(self):
+        aggregates = ConsumptionAggregates()
+        aggregates.add("oats", 40, [5.2, 26.0, 2.8, 150.0])
+        aggregates.add("egg", 60, [7.8, 0.6, 6.0, 90.0])
+        aggregates.add("oats", 60, [7.8, 39.0, 4.2, 225.0])
+        self.assertEqual(aggregates.get("oats"), (2, 100.0, (13.0, 65.0, 7.0, 375.0)))
+
+        aggregates.subtract("oats", 60, [7.8, 39.0, 4.2, 225.0])
+        count, grams, macros = aggregates.get("oats")
+        self.assertEqual((count, grams), (1, 40.0))
+        self.assertAlmostEqual(macros[0], 5.2)
+
+        aggregates.subtract("oats", 40, [5.2, 26.0, 2.8, 150.0])
+        self.assertNotIn("oats", aggregates)
+        # The remaining slot is renumbered and still readable
+        self.assertEqual(list(aggregates), ["egg"])
+        self.assertEqual(aggregates.get("egg"), (1, 60.0, (7.8, 0.6, 6.0, 90.0)))
+        aggregates.subtract("ghost", 10)
+
+    def test_round_trip(self):
+        aggregates = ConsumptionAggregates()
+        aggregates.add("egg", 60, [7.8, 0.6, 6.0, 90.0], count=2)
+        self.assertEqual(ConsumptionAggregates.from_dict(aggregates.to_dict()).to_dict(), aggregates.to_dict())
+
+    def test_from_dict_accepts_old_formats_and_backfills_macros(self):
+        catalog = FakeCatalog({
+            "oats": {"reference_serving_size": 100, "nutrition": {"protein": 13, "carbohydrate": 65, "fat": 7, "calories": 375}},
+        })
+        aggregates = ConsumptionAggregates.from_dict({"oats": [40, 60], "egg": 120.0}, catalog)
+        self.assertEqual(aggregates.get("oats"), (2, 100.0, (13.0, 65.0, 7.0, 375.0)))
+        # Not in the catalog: grams are kept, macros start at 0
+        self.assertEqual(aggregates.get("egg"), (1, 120.0, (0.0, 0.0, 0.0, 0.0)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import os
+import random
+import tempfile
+import unittest
+from datetime import date, timedelta
+from model.history_store import HistoryStore
+from model.persistence import persistence_worker
+
+
+def record(day, weight, consumed, goals=(150.0, 200.0, 60.0, 2000.0)):
+    return {"date": day, "weight": weight, "goals": list(goals), "consumed": list(consumed)}
+
+
+class HistoryStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.history_path = os.path.join(self.directory.name, "history.json")
+        self.store = HistoryStore(self.history_path)
+
+    def tearDown(self):
+        persistence_worker.flush()
+        self.directory.cleanup()
+
+    def test_range_totals_match_a_scan(self):
+        random.seed(7)
+        start = date(2026, 1, 1)
+        records = []
+        for offset in random.sample(range(60), 40):  # Out of order, with gaps
+            consumed = [round(random.uniform(0, 200), 2) for _ in range(4)]
+            records.append(record((start + timedelta(days=offset)).isoformat(), 80 + offset / 10, consumed))
+            self.store.record_day(records[-1])
+
+        for first, last in ((0, 59), (5, 5), (10, 30), (-10, 3), (58, 90)):
+            start_date = (start + timedelta(days=first)).isoformat()
+            end_date = (start + timedelta(days=last)).isoformat()
+            in_range = [item for item in records if start_date <= item["date"] <= end_date]
+            summary = self.store.query(start_date, end_date)
+            self.assertEqual(summary["days"], len(in_range))
+            for index, nutrient in enumerate(("protein", "carbohydrate", "fat", "calories")):
+                self.assertAlmostEqual(summary["totals"][nutrient], sum(item["consumed"][index] for item in in_range), places=1)
+            if in_range:
+                self.assertAlmostEqual(summary["weight"], sum(item["weight"] for item in in_range) / len(in_range), places=1)
+            self.assertEqual(self.store.records_between(start_date, end_date), sorted(in_range, key=lambda item: item["date"]))
+
+    def test_replacing_a_day_updates_later_sums(self):
+        self.store.record_day(record("2026-01-01", 80, [100, 100, 10, 1000]))
+        self.store.record_day(record("2026-01-02", 81, [50, 50, 5, 500]))
+        self.store.record_day(record("2026-01-01", 80, [10, 10, 1, 100]))
+        self.assertEqual(self.store.query("2026-01-01", "2026-01-02")["totals"]["protein"], 60)
+        self.assertEqual(len(self.store), 2)
+
+    def test_rolling_window_ends_at_newest_day(self):
+        for offset in range(10):
+            self.store.record_day(record((date(2026, 3, 1) + timedelta(days=offset)).isoformat(), 80, [offset, 0, 0, 0]))
+        summary = self.store.rolling(3)
+        self.assertEqual((summary["start"], summary["end"], summary["days"]), ("2026-03-08", "2026-03-10", 3))
+        self.assertEqual(summary["totals"]["protein"], 7 + 8 + 9)
+        self.assertEqual(summary["consumed"]["protein"], 8)
+
+    def test_empty_and_out_of_range_queries(self):
+        self.assertEqual(self.store.query("2026-01-01", "2026-12-31")["days"], 0)
+        self.store.record_day(record("2026-05-05", 80, [1, 2, 3, 4]))
+        self.assertEqual(self.store.query("2026-01-01", "2026-01-31")["days"], 0)
+        self.assertIsNone(self.store.get("2026-05-06"))
+
+    def test_records_and_sources_survive_a_reload(self):
+        self.store.record_day(record("2026-01-01", 80, [1, 2, 3, 4]), source="log_1.csv")
+        self.store.record_day(record("2026-01-04", 81, [5, 6, 7, 8]))
+        self.store.add_source("log_2.csv")
+        persistence_worker.flush()
+
+        reloaded = HistoryStore(self.history_path)
+        self.assertEqual(reloaded.query("2026-01-01", "2026-01-04"), self.store.query("2026-01-01", "2026-01-04"))
+        self.assertTrue(reloaded.has_source("log_1.csv"))
+        self.assertTrue(reloaded.has_source("log_2.csv"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from model.intake_journal import IntakeJournal
+
+
+class IntakeJournalTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.catalog_path = os.path.join(self.directory.name, "ingredients.json")
+        with open(self.catalog_path, "w", encoding="utf-8") as file:
+            json.dump({
+                "oats": {"id": 1, "frequency_of_use": 2, "last_used_date": None, "custom_serving_size": 40},
+                "egg": {"id": 2, "frequency_of_use": 0, "last_used_date": None, "custom_serving_size": 60},
+            }, file)
+        self.journal = IntakeJournal(
+            journal_path=os.path.join(self.directory.name, "journal.jsonl"),
+            catalog_path=self.catalog_path,
+            compact_threshold=1000,
+        )
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def read_catalog(self):
+        with open(self.catalog_path, "r", encoding="utf-8") as file:
+            return json.load(file)
+
+    def test_load_applies_pending_records(self):
+        self.journal.append([{"name": "oats", "custom_serving_size": 50}, {"name": "egg"}])
+        self.journal.append([{"name": "oats", "last_used_date": "2026-01-02T08:00:00"}])
+        data = self.journal.load()
+        self.assertEqual(data["oats"]["frequency_of_use"], 4)
+        self.assertEqual(data["oats"]["custom_serving_size"], 50)
+        self.assertEqual(data["oats"]["last_used_date"], "2026-01-02T08:00:00")
+        self.assertEqual(data["egg"]["frequency_of_use"], 1)
+        # The catalog file itself is untouched until compaction
+        self.assertEqual(self.read_catalog()["oats"]["frequency_of_use"], 2)
+
+    def test_frequency_delta_undoes_a_use(self):
+        self.journal.append([{"name": "egg", "last_used_date": "2026-01-02T08:00:00"}])
+        self.journal.append([{"name": "egg", "last_used_date": None, "frequency_delta": -1}])
+        self.journal.append([{"name": "oats", "last_used_date": None, "frequency_delta": -5}])
+        data = self.journal.load()
+        self.assertEqual(data["egg"]["frequency_of_use"], 0)
+        self.assertIsNone(data["egg"]["last_used_date"])
+        self.assertEqual(data["oats"]["frequency_of_use"], 0)  # Never below zero
+
+    def test_apply_skips_unknown_ingredients(self):
+        data = IntakeJournal.apply({"oats": {"frequency_of_use": 1}}, [{"name": "ghost"}, {"name": "oats"}])
+        self.assertEqual(data, {"oats": {"frequency_of_use": 2, "last_used_date": None}})
+
+    def test_compact_folds_records_and_clears_the_journal(self):
+        self.journal.append([{"name": "oats"}, {"name": "oats"}])
+        expected = self.journal.load()
+        self.journal.compact()
+        self.assertEqual(self.read_catalog(), expected)
+        self.assertEqual(self.journal.read_records(), [])
+        self.assertEqual(self.journal.load(), expected)
+        self.assertIsNotNone(self.journal.compacted_stamp)
+
+    def test_appends_during_compaction_are_kept(self):
+        self.journal.compact_threshold = 25  # Compacts in the background while the threads append
+        threads = [
+            threading.Thread(target=lambda: [self.journal.append([{"name": "egg"}]) for _ in range(50)])
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertIsNotNone(self.journal.compaction_thread)
+        self.journal.compaction_thread.join()
+        self.assertEqual(self.journal.load()["egg"]["frequency_of_use"], 200)
+        self.journal.compact()
+        self.assertEqual(self.read_catalog()["egg"]["frequency_of_use"], 200)
+
+    def test_torn_last_line_is_skipped(self):
+        self.journal.append([{"name": "oats"}])
+        with open(self.journal.journal_path, "a", encoding="utf-8") as file:
+            file.write('{"name": "eg')
+        self.assertEqual(self.journal.load()["oats"]["frequency_of_use"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
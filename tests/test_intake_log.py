@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+from model.intake_log import IntakeLog
+from model.persistence import persistence_worker
+from model.serving_events import ServingEventStore
+from model.user_nutrition_model import UserNutritionModel
+from viewmodel.nutrition_viewmodel import NutritionViewModel
+
+
+def ingredient(name, grams, protein, carbohydrate, fat, calories):
+    return {
+        "name": name,
+        "custom_serving_size": grams,
+        "reference_serving_size": 100,
+        "nutrition": {"protein": protein, "carbohydrate": carbohydrate, "fat": fat, "calories": calories},
+    }
+
+
+class IntakeLogTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.events = ServingEventStore(os.path.join(self.directory.name, "serving_events.jsonl"))
+        self.model = UserNutritionModel("2026-01-01", 80, 150, 200, 60, 2000, self.directory.name,
+                                        serving_events=self.events)
+        self.view_model = NutritionViewModel(self.model)
+        self.view_model.ingredient_catalog = None  # Plain selections, no catalog usage
+        self.view_model.intake_log = IntakeLog(self.model.snapshot())
+        self.chicken = ingredient("chicken", 150, 31, 0, 3.6, 165)
+        self.rice = ingredient("rice", 200, 2.7, 28, 0.3, 130)
+
+    def tearDown(self):
+        persistence_worker.flush()  # Background writes must land before the directory goes
+        self.directory.cleanup()
+
+    def test_replay_reproduces_live_state_after_undo_and_redo(self):
+        self.view_model.log_intake([self.chicken])
+        self.view_model.log_intake([self.rice, self.chicken])
+        self.view_model.undo_intake()
+        self.view_model.redo_intake()
+        self.view_model.undo_intake()
+        self.view_model.log_intake([self.rice])
+
+        self.assertTrue(self.view_model.intake_log.verify(self.model))
+        self.assertAlmostEqual(self.model.nutrition_data["consumed_protein"], 31 * 1.5 + 2.7 * 2)
+        self.assertEqual(self.model.consumed_ingredients.get("chicken")[:2], (1, 150.0))
+
+    def test_undo_restores_previous_totals(self):
+        self.view_model.log_intake([self.chicken])
+        before = dict(self.model.nutrition_data)
+        self.view_model.log_intake([self.rice])
+        self.view_model.undo_intake()
+
+        for key, value in before.items():
+            self.assertAlmostEqual(self.model.nutrition_data[key], value)
+        self.assertNotIn("rice", self.model.consumed_ingredients)
+        self.assertTrue(self.view_model.intake_log.can_redo())
+
+    def test_verify_detects_divergence_and_replay_repairs_it(self):
+        self.view_model.log_intake([self.chicken])
+        self.model.nutrition_data["consumed_fat"] += 1
+        self.assertFalse(self.view_model.intake_log.verify(self.model))
+
+        self.view_model.intake_log.replay(self.model)
+        self.assertTrue(self.view_model.intake_log.verify(self.model))
+
+    def test_recent_servings_leave_out_undone_intakes(self):
+        self.view_model.log_intake([self.chicken])
+        self.view_model.log_intake([self.rice])
+        self.view_model.undo_intake()
+
+        self.assertEqual([event["name"] for event in self.events.recent()], ["chicken"])
+        self.view_model.redo_intake()
+        self.assertEqual([event["name"] for event in self.events.recent()], ["chicken", "rice"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+from unittest import mock
+import numpy as np
+from model.macro_solver import MacroSolver
+from config import SOLVER_MIN_GRAMS
+
+GOALS = {"protein": 150, "carbohydrate": 250, "fat": 70, "calories": 2300}
+
+
+class FakeCatalog:
+    """The parts of IngredientCatalog the solver reads; nutrition per 100 g."""
+    def __init__(self, ingredients):
+        self.ingredients = ingredients
+
+    def nutrition_matrix(self):
+        matrix = np.array([[item["nutrition"][nutrient] for nutrient in ("protein", "carbohydrate", "fat", "calories")]
+                           for item in self.ingredients], dtype=float)
+        return matrix, np.full(len(self.ingredients), 100.0)
+
+    def sorted_view(self, criteria):
+        return sorted(self.ingredients, key=lambda item: -item["frequency_of_use"])
+
+    def row_of(self, key):
+        return [item["name"] for item in self.ingredients].index(key)
+
+    def all(self):
+        return self.ingredients
+
+    def __len__(self):
+        return len(self.ingredients)
+
+
+def ingredient(name, protein, carbohydrate, fat, calories, frequency=0):
+    return {"name": name, "frequency_of_use": frequency,
+            "nutrition": {"protein": protein, "carbohydrate": carbohydrate, "fat": fat, "calories": calories}}
+
+
+class MacroSolverTest(unittest.TestCase):
+    def setUp(self):
+        self.catalog = FakeCatalog([
+            ingredient("chicken", 31, 0, 3.6, 165, frequency=9),
+            ingredient("rice", 2.7, 28, 0.3, 130, frequency=1),
+            ingredient("olive_oil", 0, 0, 100, 884),
+            ingredient("water", 0, 0, 0, 0, frequency=5),
+        ])
+        self.solver = MacroSolver(self.catalog)
+
+    def test_finds_an_exact_combination(self):
+        # 200 g chicken + 300 g rice
+        remaining = {"protein": 70.1, "carbohydrate": 84.0, "fat": 8.1, "calories": 720.0}
+        best = self.solver.suggest(remaining, GOALS)[0]
+        portions = {item["name"]: grams for item, grams in best["portions"]}
+        self.assertEqual(portions, {"chicken": 200, "rice": 300})
+        self.assertLess(best["deviation"], 0.001)
+
+    def test_portions_are_bounded_and_ranked(self):
+        remaining = {"protein": 400, "carbohydrate": 10, "fat": 10, "calories": 2000}
+        suggestions = self.solver.suggest(remaining, GOALS, top_k=3, max_grams=250)
+        self.assertLessEqual(len(suggestions), 3)
+        deviations = [suggestion["deviation"] for suggestion in suggestions]
+        self.assertEqual(deviations, sorted(deviations))
+        for suggestion in suggestions:
+            for item, grams in suggestion["portions"]:
+                self.assertGreaterEqual(grams, SOLVER_MIN_GRAMS)
+                self.assertLessEqual(grams, 250)
+                self.assertNotEqual(item["name"], "water")
+
+    def test_expired_budget_still_returns_single_ingredients(self):
+        remaining = {"protein": 62, "carbohydrate": 0, "fat": 7.2, "calories": 330}
+        suggestions = self.solver.suggest(remaining, GOALS, budget_ms=0)
+        self.assertTrue(suggestions)
+        self.assertTrue(all(len(suggestion["portions"]) == 1 for suggestion in suggestions))
+        self.assertEqual(suggestions[0]["portions"][0][0]["name"], "chicken")
+
+    def test_frequent_only_searches_the_most_used(self):
+        remaining = {"protein": 60, "carbohydrate": 80, "fat": 10, "calories": 700}
+        with mock.patch("model.macro_solver.SOLVER_FREQUENT_LIMIT", 2):  # chicken and water
+            suggestions = self.solver.suggest(remaining, GOALS, frequent_only=True)
+        self.assertTrue(suggestions)
+        self.assertTrue(all(item["name"] == "chicken" for suggestion in suggestions for item, _ in suggestion["portions"]))
+
+    def test_met_goals_need_no_suggestion(self):
+        self.assertEqual(self.solver.suggest({nutrient: 0 for nutrient in GOALS}, GOALS), [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+from model.search_index import SearchIndex
+
+
+class SearchIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.index = SearchIndex()
+        self.index.add("chicken_breast", ["chicken breast"])
+        self.index.add("chickpeas", ["chickpeas", "garbanzo beans"])
+        self.index.add("banana", ["banana"])
+        self.index.add("brown_rice", ["brown rice"])
+
+    def test_search_ranks_substring_matches_first(self):
+        # Aliases count towards the text length, so the shorter chicken breast text ranks first
+        self.assertEqual(self.index.search("chick"), ["chicken_breast", "chickpeas"])
+        # Fuzzy matches sharing enough trigrams follow the exact one
+        self.assertEqual(self.index.search("Chicken"), ["chicken_breast", "chickpeas"])
+
+    def test_search_finds_aliases_and_tolerates_typos(self):
+        self.assertEqual(self.index.search("garbanzo"), ["chickpeas"])
+        self.assertIn("chicken_breast", self.index.search("chiken breast"))
+
+    def test_add_reindexes_an_existing_key(self):
+        self.index.add("banana", ["plantain"])
+        self.assertEqual(self.index.search("banana"), [])
+        self.assertEqual(self.index.search("plantain"), ["banana"])
+
+    def test_remove_drops_every_posting(self):
+        self.index.remove("banana")
+        self.index.remove("banana")  # Removing twice is harmless
+        self.assertEqual(self.index.search("banana"), [])
+        self.assertNotIn("banana", self.index.search("a"))
+        self.assertNotIn("banana", self.index.search("b"))
+
+    def test_one_letter_queries_rank_word_initials_first(self):
+        # Words starting with the letter first (shortest text first), then texts containing it elsewhere
+        self.assertEqual(self.index.search("b"), ["banana", "brown_rice", "chicken_breast", "chickpeas"])
+        self.assertEqual(self.index.search("r"), ["brown_rice", "chicken_breast", "chickpeas"])
+        self.assertEqual(self.index.search("a"), ["banana", "chicken_breast", "chickpeas"])
+        self.assertEqual(self.index.search("z"), ["chickpeas"])
+        self.assertEqual(self.index.search("q"), [])
+
+    def test_one_letter_queries_are_capped(self):
+        index = SearchIndex()
+        for number in range(50):
+            index.add(f"apple_{number}", [f"apple {number}"])
+            index.add(f"pear_{number}", [f"pear {number}"])
+        results = index.short_search("a", limit=60)
+        self.assertEqual(len(results), 60)
+        self.assertTrue(all(key.startswith("apple") for key in results[:50]))
+        self.assertTrue(all(key.startswith("pear") for key in results[50:]))
+
+    def test_clear(self):
+        self.index.clear()
+        self.assertEqual(self.index.search("banana"), [])
+        self.assertEqual(self.index.search("b"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import os
+import tempfile
+import unittest
+from model.persistence import persistence_worker
+from model.serving_events import ServingEventStore
+
+
+class ServingEventStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.events_path = os.path.join(self.directory.name, "serving_events.jsonl")
+
+    def tearDown(self):
+        persistence_worker.flush()
+        self.directory.cleanup()
+
+    def test_recent_is_served_from_memory(self):
+        store = ServingEventStore(self.events_path)
+        store.append("oats", 50, intake="a")
+        # Nothing has been flushed to the file, yet the serving is listed
+        self.assertEqual([event["name"] for event in store.recent()], ["oats"])
+
+    def test_recent_is_rebuilt_from_the_file(self):
+        store = ServingEventStore(self.events_path)
+        store.append("oats", 50, intake="a")
+        store.append("milk", 200, intake="b")
+        store.append("egg", 60, intake="b")
+        store.append_undo("b")
+        store.append("apple", 120, intake="c")
+        persistence_worker.flush()
+
+        reloaded = ServingEventStore(self.events_path)
+        self.assertEqual([event["name"] for event in reloaded.recent()], ["oats", "apple"])
+        self.assertEqual([event["name"] for event in reloaded.recent(1)], ["apple"])
+
+    def test_recent_is_bounded(self):
+        store = ServingEventStore(self.events_path, recent_limit=3)
+        for grams in range(10):
+            store.append("rice", grams)
+        self.assertEqual([event["grams"] for event in store.recent()], [7.0, 8.0, 9.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
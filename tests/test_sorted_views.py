@@ -0,0 +1,73 @@
+import unittest
+from model.sorted_views import ChainedView, SortedViews
+
+
+def ingredient(name, frequency, protein, last_used_date=None):
+    return {
+        "name": name,
+        "frequency_of_use": frequency,
+        "last_used_date": last_used_date,
+        "nutrition": {"protein": protein, "carbohydrate": 0},
+    }
+
+
+class SortedViewsTest(unittest.TestCase):
+    def setUp(self):
+        ingredients = [
+            ingredient("oats", 3, 13, "2026-01-02T08:00:00"),
+            ingredient("egg", 5, 13, "2026-01-03T08:00:00"),
+            ingredient("apple", 3, 0.3),
+        ]
+        self.by_key = {item["name"]: item for item in ingredients}
+        self.positions = {item["name"]: index for index, item in enumerate(ingredients)}
+        self.views = SortedViews(self.by_key, self.positions)
+
+    def names(self, criteria):
+        return [item["name"] for item in self.views.view(criteria)]
+
+    def test_orders_with_file_order_tie_break(self):
+        self.assertEqual(self.names("frequency_of_use"), ["egg", "oats", "apple"])
+        self.assertEqual(self.names("name"), ["apple", "egg", "oats"])
+        self.assertEqual(self.names("protein"), ["oats", "egg", "apple"])
+        self.assertEqual(self.names("last_used_date"), ["egg", "oats", "apple"])
+
+    def test_update_moves_a_changed_ingredient(self):
+        self.names("frequency_of_use")
+        self.names("name")
+        self.by_key["apple"]["frequency_of_use"] = 9
+        self.views.update(self.by_key["apple"])
+        self.assertEqual(self.names("frequency_of_use"), ["apple", "egg", "oats"])
+        self.assertEqual(self.names("name"), ["apple", "egg", "oats"])
+
+    def test_update_inserts_a_new_ingredient(self):
+        self.names("frequency_of_use")
+        rice = ingredient("rice", 4, 2.7)
+        self.by_key["rice"] = rice
+        self.positions["rice"] = 3
+        self.views.update(rice)
+        self.assertEqual(self.names("frequency_of_use"), ["egg", "rice", "oats", "apple"])
+        # Orders built after the insert include it too
+        self.assertEqual(self.names("name"), ["apple", "egg", "oats", "rice"])
+
+    def test_view_is_live_and_sliceable(self):
+        view = self.views.view("frequency_of_use")
+        self.by_key["apple"]["frequency_of_use"] = 9
+        self.views.update(self.by_key["apple"])
+        self.assertEqual(len(view), 3)
+        self.assertEqual([item["name"] for item in view[:2]], ["apple", "egg"])
+        self.assertEqual(view[-1]["name"], "oats")
+
+    def test_unknown_criteria(self):
+        with self.assertRaises(ValueError):
+            self.views.view("fiber")
+
+    def test_chained_view(self):
+        view = ChainedView(["recipe"], self.views.view("name"))
+        self.assertEqual(len(view), 4)
+        self.assertEqual(view[0], "recipe")
+        self.assertEqual(view[1]["name"], "apple")
+        self.assertEqual([item if isinstance(item, str) else item["name"] for item in view[-2:]], ["egg", "oats"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import time
+from config import ANIMATION_FRAME_MS
+
+
+def ease_out_cubic(t):
+    return 1 - (1 - t) ** 3
+
+
+class Animation:
+    """A value moving from start to end over duration seconds, eased out."""
+    def __init__(self, start, end, duration, on_frame, on_done):
+        self.start = start
+        self.end = end
+        self.duration = duration
+        self.on_frame = on_frame
+        self.on_done = on_done
+        self.started_at = time.perf_counter()
+
+    def progress_at(self, now):
+        if self.duration <= 0:
+            return 1.0
+        return min(1.0, (now - self.started_at) / self.duration)
+
+    def value_at(self, now):
+        return self.start + (self.end - self.start) * ease_out_cubic(self.progress_at(now))
+
+
+class AnimationClock:
+    """
+    One after() loop driving every running animation, active only while something animates.
+    Each widget has at most one animation: animating it again retargets the running animation
+    from its current value instead of starting a second chain.
+    """
+    def __init__(self, frame_ms=ANIMATION_FRAME_MS):
+        self.frame_ms = frame_ms
+        self.animations = {}  # widget -> Animation
+        self.root = None
+        self.job = None
+
+    def animate(self, widget, start, end, duration_ms, on_frame, on_done=None):
+        """
+        Call on_frame(value) every tick while the value eases from start to end over duration_ms,
+        then on_done(). If the widget is already animating, start is replaced by its current value.
+        """
+        now = time.perf_counter()
+        running = self.animations.get(widget)
+        if running is not None:
+            start = running.value_at(now)
+        self.animations[widget] = Animation(start, end, duration_ms / 1000, on_frame, on_done)
+        if self.root is None:
+            self.root = widget.nametowidget(".")
+        if self.job is None:
+            self.job = self.root.after(self.frame_ms, self._tick)
+
+    def cancel(self, widget):
+        self.animations.pop(widget, None)
+
+    def is_animating(self, widget):
+        return widget in self.animations
+
+    def _tick(self):
+        now = time.perf_counter()
+        for widget, animation in list(self.animations.items()):
+            try:
+                if not widget.winfo_exists():
+                    self.animations.pop(widget, None)
+                    continue
+                animation.on_frame(animation.value_at(now))
+                if animation.progress_at(now) >= 1.0:
+                    if self.animations.get(widget) is animation:
+                        del self.animations[widget]
+                    if animation.on_done is not None:
+                        animation.on_done()
+            except Exception as e:
+                print(f"Error running animation: {e}")
+                self.animations.pop(widget, None)
+
+        self.job = self.root.after(self.frame_ms, self._tick) if self.animations else None
+
+
+animation_clock = AnimationClock()
@@ -1,4 +1,5 @@
 import os
+import threading
 import customtkinter as ctk
 from config import *
 from model.data_manager import *
@@ -9,6 +10,12 @@ class DataScreen(ctk.CTkFrame):
         self.nutrition_view_model = nutrition_view_model
         os.makedirs(LOG_PATH, exist_ok=True)
         self.initialize_ui()
+        self.nutrition_view_model.subscribe(self.on_log_path_changed, ["log_path"])
+        self.nutrition_view_model.subscribe(
+            self.on_consumed_changed, [CONSUMED_PROTEIN, CONSUMED_CARBOHYDRATE, CONSUMED_FAT, CONSUMED_CALORIES]
+        )
+        self.sync_history()
+        self.refresh_recent_servings()
         
     def initialize_ui(self):
         self.grid_rowconfigure(0, weight=3)  # Data detail row
@@ -33,6 +40,9 @@ class DataScreen(ctk.CTkFrame):
                 )
         self.data_file_detail_frame.grid(row=0, column=0, padx=10, pady=10, sticky="nsew")
         
+    def on_log_path_changed(self, changes):
+        self.data_file_detail_frame.configure(text=f"{changes['log_path']}")
+
     def create_data_middle_frame(self):
         self.data_middle_frame = ctk.CTkFrame(self)
         self.data_middle_frame.grid(row=1, column=0, sticky="nsew", padx=20, pady=10)
@@ -48,7 +58,99 @@ class DataScreen(ctk.CTkFrame):
                     command=self.generate_report
                 )
         self.generate_report_button.grid(row=0, column=1, padx=10, pady=10, sticky="nsew")
+
+        # Rolling averages from the history store
+        self.trends_label = ctk.CTkLabel(self.data_middle_frame, text="Loading history...", justify="left")
+        self.trends_label.grid(row=0, column=0, padx=10, pady=10, sticky="nsew")
+
+        # Date range query
+        self.history_query_frame = ctk.CTkFrame(self.data_middle_frame, fg_color="transparent")
+        self.history_query_frame.grid(row=0, column=2, padx=10, pady=10, sticky="nsew")
+        self.history_query_frame.grid_columnconfigure((0, 1), weight=1)
+        today = datetime.now().strftime("%Y-%m-%d")
+        self.history_start_entry = ctk.CTkEntry(self.history_query_frame, placeholder_text="From (YYYY-MM-DD)")
+        self.history_start_entry.grid(row=0, column=0, padx=5, pady=5, sticky="ew")
+        self.history_end_entry = ctk.CTkEntry(self.history_query_frame, placeholder_text="To (YYYY-MM-DD)")
+        self.history_end_entry.insert(0, today)
+        self.history_end_entry.grid(row=0, column=1, padx=5, pady=5, sticky="ew")
+        self.history_query_button = ctk.CTkButton(
+                    self.history_query_frame,
+                    text="Summarize Range",
+                    command=self.query_history
+                )
+        self.history_query_button.grid(row=1, column=0, columnspan=2, padx=5, pady=5, sticky="ew")
+        self.history_result_label = ctk.CTkLabel(self.history_query_frame, text="", justify="left")
+        self.history_result_label.grid(row=2, column=0, columnspan=2, padx=5, pady=5, sticky="nsew")
+
+        # Newest servings from the serving history
+        self.recent_servings_label = ctk.CTkLabel(
+            self.data_middle_frame, text="", justify="left", anchor="w", wraplength=700
+        )
+        self.recent_servings_label.grid(row=1, column=0, columnspan=3, padx=10, pady=(0, 10), sticky="ew")
+
+    def on_consumed_changed(self, changes):
+        self.refresh_recent_servings()
+
+    def refresh_recent_servings(self):
+        """Show the newest servings; they are served from memory, so this does not wait for writes."""
+        servings = [
+            f"{serving['logged_at'][:16].replace('T', ' ')}  {serving['name'].replace('_', ' ').title()} "
+            f"{serving['grams']:.0f} g"
+            for serving in reversed(self.nutrition_view_model.get_recent_servings())
+        ]
+        self.recent_servings_label.configure(
+            text="Recent servings: " + ("; ".join(servings) if servings else "none yet")
+        )
         
+    def sync_history(self):
+        """Import logs missing from the history on a worker thread, then show the trends."""
+        current_log = os.path.basename(self.nutrition_view_model.get_log_path() or "")
+        self.history_thread = threading.Thread(
+            target=sync_history_with_logs, kwargs={"current_log": current_log}, daemon=True
+        )
+        self.history_thread.start()
+        self.after(100, self.check_history_synced)
+
+    def check_history_synced(self):
+        if self.history_thread.is_alive():
+            self.after(100, self.check_history_synced)
+            return
+        self.update_trends()
+
+    def update_trends(self):
+        lines = []
+        for window, summary in get_history_store().trends().items():
+            if not summary["days"]:
+                continue
+            consumed = summary["consumed"]
+            lines.append(
+                f"{window} days ({summary['days']} logged): {consumed['calories']:.0f} kcal, "
+                f"P {consumed['protein']:.0f} g, C {consumed['carbohydrate']:.0f} g, "
+                f"F {consumed['fat']:.0f} g, {summary['weight']:.1f} kg"
+            )
+        self.trends_label.configure(text="\n".join(lines) if lines else "No history yet")
+
+    def query_history(self):
+        start = self.history_start_entry.get().strip() or "0001-01-01"
+        end = self.history_end_entry.get().strip() or datetime.now().strftime("%Y-%m-%d")
+        try:
+            summary = get_history_store().query(start, end)
+        except ValueError:
+            self.history_result_label.configure(text="Dates must be YYYY-MM-DD")
+            return
+        if not summary["days"]:
+            self.history_result_label.configure(text="No logged days in this range")
+            return
+        consumed = summary["consumed"]
+        totals = summary["totals"]
+        self.history_result_label.configure(text=(
+            f"{summary['start']} to {summary['end']}, {summary['days']} logged days\n"
+            f"Average: {consumed['calories']:.0f} kcal, P {consumed['protein']:.0f} g, "
+            f"C {consumed['carbohydrate']:.0f} g, F {consumed['fat']:.0f} g, {summary['weight']:.1f} kg\n"
+            f"Total: {totals['calories']:.0f} kcal, P {totals['protein']:.0f} g, "
+            f"C {totals['carbohydrate']:.0f} g, F {totals['fat']:.0f} g"
+        ))
+
     def create_data_load_frame(self):
         self.data_load_frame = ctk.CTkFrame(self)
         self.data_load_frame.grid(row=2, column=0, sticky="nsew", padx=20, pady=10)
@@ -71,7 +173,9 @@ class DataScreen(ctk.CTkFrame):
         
     def import_data(self):
         """Allow the user to select and read a CSV file using pandas."""
-        if not import_nutrition_data_from_file(self.nutrition_view_model): 
+        with self.nutrition_view_model.batch():  # The import sets the model fields directly
+            imported = import_nutrition_data_from_file(self.nutrition_view_model)
+        if not imported:
             return
         write_to_user_config(self.nutrition_view_model)
         restart_app()
@@ -89,5 +193,20 @@ class DataScreen(ctk.CTkFrame):
         timestamp = datetime.now().strftime("%Y-%m-%d")
         new_file_name = f"report_log_{timestamp}.csv"
         file_name = get_unique_filename(new_file_name)
-        export_all_logs_to_report(file_name)
+        file_path = ask_save_path(file_name, title="Save Report As")
+        if not file_path:
+            print("No report created.")
+            return
+
+        # Parse and write on a worker thread so the Data screen stays responsive
+        self.generate_report_button.configure(state=ctk.DISABLED)
+        self.report_thread = threading.Thread(target=export_all_logs_to_report, args=(file_path,), daemon=True)
+        self.report_thread.start()
+        self.after(100, self.check_report_finished)
+
+    def check_report_finished(self):
+        if self.report_thread.is_alive():
+            self.after(100, self.check_report_finished)
+            return
+        self.generate_report_button.configure(state=ctk.NORMAL)
     
@@ -1,20 +1,21 @@
 import customtkinter as ctk
-from ui.ingredients_ui.ingredient_card import IngredientCard
 from model.data_manager import *
+from ui.home_ui.suggestion_window import SuggestionWindow
 
 class BottomFrame(ctk.CTkFrame):
-    def __init__(self, master, nutrition_view_model, ingredients_data, update_intake_callback, sort_cards_callback, search_cards_callback, ingredient_cards):
+    def __init__(self, master, nutrition_view_model, ingredients_data, ingredient_catalog, sort_cards_callback, search_cards_callback, ingredients_frame):
         super().__init__(master)
         
         self.nutrition_view_model = nutrition_view_model
         self.ingredients_data = ingredients_data  # Set the ingredients_data
-        self.update_intake_callback = update_intake_callback
+        self.ingredient_catalog = ingredient_catalog
         self.sort_cards_callback = sort_cards_callback
         self.search_cards_callback = search_cards_callback
-        self.ingredient_cards = ingredient_cards
+        self.ingredients_frame = ingredients_frame
         self.selected_ingredients = []
         self.highlight_color = "#2980B9"
         self.initialize_ui()
+        self.nutrition_view_model.subscribe(self.on_history_changed, ["can_undo", "can_redo"])
 
     def initialize_ui(self):
         # Equal column weights for proportional layout
@@ -37,6 +38,17 @@ class BottomFrame(ctk.CTkFrame):
         )
         self.sorting_menu.grid(row=0, column=1, padx=10, pady=10, sticky="e")
 
+        # Save the current selection as a recipe, row 0 column 1 left of the sort dropdown
+        self.save_recipe_button = ctk.CTkButton(
+            self,
+            hover_color="#2c2c2c",
+            text="Save as Recipe",
+            width=120,
+            command=self.save_as_recipe,
+            state=ctk.DISABLED
+        )
+        self.save_recipe_button.grid(row=0, column=1, padx=10, pady=10, sticky="w")
+
     # Search bar for ingredient search, row 1 column 1
         self.search_var = ctk.StringVar()
         self.search_entry = ctk.CTkEntry(
@@ -66,7 +78,7 @@ class BottomFrame(ctk.CTkFrame):
         )
         self.selected_nutrition_label.grid(row=0, column=0, padx=10, pady=5, sticky="w")
 
-        # Update Intake button on the most right side, taking 1/3 of the space, spanning both rows
+        # Update Intake button on the most right side, taking 1/3 of the space, with Undo/Redo below
         self.update_button = ctk.CTkButton(
             self, 
             hover_color="#2c2c2c", 
@@ -75,7 +87,34 @@ class BottomFrame(ctk.CTkFrame):
             command=self.update_intake, 
             state=ctk.DISABLED
         )
-        self.update_button.grid(row=0, column=2, rowspan=2, padx=10, pady=10, sticky="nsew")
+        self.update_button.grid(row=0, column=2, padx=10, pady=(10, 5), sticky="nsew")
+
+        self.history_frame = ctk.CTkFrame(self, fg_color="transparent")
+        self.history_frame.grid(row=1, column=2, padx=10, pady=(0, 10), sticky="nsew")
+        self.history_frame.grid_columnconfigure((0, 1, 2), weight=1, uniform="history")
+        self.undo_button = ctk.CTkButton(
+            self.history_frame,
+            hover_color="#2c2c2c",
+            text="Undo Intake",
+            command=self.undo_intake,
+            state=ctk.DISABLED
+        )
+        self.undo_button.grid(row=0, column=0, padx=(0, 5), sticky="ew")
+        self.redo_button = ctk.CTkButton(
+            self.history_frame,
+            hover_color="#2c2c2c",
+            text="Redo Intake",
+            command=self.redo_intake,
+            state=ctk.DISABLED
+        )
+        self.redo_button.grid(row=0, column=1, padx=5, sticky="ew")
+        self.suggest_button = ctk.CTkButton(
+            self.history_frame,
+            hover_color="#2c2c2c",
+            text="Suggest",
+            command=self.open_suggestions
+        )
+        self.suggest_button.grid(row=0, column=2, padx=(5, 0), sticky="ew")
 
     
     def update_selected_data(self, ingredient_data, add=False):
@@ -88,6 +127,7 @@ class BottomFrame(ctk.CTkFrame):
 
         self.update_selected_ingredients_label()
         self.update_button.configure(state=ctk.NORMAL if self.selected_ingredients else ctk.DISABLED)
+        self.save_recipe_button.configure(state=ctk.NORMAL if self.selected_ingredients else ctk.DISABLED)
 
     def update_selected_ingredients_label(self):
         selected_ingredients_text = self.format_ingredient_text(self.selected_ingredients)
@@ -97,43 +137,67 @@ class BottomFrame(ctk.CTkFrame):
         self.selected_nutrition_label.configure(text=selected_ingredients_text)
 
     def format_ingredient_text(self, ingredients):
-        total_protein = round(sum([
-            ingredient['nutrition']["protein"] * (ingredient['custom_serving_size'] / ingredient['reference_serving_size'])
-            for ingredient in ingredients
-        ]), 2)
-        
-        total_carbohydrate = round(sum([
-            ingredient['nutrition']["carbohydrate"] * (ingredient['custom_serving_size'] / ingredient['reference_serving_size'])
-            for ingredient in ingredients
-        ]), 2)
-        
-        total_fat = round(sum([
-            ingredient['nutrition']["fat"] * (ingredient['custom_serving_size'] / ingredient['reference_serving_size'])
-            for ingredient in ingredients
-        ]), 2)
-        
+        totals = dict(zip(NUTRIENTS, self.ingredient_catalog.selection_totals(ingredients)))
+        total_protein = round(float(totals["protein"]), 2)
+        total_carbohydrate = round(float(totals["carbohydrate"]), 2)
+        total_fat = round(float(totals["fat"]), 2)
+
         return f"Protein: {total_protein}g | Carbohydrate: {total_carbohydrate}g | Fat: {total_fat}g"
 
     def update_intake(self):
-        for ingredient_card in self.ingredient_cards:
-            ingredient_card.on_serving_size_change()
+        self.ingredients_frame.commit_serving_sizes()
         
-        self.nutrition_view_model.update_nutrition(self.selected_ingredients)
-        nutrition_data = self.nutrition_view_model.get_nutrition_data()
-        self.update_intake_callback(nutrition_data)
-        write_to_ingredients_json(self.selected_ingredients)
+        self.nutrition_view_model.log_intake(self.selected_ingredients)
         write_to_user_config(self.nutrition_view_model)
         
         self.reset_selection()
+
+    def save_as_recipe(self):
+        """Save the selected ingredients, at their typed serving sizes, as a recipe card."""
+        self.ingredients_frame.commit_serving_sizes()
+        name = ctk.CTkInputDialog(text="Recipe name:", title="Save as Recipe").get_input()
+        if not name:
+            return
+        components = [
+            (ingredient["name"], ingredient.get("custom_serving_size", 0.0))
+            for ingredient in self.ingredient_catalog.expand_recipes(self.selected_ingredients)
+        ]
+        if self.ingredient_catalog.recipes.add(name, components) is None:
+            return
+        self.reset_selection()
+        self.on_search_change()  # Show the new recipe card
+
+    def open_suggestions(self):
+        SuggestionWindow(self, self.nutrition_view_model, self.use_suggestion)
+
+    def use_suggestion(self, portions):
+        """Replace the selection with suggested (ingredient, grams) portions, ready to log."""
+        self.reset_selection()
+        for ingredient, grams in portions:
+            ingredient["custom_serving_size"] = float(grams)
+            self.ingredients_frame.select_ingredient(ingredient)
+
+    def undo_intake(self):
+        if self.nutrition_view_model.undo_intake():
+            write_to_user_config(self.nutrition_view_model)
+
+    def redo_intake(self):
+        if self.nutrition_view_model.redo_intake():
+            write_to_user_config(self.nutrition_view_model)
+
+    def on_history_changed(self, changes):
+        if "can_undo" in changes:
+            self.undo_button.configure(state=ctk.NORMAL if changes["can_undo"] else ctk.DISABLED)
+        if "can_redo" in changes:
+            self.redo_button.configure(state=ctk.NORMAL if changes["can_redo"] else ctk.DISABLED)
         
     def reset_selection(self):
         self.selected_ingredients = []
-        for ingredient_card in self.ingredient_cards:
-            if isinstance(ingredient_card, IngredientCard):
-                ingredient_card.deselect()
+        self.ingredients_frame.clear_selection()
 
         self.update_selected_ingredients_label()
         self.update_button.configure(state=ctk.DISABLED)
+        self.save_recipe_button.configure(state=ctk.DISABLED)
 
     def toggle_sorting(self, selected_option):
         self.sort_cards_callback(selected_option)
@@ -145,8 +209,5 @@ class BottomFrame(ctk.CTkFrame):
     
     def filter_ingredients(self, query):
         if not query:
-            return self.ingredients_data
-        return [
-            ingredient for ingredient in self.ingredients_data
-            if query in ingredient["name"].lower()
-        ]
\ No newline at end of file
+            return self.ingredient_catalog.with_recipes(self.ingredient_catalog.all())
+        return self.ingredient_catalog.with_recipes(self.ingredient_catalog.search(query), query)
\ No newline at end of file
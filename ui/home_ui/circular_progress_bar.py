@@ -1,5 +1,9 @@
 import customtkinter as ctk
 import tkinter as tk
+from config import PROGRESS_ANIMATION_MS
+from ui.animation_clock import animation_clock
+
+MIN_VISIBLE_EXTENT_CHANGE = 0.5  # Degrees; smaller arc changes are not worth a canvas update
 
 class CircularProgressBar(ctk.CTkFrame):
     def __init__(self, master, size, progress, thickness, color, text_color="black"):
@@ -28,6 +32,9 @@ class CircularProgressBar(ctk.CTkFrame):
 
         # Create placeholders for progress arc and text
         self.arc = None
+        self.extent = None
+        self.label_text = None
+        self.displayed_progress = 0  # Progress the arc currently shows, moves during animations
 
         # Update the progress immediately to show the initial value
         self.update_progress(self.progress)
@@ -45,10 +52,12 @@ class CircularProgressBar(ctk.CTkFrame):
         """Update the progress arc and the text."""
         # Store the actual progress
         self.progress = round(progress, 2)
+        self.displayed_progress = progress
 
         # Calculate the angle for the progress arc
         visible_progress = min(progress, 100)  # Cap visible progress at 100%
         angle = 360 * (visible_progress / 100)
+        extent = 359.99 if self.progress >= 100 else angle  # 360 would draw nothing
 
         # Only create the arc once, if not already created
         if self.arc is None:
@@ -56,48 +65,39 @@ class CircularProgressBar(ctk.CTkFrame):
                 self.thickness, self.thickness,
                 self.size - self.thickness, self.size - self.thickness,
                 start=90,  # Start at 12 o'clock (90-degree north)
-                extent=angle,
+                extent=extent,
                 outline=self.color,
                 width=self.thickness,
                 style="arc"
             )
-        else:
-            # Update the arc extent if it's already created
-            if self.progress >= 100:
-                self.canvas.itemconfig(self.arc, extent=359.99)  # Fill the circle
-            else:
-                self.canvas.itemconfig(self.arc, extent=angle)  # Update progress
+            self.extent = extent
+        elif abs(extent - self.extent) >= MIN_VISIBLE_EXTENT_CHANGE or (extent != self.extent and extent in (0, 359.99)):
+            # Update the arc extent if it's already created and the change is visible
+            self.canvas.itemconfig(self.arc, extent=extent)
+            self.extent = extent
 
         # Update the percentage text in the label
-        self.progress_label.config(text=f"{int(self.progress)}%")
+        label_text = f"{int(self.progress)}%"
+        if label_text != self.label_text:
+            self.progress_label.config(text=label_text)
+            self.label_text = label_text
 
     def animate_progress(self, target_progress):
-        """Animate the progress of the circular bar."""
-        current_progress = self.progress
-        step = 1  # Progress increment per animation step
-
+        """
+        Animate the bar to target_progress, up or down, over PROGRESS_ANIMATION_MS on the shared
+        animation clock. A new target while animating retargets the running animation.
+        """
         # Precalculate the visible target percentage (cap at 100 for the visual bar)
         visible_target_progress = min(target_progress, 100)
-
-        def animate():
-            nonlocal current_progress
-
-            # Increment the progress
-            current_progress += step
-
-            # If current progress reaches or exceeds the visible target
-            if current_progress >= visible_target_progress:
-                self.update_progress(visible_target_progress)  # Ensure bar is visually full
-                self.progress = target_progress  # Store the actual value (even >100%)
-                return  # Stop animation here
-
-            # Update the progress and schedule the next step
-            self.update_progress(current_progress)
-            self.after(50, animate)
-
-        # Start the animation if the current progress is below the visible target
-        if current_progress < visible_target_progress:
-            animate()
-        else:
-            # If already full, update the text to reflect the actual target progress
-            self.update_progress(target_progress)
\ No newline at end of file
+        visible_progress = min(self.displayed_progress, 100)
+
+        if visible_progress == visible_target_progress and not animation_clock.is_animating(self):
+            # Already there; only the text may need to reflect the actual target progress
+            self.update_progress(target_progress)
+            return
+
+        animation_clock.animate(
+            self, visible_progress, visible_target_progress, PROGRESS_ANIMATION_MS,
+            on_frame=self.update_progress,
+            on_done=lambda: self.update_progress(target_progress),  # Store the actual value (even >100%)
+        )
\ No newline at end of file
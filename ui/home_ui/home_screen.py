@@ -3,16 +3,15 @@ from ui.home_ui.progress_frame import ProgressFrame
 from ui.home_ui.ingredients_frame import IngredientsFrame  # Import IngredientsFrame
 from ui.home_ui.bottom_frame import BottomFrame
 from PIL import Image
-from config import DARK_MODE_IMG, LOADING_TIME
-from model.data_manager import load_from_ingredients_json, sort_ingredients
-from ui.splash_screen import SplashScreen
+from config import CONSUMED_CARBOHYDRATE, CONSUMED_FAT, CONSUMED_KEYS, CONSUMED_PROTEIN, DARK_MODE_IMG
 
 class HomeScreen(ctk.CTkFrame):
-    def __init__(self, master, nutrition_view_model):
+    def __init__(self, master, nutrition_view_model, ingredient_catalog):
         super().__init__(master)
         self.resize_debounce = None
         
         self.nutrition_view_model = nutrition_view_model
+        self.ingredient_catalog = ingredient_catalog
         self.ingredients_data = []
         self.sorted_ingredients = []
         self.user_goals = {
@@ -23,12 +22,12 @@ class HomeScreen(ctk.CTkFrame):
         }
 
         self.progress_frames = {}  # Dictionary to store the progress frames
-        self.ingredient_cards = []  # List to store IngredientCard instances
-        # self.splash_screen = SplashScreen(master)
         self.initialize_ui()
+        self.nutrition_view_model.subscribe(
+            self.on_nutrition_changed, [CONSUMED_PROTEIN, CONSUMED_CARBOHYDRATE, CONSUMED_FAT, "weight", "date"]
+        )
 
     def initialize_ui(self):
-        # self.splash_screen.grid(row=0, column=0, columnspan=3, padx=10, pady=10, sticky="nsew")        
         self.label = ctk.CTkLabel(self, text="Nutrition Progress", font=("Arial", 20, "bold"))
         self.label.grid(row=0, column=1, columnspan=1, pady=5, sticky="nsew") 
         self.weight_label = ctk.CTkLabel(
@@ -62,8 +61,6 @@ class HomeScreen(ctk.CTkFrame):
     
         self.configure_grid()
         self.load_ingredients_data()  # Immediately load the data
-        
-        # self.after(LOADING_TIME, self.hide_splash_screen)
 
     def configure_grid(self):
         for column in range(3):
@@ -74,18 +71,14 @@ class HomeScreen(ctk.CTkFrame):
 
     def load_ingredients_data(self):
         # Load ingredients data and sort it immediately
-        self.ingredients_data = load_from_ingredients_json()
-        self.sorted_ingredients = sort_ingredients(self.ingredients_data, criteria="frequency_of_use")
+        self.ingredients_data = self.ingredient_catalog.all()
+        self.sorted_ingredients = self.ingredient_catalog.with_recipes(self.ingredient_catalog.sorted_view("frequency_of_use"))
 
         # Proceed to create UI components now that the data is loaded
         self.create_progress_frames()
         self.create_ingredients_frame()  # Replace the old frame with IngredientsFrame
         self.create_bottom_frame()
 
-    # def hide_splash_screen(self):
-    #     self.splash_screen.hide()
-    #     self.create_progress_frames
-
     def create_progress_frames(self):
         goal_names = ["protein", "carbohydrate", "fat"]
         consumed_values = self.nutrition_view_model.get_nutrition_data()
@@ -121,18 +114,24 @@ class HomeScreen(ctk.CTkFrame):
         self.bottom_frame = BottomFrame(
             master=self,
             ingredients_data=self.ingredients_data,
+            ingredient_catalog=self.ingredient_catalog,
             nutrition_view_model=self.nutrition_view_model,
-            update_intake_callback=self.update_intake,
             sort_cards_callback=self.sort_cards,
             search_cards_callback=self.search_cards,
-            ingredient_cards=self.ingredients_frame.ingredient_cards  # Pass ingredient data to BottomFrame
+            ingredients_frame=self.ingredients_frame
         )
         self.bottom_frame.grid(row=3, column=0, columnspan=3, padx=10, pady=10, sticky="nsew")
 
-    def update_intake(self, nutrition_data):
-        # Update each progress frame with the new data
-        for _, progress_frame in self.progress_frames.items():
-            progress_frame.update(nutrition_data)
+    def on_nutrition_changed(self, changes):
+        # Only the progress frames and labels whose values changed are redrawn
+        for goal_name, progress_frame in self.progress_frames.items():
+            consumed_key = CONSUMED_KEYS[goal_name]
+            if consumed_key in changes:
+                progress_frame.update({consumed_key: changes[consumed_key]})
+        if "weight" in changes:
+            self.weight_label.configure(text=f"Weight: {changes['weight']}kg")
+        if "date" in changes:
+            self.date_label.configure(text=f"Date: {changes['date']}")
             
     def toggle_appearance_mode(self):
         """Toggle between light and dark mode when clicked."""
@@ -145,31 +144,20 @@ class HomeScreen(ctk.CTkFrame):
             
     def sort_cards(self, selected_option):
         # Map selected options to the corresponding sorting criteria
-        self.ingredients_data = load_from_ingredients_json()
-        descending = True
+        self.ingredient_catalog.refresh()  # Cheap stat; only re-parses if the file changed on disk
         if selected_option == "Frequency":
             criteria = "frequency_of_use"
         elif selected_option == "Alphabetical":
             criteria = "name"
-            descending = False
         elif selected_option == "Recently Used":
             criteria = "last_used_date"
         elif selected_option == "Protein":
             criteria = "protein"
         elif selected_option == "Carbohydrate":
             criteria = "carbohydrate"
-        self.ingredients_data = sort_ingredients(self.ingredients_data, criteria, descending)
-        self.ingredients_frame.ingredients_data = self.ingredients_data
-        self.ingredients_frame.populate_ingredient_cards()  # Re-populate the ingredient cards after sorting
+        self.ingredients_data = self.ingredient_catalog.with_recipes(self.ingredient_catalog.sorted_view(criteria))
+        self.ingredients_frame.set_ingredients(self.ingredients_data)  # Keeps cards of ingredients still in view
     
     def search_cards(self, filtered_ingredients):
-        # filtered_ids = {ingredient["id"] for ingredient in filtered_ingredients}
-        # # Loop through existing ingredient cards and toggle visibility
-        # for card in self.ingredients_frame.ingredient_cards:
-        #     if card.ingredient_data["id"] in filtered_ids:
-        #         card.grid()  # Show the card
-        #     else:
-        #         card.grid_remove()
         self.ingredients_data = filtered_ingredients
-        self.ingredients_frame.ingredients_data = self.ingredients_data
-        self.ingredients_frame.populate_ingredient_cards()
\ No newline at end of file
+        self.ingredients_frame.set_ingredients(self.ingredients_data)
\ No newline at end of file
@@ -1,13 +1,34 @@
 import customtkinter as ctk
+from config import (
+    INGREDIENT_CARD_HEIGHT,
+    INGREDIENT_CARD_PADDING,
+    INGREDIENT_CARD_WIDTH,
+    INGREDIENT_GRID_OVERSCAN_ROWS,
+)
 from ui.ingredients_ui.ingredient_card import IngredientCard
+from ui.render_scheduler import RenderScheduler
 
 class IngredientsFrame(ctk.CTkFrame):
+    """
+    Virtualized ingredient grid. Only the rows in view (plus INGREDIENT_GRID_OVERSCAN_ROWS) have
+    IngredientCard widgets; scrolling rebinds the cards that left the view to the ingredients that
+    entered it, so the widget count stays flat however large the catalog grows.
+    Cards entering the view are shown in frame-budgeted batches by a RenderScheduler.
+    """
     def __init__(self, master, ingredients_data, update_bottom_frame_callback):
         super().__init__(master)
         self.ingredients_data = ingredients_data
         self.update_bottom_frame_callback = update_bottom_frame_callback
         self.resize_debounce = None
-        self.ingredient_cards = []  # List to store IngredientCard instances
+        self.update_pending = None
+        self.render_scheduler = RenderScheduler(self)
+        self.ingredient_cards = []  # Every IngredientCard instance, bound or free
+        self.visible_cards = {}  # Index in ingredients_data -> bound IngredientCard
+        self.free_cards = []  # Cards hidden and waiting to be rebound
+        self.selected_ids = set()  # Ids of selected ingredients, so selection survives recycling
+        self.cards_per_row = 3
+        self.slot_width = self._apply_widget_scaling(INGREDIENT_CARD_WIDTH + 2 * INGREDIENT_CARD_PADDING)
+        self.row_height = self._apply_widget_scaling(INGREDIENT_CARD_HEIGHT + 2 * INGREDIENT_CARD_PADDING)
 
         self.create_scrollable_frame()
         self.populate_ingredient_cards()
@@ -15,102 +36,203 @@ class IngredientsFrame(ctk.CTkFrame):
     def create_scrollable_frame(self):
         self.canvas = ctk.CTkCanvas(self, highlightthickness=0)
         self.canvas.pack(side="left", fill="both", expand=True)
+        self.update_canvas_color()
 
         self.scrollbar = ctk.CTkScrollbar(self, orientation="vertical", command=self.canvas.yview)
         self.scrollbar.pack(side="right", fill="y")
 
-        self.canvas.configure(yscrollcommand=self.scrollbar.set)
-
-        self.scrollable_frame = ctk.CTkFrame(self.canvas)
-        self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
-        self.scrollable_frame.bind("<Configure>", lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all")))
+        self.canvas.configure(yscrollcommand=self.on_canvas_scroll)
         self.bind("<Configure>", self.on_frame_resize)
 
+    def update_canvas_color(self):
+        # Cards sit directly on the canvas, so its background shows between them
+        self.canvas.configure(bg=self._apply_appearance_mode(self.cget("fg_color")))
+
+    def _set_appearance_mode(self, mode_string):
+        super()._set_appearance_mode(mode_string)
+        self.update_canvas_color()
+
     def on_frame_resize(self, event):
         # Recalculate the number of cards per row when the frame size changes
         if self.resize_debounce is not None:
             self.after_cancel(self.resize_debounce)
-        
-        self.resize_debounce = self.after(10, self.populate_ingredient_cards)
+
+        self.resize_debounce = self.after(10, self.reflow_cards)
+
+    def reflow_cards(self):
+        """
+        Move the existing cards only when the number of cards per row changed; otherwise just bind
+        cards for rows that a taller frame brought into view. Cards and their images are kept.
+        """
+        self.resize_debounce = None
+        cards_per_row = self.calculate_cards_per_row()
+        if cards_per_row == self.cards_per_row:
+            self.update_visible_cards()
+            return
+
+        top_index = int(self.canvas.canvasy(0) // self.row_height) * self.cards_per_row
+        self.cards_per_row = cards_per_row
+        self.update_layout()
+        for index, ingredient_card in self.visible_cards.items():
+            self.canvas.coords(ingredient_card.window_id, *self.card_position(index))
+        # Keep the ingredient that was at the top in view
+        if self.ingredients_data:
+            self.canvas.yview_moveto(top_index // cards_per_row / self.row_count())
+        self.update_visible_cards()
+
+    def on_canvas_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        self.schedule_visible_update()
 
     def calculate_cards_per_row(self):
-        frame_width = self.winfo_width()
-        card_width = 150
-        return max(3, frame_width // card_width)
+        # Same units as card_position: the canvas (without the scrollbar) over the scaled card slot
+        canvas_width = self.canvas.winfo_width()
+        slot_width = self._apply_widget_scaling(INGREDIENT_CARD_WIDTH + 2 * INGREDIENT_CARD_PADDING)
+        return max(1, int(canvas_width // slot_width))
 
     def populate_ingredient_cards(self):
-        # Calculate number of columns once
+        """Lay the grid out for ingredients_data from the top, rebinding the existing card widgets."""
         self.cards_per_row = self.calculate_cards_per_row()
+        for index in list(self.visible_cards):
+            self.release_card(index)
+        self.update_layout()
+        self.canvas.yview_moveto(0)
+        self.update_visible_cards()
+
+    def set_ingredients(self, ingredients_data):
+        """
+        Show a new ordered list (a search result or another sort order) from the top.
+        Cards are matched to ingredients by id: cards whose ingredient is still in view are only
+        moved, keeping the typed serving size and selection, and only newly shown ingredients get
+        a recycled card rebound to them.
+        """
+        self.ingredients_data = ingredients_data
+        bound_cards = {card.ingredient_data["id"]: card for card in self.visible_cards.values()}
+        self.visible_cards = {}
+        self.update_layout()
+        self.canvas.yview_moveto(0)
+
+        first, last = self.visible_range()
+        for index in range(first, last):
+            ingredient = self.ingredients_data[index]
+            ingredient_card = bound_cards.pop(ingredient["id"], None)
+            if ingredient_card is None:
+                continue
+            if ingredient_card.ingredient_data is not ingredient:
+                # The catalog was reloaded; carry the typed serving size over to the fresh entry
+                ingredient_card.ingredient_data = ingredient
+                ingredient_card.on_serving_size_change()
+                ingredient_card.bind_data(ingredient, ingredient["id"] in self.selected_ids)
+            self.canvas.coords(ingredient_card.window_id, *self.card_position(index))
+            self.visible_cards[index] = ingredient_card
+        for ingredient_card in bound_cards.values():
+            self.hide_card(ingredient_card)
+        self.update_visible_cards()
+
+    def schedule_visible_update(self):
+        if self.update_pending is None:
+            self.update_pending = self.after_idle(self.update_visible_cards)
+
+    def row_count(self):
+        return -(-len(self.ingredients_data) // self.cards_per_row)
+
+    def update_layout(self):
+        """Fix the column width and the scrollable height for the current cards_per_row."""
+        self.slot_width = self.canvas.winfo_width() / self.cards_per_row
+        self.canvas.configure(scrollregion=(0, 0, self.canvas.winfo_width(), self.row_count() * self.row_height))
+
+    def visible_range(self):
+        """Return the [first, last) ingredient indexes whose rows are in view or in the overscan."""
+        top = self.canvas.canvasy(0)
+        bottom = top + max(self.canvas.winfo_height(), self.row_height)
+        first_row = max(0, int(top // self.row_height) - INGREDIENT_GRID_OVERSCAN_ROWS)
+        last_row = int(bottom // self.row_height) + INGREDIENT_GRID_OVERSCAN_ROWS
+        first = first_row * self.cards_per_row
+        last = min(len(self.ingredients_data), (last_row + 1) * self.cards_per_row)
+        return first, last
+
+    def update_visible_cards(self):
+        """Bind cards to the ingredients entering the view and free the ones that left it."""
+        self.update_pending = None
+        first, last = self.visible_range()
+        for index in [index for index in self.visible_cards if not first <= index < last]:
+            self.release_card(index)
+        # Restarting drops cards queued for indexes that scrolled away before they were shown
+        self.render_scheduler.run(
+            [index for index in range(first, last) if index not in self.visible_cards], self.show_pending_card
+        )
 
-        # Clear the current ingredient cards before repopulating
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
-        self.ingredient_cards.clear()
-
-        # Ensure column weights are correctly set
-        for col in range(self.cards_per_row):
-            self.scrollable_frame.grid_columnconfigure(col, weight=1)
-
-        # Start displaying cards one by one
-        self.display_card_with_animation(0)
+    def show_pending_card(self, index):
+        if index not in self.visible_cards:
+            self.show_card(index)
 
-    def display_card_with_animation(self, index):
-        """Recursively display ingredient cards with one-by-one animation, ensuring each row fills before new ones appear."""
-        
-        if index >= len(self.ingredients_data):
-            self.canvas.configure(scrollregion=self.canvas.bbox("all"))  # Ensure scrolling updates correctly
-            return  # Stop if all cards are placed
+    def card_position(self, index):
+        row, col = divmod(index, self.cards_per_row)
+        card_width = self._apply_widget_scaling(INGREDIENT_CARD_WIDTH)
+        x = col * self.slot_width + max(0, (self.slot_width - card_width) / 2)
+        y = row * self.row_height + self._apply_widget_scaling(INGREDIENT_CARD_PADDING)
+        return x, y
 
+    def show_card(self, index):
         ingredient = self.ingredients_data[index]
-        row = index // self.cards_per_row
-        col = index % self.cards_per_row
-
-        # Create ingredient card
+        selected = ingredient["id"] in self.selected_ids
+        if self.free_cards:
+            ingredient_card = self.free_cards.pop()
+            ingredient_card.bind_data(ingredient, selected)
+        else:
+            ingredient_card = self.create_card(ingredient)
+            ingredient_card.set_selected(selected)
+        self.canvas.coords(ingredient_card.window_id, *self.card_position(index))
+        self.canvas.itemconfigure(ingredient_card.window_id, state="normal")
+        self.visible_cards[index] = ingredient_card
+
+    def release_card(self, index):
+        self.hide_card(self.visible_cards.pop(index))
+
+    def hide_card(self, ingredient_card):
+        ingredient_card.on_serving_size_change()  # Keep what the user typed before the card is rebound
+        self.canvas.itemconfigure(ingredient_card.window_id, state="hidden")
+        self.free_cards.append(ingredient_card)
+
+    def create_card(self, ingredient):
         ingredient_card = IngredientCard(
-            self.scrollable_frame,
+            self.canvas,
             index=ingredient["id"],
             ingredient_data=ingredient,
-            update_selected_data_callback=self.update_bottom_frame_callback,
+            update_selected_data_callback=self.on_card_selected,
             selection_type="intake",
-            width=150,
-            height=250
+            width=INGREDIENT_CARD_WIDTH,
+            height=INGREDIENT_CARD_HEIGHT
         )
         ingredient_card.add_name()
         ingredient_card.add_nutrition_data()
         ingredient_card.add_image(ingredient["image"])
         ingredient_card.add_custom_serving_size()
-
-        # Place card in correct row and column
-        ingredient_card.grid(row=row, column=col, padx=5, pady=5, sticky="nsew")
+        ingredient_card.window_id = self.canvas.create_window(0, 0, window=ingredient_card, anchor="nw")
         self.ingredient_cards.append(ingredient_card)
-
-        # Ensure the row is correctly sized
-        self.scrollable_frame.grid_rowconfigure(row, weight=1)
-
-        # Start fade-in animation and schedule the next card a bit earlier
-        self.fade_in_card(ingredient_card, lambda: self.after(10, lambda: self.display_card_with_animation(index + 1)))
-
-    def fade_in_card(self, card, callback):
-        """Simulate a fade-in effect with controlled timing to prevent skipping."""
-        opacity_levels = [0.2 * i for i in range(1, 6)]  # Gradual visibility increase
-
-        def set_opacity(level_index):
-            if level_index >= len(opacity_levels):
-                callback()  # Only trigger the next card when fade-in is complete
-                return
-
-            if not str(card).startswith("."):
-                return  # Stop if widget is destroyed
-
-            card.update_idletasks()  # Force UI redraw
-            card.master.update_idletasks()
-
-            # Ensure the card remains visible in the grid
-            try:
-                card.grid()
-            except Exception:
-                return  # Prevent errors if the widget is gone
-
-            self.after(10, lambda: set_opacity(level_index + 1))
-
-        set_opacity(0)
\ No newline at end of file
+        return ingredient_card
+
+    def on_card_selected(self, ingredient_data, add):
+        if add:
+            self.selected_ids.add(ingredient_data["id"])
+        else:
+            self.selected_ids.discard(ingredient_data["id"])
+        self.update_bottom_frame_callback(ingredient_data, add)
+
+    def select_ingredient(self, ingredient):
+        """Select an ingredient as if its card was clicked, whether or not the card is in view."""
+        self.selected_ids.add(ingredient["id"])
+        for ingredient_card in self.visible_cards.values():
+            if ingredient_card.ingredient_data is ingredient:
+                ingredient_card.bind_data(ingredient, True)  # Also shows its new serving size
+        self.update_bottom_frame_callback(ingredient, True)
+
+    def commit_serving_sizes(self):
+        """Store the serving sizes typed into the bound cards on their ingredients."""
+        for ingredient_card in self.visible_cards.values():
+            ingredient_card.on_serving_size_change()
+
+    def clear_selection(self):
+        self.selected_ids.clear()
+        for ingredient_card in self.visible_cards.values():
+            ingredient_card.deselect()
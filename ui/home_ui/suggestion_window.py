@@ -0,0 +1,78 @@
+import customtkinter as ctk
+from config import *
+
+
+class SuggestionWindow(ctk.CTkToplevel):
+    """Shows the portions suggested to reach today's remaining goals; 'Use' selects them on the home grid."""
+    def __init__(self, master, nutrition_view_model, on_use_callback):
+        super().__init__(master)
+        self.title("Suggest Portions")
+        self.center_window(SUGGESTION_WINDOW_WIDTH, SUGGESTION_WINDOW_HEIGHT)
+        self.resizable(True, True)
+
+        self.nutrition_view_model = nutrition_view_model
+        self.on_use_callback = on_use_callback
+
+        self.create_widgets()
+        self.refresh()
+
+    def center_window(self, width, height):
+        """Center the window on the screen."""
+        screen_width = self.winfo_screenwidth()
+        screen_height = self.winfo_screenheight()
+        x = (screen_width - width) // 2
+        y = (screen_height - height) // 2
+        self.geometry(f"{width}x{height}+{x}+{y}")
+
+    def create_widgets(self):
+        self.remaining_label = ctk.CTkLabel(self, text="", font=("Arial", 14, "bold"))
+        self.remaining_label.pack(pady=(10, 5), padx=20, fill="x")
+
+        options_frame = ctk.CTkFrame(self, fg_color="transparent")
+        options_frame.pack(pady=5, padx=20, fill="x")
+        self.frequent_only_var = ctk.BooleanVar(value=False)
+        self.frequent_only_checkbox = ctk.CTkCheckBox(
+            options_frame, text="Frequently used only", variable=self.frequent_only_var, command=self.refresh
+        )
+        self.frequent_only_checkbox.pack(side="left")
+        self.refresh_button = ctk.CTkButton(options_frame, text="Refresh", width=80, command=self.refresh)
+        self.refresh_button.pack(side="right")
+
+        self.results_frame = ctk.CTkScrollableFrame(self)
+        self.results_frame.pack(pady=10, padx=20, expand=True, fill="both")
+
+    def refresh(self):
+        remaining = self.nutrition_view_model.get_remaining_nutrition()
+        self.remaining_label.configure(
+            text=f"Remaining: P {remaining['protein']:.0f} g | C {remaining['carbohydrate']:.0f} g | "
+                 f"F {remaining['fat']:.0f} g | {remaining['calories']:.0f} kcal"
+        )
+        for child in self.results_frame.winfo_children():
+            child.destroy()
+
+        suggestions = self.nutrition_view_model.suggest_portions(self.frequent_only_var.get())
+        if not suggestions:
+            ctk.CTkLabel(self.results_frame, text="Nothing to suggest, the goals are met.").pack(pady=10)
+            return
+        for suggestion in suggestions:
+            self.add_suggestion_row(suggestion)
+
+    def add_suggestion_row(self, suggestion):
+        row = ctk.CTkFrame(self.results_frame)
+        row.pack(pady=5, padx=5, fill="x")
+        portions = "\n".join(
+            f"{grams} g {ingredient['name'].replace('_', ' ').title()}" for ingredient, grams in suggestion["portions"]
+        )
+        totals = dict(zip(NUTRIENTS, suggestion["totals"]))
+        summary = (
+            f"P {totals['protein']:.0f} g | C {totals['carbohydrate']:.0f} g | F {totals['fat']:.0f} g | "
+            f"{totals['calories']:.0f} kcal ({suggestion['deviation'] * 100:.1f}% off)"
+        )
+        ctk.CTkLabel(row, text=f"{portions}\n{summary}", justify="left", anchor="w").pack(
+            side="left", padx=10, pady=5, expand=True, fill="x"
+        )
+        ctk.CTkButton(row, text="Use", width=60, command=lambda: self.use(suggestion)).pack(side="right", padx=10)
+
+    def use(self, suggestion):
+        self.on_use_callback(suggestion["portions"])
+        self.destroy()
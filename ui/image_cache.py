@@ -0,0 +1,170 @@
+import hashlib
+import os
+import queue
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import customtkinter as ctk
+from PIL import Image
+from config import IMAGE_CACHE_SIZE, IMAGE_DECODE_WORKERS, IMAGE_POLL_MS, THUMBNAIL_CACHE_LIMIT, THUMBNAIL_PATH
+
+
+class ImageCache:
+    """
+    Ingredient images shared by every view.
+    Ready CTkImages are kept in an LRU per (path, size); resized thumbnails are also written to
+    THUMBNAIL_PATH, keyed by source path, mtime and size, so a PNG is decoded at full size only once.
+    Reading a thumbnail bumps its mtime, so prune() can drop the least recently used ones, including
+    those left behind by edited or deleted images.
+    load_async decodes on a thread pool and hands the CTkImage back on the Tk main thread.
+    """
+    def __init__(self, thumbnail_path=THUMBNAIL_PATH, capacity=IMAGE_CACHE_SIZE, workers=IMAGE_DECODE_WORKERS):
+        self.thumbnail_path = thumbnail_path
+        self.capacity = capacity
+        self.images = OrderedDict()  # (path, size) -> CTkImage, least recently used first
+        self.placeholders = {}  # size -> CTkImage shown while the real image decodes
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="image-decoder")
+        self.decoded = queue.Queue()  # (key, PIL image) from the workers, drained on the main thread
+        self.waiting = {}  # (path, size) -> callbacks of requests being decoded
+        self.poll_root = None
+        self.polling = False
+
+    def get(self, image_path, size):
+        """
+        Return a CTkImage of image_path resized to size, or None if the image cannot be read.
+        Call from the Tk main thread.
+        """
+        key = (image_path, size)
+        with self.lock:
+            image = self.images.get(key)
+            if image is not None:
+                self.images.move_to_end(key)
+                return image
+        thumbnail = self.load_thumbnail(image_path, size)
+        if thumbnail is None:
+            return None
+        return self.put(image_path, size, thumbnail)
+
+    def peek(self, image_path, size):
+        """Return the CTkImage if it is already in memory, without decoding anything."""
+        with self.lock:
+            image = self.images.get((image_path, size))
+            if image is not None:
+                self.images.move_to_end((image_path, size))
+            return image
+
+    def placeholder(self, size):
+        """A light translucent square to show until an image is decoded."""
+        if size not in self.placeholders:
+            self.placeholders[size] = ctk.CTkImage(Image.new("RGBA", size, (128, 128, 128, 60)), size=size)
+        return self.placeholders[size]
+
+    def load_async(self, widget, image_path, size, callback):
+        """
+        Decode image_path on the thread pool and call callback(CTkImage or None) on the Tk main
+        thread. Requests for the same (path, size) share one decode. Callers cancel by ignoring
+        the callback, e.g. when the card that asked has been rebound or destroyed meanwhile.
+        """
+        key = (image_path, size)
+        if key in self.waiting:
+            self.waiting[key].append(callback)
+            return
+        self.waiting[key] = [callback]
+        self.executor.submit(self._decode, key)
+        if self.poll_root is None:
+            self.poll_root = widget.nametowidget(".")
+        if not self.polling:
+            self.polling = True
+            self.poll_root.after(IMAGE_POLL_MS, self._poll)
+
+    def _decode(self, key):
+        thumbnail = None
+        try:
+            thumbnail = self.load_thumbnail(*key)
+        finally:
+            self.decoded.put((key, thumbnail))
+
+    def _poll(self):
+        while True:
+            try:
+                key, thumbnail = self.decoded.get_nowait()
+            except queue.Empty:
+                break
+            image = self.put(*key, thumbnail) if thumbnail is not None else None
+            for callback in self.waiting.pop(key, []):
+                try:
+                    callback(image)
+                except Exception as e:
+                    print(f"Error showing image {key[0]}: {e}")
+        if self.waiting:
+            self.poll_root.after(IMAGE_POLL_MS, self._poll)
+        else:
+            self.polling = False
+
+    def put(self, image_path, size, thumbnail):
+        """Wrap a resized PIL image in a CTkImage and keep it in the LRU."""
+        image = ctk.CTkImage(thumbnail, size=size)
+        with self.lock:
+            self.images[(image_path, size)] = image
+            self.images.move_to_end((image_path, size))
+            while len(self.images) > self.capacity:
+                self.images.popitem(last=False)
+        return image
+
+    def load_thumbnail(self, image_path, size):
+        """Return the resized PIL image, from the disk cache when possible. Safe to call from any thread."""
+        try:
+            thumbnail_file = self.thumbnail_file(image_path, size)
+            if os.path.exists(thumbnail_file):
+                with Image.open(thumbnail_file) as thumbnail:
+                    thumbnail = thumbnail.convert("RGBA")
+                try:
+                    os.utime(thumbnail_file)  # Marks it recently used for prune()
+                except OSError:
+                    pass
+                return thumbnail
+            with Image.open(image_path) as source:
+                thumbnail = source.convert("RGBA").resize(size)
+        except OSError as e:
+            print(f"Error loading image {image_path}: {e}")
+            return None
+
+        try:
+            os.makedirs(self.thumbnail_path, exist_ok=True)
+            temp_file = f"{thumbnail_file}.{threading.get_ident()}.tmp"
+            thumbnail.save(temp_file, format="PNG")
+            os.replace(temp_file, thumbnail_file)
+        except OSError as e:
+            print(f"Error saving thumbnail for {image_path}: {e}")
+        return thumbnail
+
+    def prune(self, limit=THUMBNAIL_CACHE_LIMIT):
+        """Delete the least recently used thumbnails beyond limit, and temp files of interrupted writes."""
+        try:
+            entries = list(os.scandir(self.thumbnail_path))
+        except OSError:
+            return  # Nothing cached yet
+        thumbnails = []
+        for entry in entries:
+            try:
+                if entry.name.endswith(".tmp"):
+                    os.remove(entry.path)
+                elif entry.name.endswith(".png"):
+                    thumbnails.append((entry.stat().st_mtime_ns, entry.path))
+            except OSError:
+                continue  # Removed meanwhile
+        thumbnails.sort(reverse=True)
+        for _, path in thumbnails[limit:]:
+            try:
+                os.remove(path)
+            except OSError as e:
+                print(f"Error pruning thumbnail {path}: {e}")
+
+    def thumbnail_file(self, image_path, size):
+        stat = os.stat(image_path)
+        source = f"{os.path.abspath(image_path)}|{stat.st_mtime_ns}|{size[0]}x{size[1]}"
+        return os.path.join(self.thumbnail_path, f"{hashlib.sha1(source.encode('utf-8')).hexdigest()}.png")
+
+
+image_cache = ImageCache()
@@ -1,6 +1,6 @@
 import customtkinter as ctk
 from tkinter import filedialog
-from PIL import Image
+from ui.image_cache import image_cache
 
 from config import *
 
@@ -106,17 +106,20 @@ class AddIngredientWindow(ctk.CTkToplevel):
             return None  # Return None if no file is created
 
         self.selected_image_path = file_path
-        img = Image.open(file_path)
-        self.after(100, lambda: self.set_image(img))
+        self.image_label.configure(image=image_cache.placeholder((128, 128)), text="")
+        # Decode off the main thread; skip the result if another image was picked or the window closed
+        image_cache.load_async(
+            self, file_path, (128, 128),
+            lambda img_ctk: self.set_image(img_ctk) if self.winfo_exists() and self.selected_image_path == file_path else None
+        )
 
-    def set_image(self, img):
-        """Update the image label to fit without resizing."""
-        width, height = self.image_label.winfo_width(), self.image_label.winfo_height()
-        
-        if width > 0 and height > 0:  # Ensure valid dimensions
-            img_ctk = ctk.CTkImage(img, size=(width, height))
-            self.image_label.configure(image=img_ctk, text="")
-            self.image_label.image = img_ctk  # Prevent garbage collection
+    def set_image(self, img_ctk):
+        """Show the decoded image, sized to the image label."""
+        if img_ctk is None:
+            self.image_label.configure(image=None, text="Unreadable Image")
+            return
+        self.image_label.configure(image=img_ctk, text="")
+        self.image_label.image = img_ctk  # Prevent garbage collection
             
     def confirm(self):
         """Collect input data and pass it back to the main screen."""
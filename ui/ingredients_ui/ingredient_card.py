@@ -1,5 +1,5 @@
 import customtkinter as ctk
-from PIL import Image
+from ui.image_cache import image_cache
 
 
 class IngredientCard(ctk.CTkFrame):
@@ -34,13 +34,42 @@ class IngredientCard(ctk.CTkFrame):
         self.carbs_label = None
         self.fat_label = None
         self.image_label = None
+        self.image_request = 0  # Bumped on every image change, so stale decodes are dropped
+
+    def bind_data(self, ingredient_data, selected=False):
+        """Rebind a recycled card to another ingredient, updating its existing widgets in place."""
+        self.ingredient_data = ingredient_data
+        self.index = ingredient_data["id"]
+        if self.card_label:
+            self.card_label.configure(text=self.name_text())
+        if self.protein_label:
+            self.protein_label.configure(text=self.nutrition_text("protein"))
+        if self.carbs_label:
+            self.carbs_label.configure(text=self.nutrition_text("carbohydrate"))
+        if self.fat_label:
+            self.fat_label.configure(text=self.nutrition_text("fat"))
+        if self.image_label:
+            self.set_image(ingredient_data.get("image"))
+        else:
+            self.add_image(ingredient_data.get("image"))
+        if hasattr(self, 'serving_size_entry'):
+            self.serving_size_var.set(ingredient_data.get("custom_serving_size", 100))
+        self.set_selected(selected)
+
+    def name_text(self):
+        name = self.ingredient_data['name'].replace('_', ' ').title()
+        return f"{name} (Recipe)" if self.ingredient_data.get("recipe") else name
+
+    def nutrition_text(self, nutrient):
+        label = "Carbohydrate" if nutrient == "carbohydrate" else nutrient.capitalize()
+        return f"{label}: {self.ingredient_data['nutrition'][nutrient]}g"
 
     def add_name(self):
         """Add the ingredient name label."""
         if not self.card_label:
             self.card_label = ctk.CTkLabel(
                 self,
-                text=f"{self.ingredient_data['name'].replace('_', ' ').title()}",
+                text=self.name_text(),
                 font=("Arial", 14, "bold"),
             )
             self.card_label.grid(row=0, column=0, pady=(10, 0))
@@ -52,7 +81,7 @@ class IngredientCard(ctk.CTkFrame):
     def add_nutrition_data(self):
         """Add the nutritional information labels."""
         if not self.protein_label:
-            self.protein_label = ctk.CTkLabel(self, text=f"Protein: {self.ingredient_data['nutrition']['protein']}g")
+            self.protein_label = ctk.CTkLabel(self, text=self.nutrition_text("protein"))
             self.protein_label.grid(row=1, column=0, pady=(0, 5))
             # Bind hover and select events to the protein label
             self.protein_label.bind("<Enter>", self.on_hover)
@@ -60,7 +89,7 @@ class IngredientCard(ctk.CTkFrame):
             self.protein_label.bind("<Button-1>", self.toggle_select)
 
         if not self.carbs_label:
-            self.carbs_label = ctk.CTkLabel(self, text=f"Carbohydrate: {self.ingredient_data['nutrition']['carbohydrate']}g")
+            self.carbs_label = ctk.CTkLabel(self, text=self.nutrition_text("carbohydrate"))
             self.carbs_label.grid(row=2, column=0, pady=(0, 5))
             # Bind hover and select events to the carbs label
             self.carbs_label.bind("<Enter>", self.on_hover)
@@ -68,7 +97,7 @@ class IngredientCard(ctk.CTkFrame):
             self.carbs_label.bind("<Button-1>", self.toggle_select)
 
         if not self.fat_label:
-            self.fat_label = ctk.CTkLabel(self, text=f"Fat: {self.ingredient_data['nutrition']['fat']}g")
+            self.fat_label = ctk.CTkLabel(self, text=self.nutrition_text("fat"))
             self.fat_label.grid(row=3, column=0, pady=(0, 10))
             # Bind hover and select events to the fat label
             self.fat_label.bind("<Enter>", self.on_hover)
@@ -78,17 +107,37 @@ class IngredientCard(ctk.CTkFrame):
     def add_image(self, image_path=None):
         """Add the ingredient image if image_path is provided."""
         if image_path and not self.image_label:
-            img = Image.open(image_path).convert("RGBA")
-            img = img.resize((100, 100))
-            img_ctk = ctk.CTkImage(img, size=(100, 100))
-            self.image_label = ctk.CTkLabel(self, image=img_ctk, text=None)
-            self.image_label.image = img_ctk
+            self.image_label = ctk.CTkLabel(self, image=image_cache.placeholder((100, 100)), text=None)
+            self.set_image(image_path)
             self.image_label.grid(row=4, column=0, pady=(10, 5))
             # Bind hover and select events to the image label
             self.image_label.bind("<Enter>", self.on_hover)
             self.image_label.bind("<Leave>", self.on_leave)
             self.image_label.bind("<Button-1>", self.toggle_select)
 
+    def set_image(self, image_path):
+        """
+        Show the image of image_path, e.g. after the card was rebound. Images not in memory yet are
+        decoded in the background behind a placeholder.
+        """
+        self.image_request += 1
+        request = self.image_request
+        img_ctk = image_cache.peek(image_path, (100, 100)) if image_path else None
+        if image_path and img_ctk is None:
+            img_ctk = image_cache.placeholder((100, 100))
+
+            def on_image_loaded(loaded_image):
+                # Drop the result if the card was rebound or destroyed in the meantime
+                if request == self.image_request and self.winfo_exists():
+                    self.show_image(loaded_image)
+
+            image_cache.load_async(self, image_path, (100, 100), on_image_loaded)
+        self.show_image(img_ctk)
+
+    def show_image(self, img_ctk):
+        self.image_label.configure(image=img_ctk)
+        self.image_label.image = img_ctk
+
     def toggle_select(self, event=None):
         """Toggle selection of the ingredient card based on the selection type."""
         if self.selection_type == 'intake':
@@ -125,8 +174,12 @@ class IngredientCard(ctk.CTkFrame):
 
     def deselect(self):
         """Deselect the ingredient card."""
-        self.selected = False
-        self.configure(fg_color=self.default_border_color)
+        self.set_selected(False)
+
+    def set_selected(self, selected):
+        """Show the selection state without notifying the selection callback."""
+        self.selected = selected
+        self.configure(fg_color=self.highlight_color if selected else self.default_border_color)
 
     def on_hover(self, event=None):
         """Change the appearance of the card on hover."""
@@ -2,18 +2,20 @@ import customtkinter as ctk
 from config import ADD_INGREDIENT_IMG
 from ui.ingredients_ui.ingredient_card import IngredientCard
 from PIL import Image
-from model.data_manager import add_ingredient_to_ingredients_json, load_from_ingredients_json, sort_ingredients
+from ui.image_cache import image_cache
+from ui.render_scheduler import RenderScheduler
 from ui.ingredients_ui.add_ingredient_window import AddIngredientWindow  # Import new pop-up
 
 
 class IngredientScreen(ctk.CTkFrame):
-    def __init__(self, parent, width=600, height=600):
+    def __init__(self, parent, ingredient_catalog, width=600, height=600):
         super().__init__(parent, width=width, height=height)
 
-        # Load ingredient data
-        self.ingredients_data = load_from_ingredients_json()
-        sorted_ingredients = sort_ingredients(self.ingredients_data, criteria="name", descending = False)
-        self.ingredients_data = sorted_ingredients
+        # Load ingredient data from the shared catalog
+        self.ingredient_catalog = ingredient_catalog
+        self.ingredients_data = self.ingredient_catalog.sorted_view("name")
+        self.ingredient_cards = []  # Store references to cards
+        self.render_scheduler = RenderScheduler(self)
         # Initialize UI
         self.initialize_ui()
 
@@ -122,10 +124,9 @@ class IngredientScreen(ctk.CTkFrame):
         self.detail_title_label.configure(text=ingredient_data["name"].replace('_', ' ').title())
 
         # Update the image if available
-        if "image" in ingredient_data:
-            img = Image.open(ingredient_data["image"]).resize((150, 150))
-            img_ctk = ctk.CTkImage(img, size=(200, 200))
-            self.detail_image_label.configure(image=img_ctk)
+        img_ctk = image_cache.get(ingredient_data["image"], (200, 200)) if ingredient_data.get("image") else None
+        if img_ctk is not None:
+            self.detail_image_label.configure(image=img_ctk, text="")
             self.detail_image_label.image = img_ctk
         else:
             self.detail_image_label.configure(image=None, text="No Image")
@@ -141,27 +142,33 @@ class IngredientScreen(ctk.CTkFrame):
 
 
     def populate_ingredient_cards(self):
-        self.ingredient_cards = []  # Store references to cards
-        for index, ingredient in enumerate(self.ingredients_data):
-            ingredient_card = IngredientCard(
-                self.scrollable_frame,
-                index=index,
-                ingredient_data=ingredient,
-                update_selected_data_callback=self.update_selected_ingredient,
-                selection_type="detail",
-                width=150,
-                height=200,
-            )
-            ingredient_card.add_name()
-            ingredient_card.add_image(ingredient["image"])
-
-            ingredient_card.grid(row=0, column=index, padx=5, pady=5, sticky="nsew")
-            self.ingredient_cards.append(ingredient_card)
+        # Cards are built in small batches per frame so the screen stays responsive
+        for ingredient_card in self.ingredient_cards:
+            ingredient_card.destroy()
+        self.ingredient_cards = []
+        self.render_scheduler.run(enumerate(self.ingredients_data), self.add_ingredient_card)
+
+    def add_ingredient_card(self, item):
+        index, ingredient = item
+        ingredient_card = IngredientCard(
+            self.scrollable_frame,
+            index=index,
+            ingredient_data=ingredient,
+            update_selected_data_callback=self.update_selected_ingredient,
+            selection_type="detail",
+            width=150,
+            height=200,
+        )
+        ingredient_card.add_name()
+        ingredient_card.add_image(ingredient["image"])
+
+        ingredient_card.grid(row=0, column=index, padx=5, pady=5, sticky="nsew")
+        self.ingredient_cards.append(ingredient_card)
 
     def add_ingredient(self):
         """Open the Add Ingredient pop-up window."""
         def on_confirm(new_ingredient):
             print("New Ingredient:", new_ingredient)
-            add_ingredient_to_ingredients_json(new_ingredient)
+            self.ingredient_catalog.add(new_ingredient)
         
         AddIngredientWindow(self, on_confirm)
\ No newline at end of file
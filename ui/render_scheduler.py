@@ -0,0 +1,60 @@
+import time
+from config import RENDER_BUDGET_MS, RENDER_FRAME_MS
+
+
+class RenderScheduler:
+    """
+    Runs UI work in batches on the Tk event loop. Each tick processes items until budget_ms is
+    spent, then yields so Tk can draw the cards built so far and stay responsive to input.
+    Starting a new run cancels whatever the previous one had left.
+    """
+    def __init__(self, widget, budget_ms=RENDER_BUDGET_MS, frame_ms=RENDER_FRAME_MS):
+        self.widget = widget
+        self.budget = budget_ms / 1000
+        self.frame_ms = frame_ms
+        self.items = []
+        self.position = 0
+        self.render = None
+        self.on_done = None
+        self.job = None
+
+    def run(self, items, render, on_done=None):
+        """Call render(item) for every item over as many ticks as needed, then on_done()."""
+        self.cancel()
+        self.items = list(items)
+        self.position = 0
+        self.render = render
+        self.on_done = on_done
+        if self.items:
+            self.job = self.widget.after(0, self._tick)
+        elif on_done is not None:
+            on_done()
+
+    def cancel(self):
+        if self.job is not None:
+            self.widget.after_cancel(self.job)
+            self.job = None
+        self.items = []
+
+    def is_running(self):
+        return self.job is not None
+
+    def _tick(self):
+        self.job = None
+        deadline = time.perf_counter() + self.budget
+        while self.position < len(self.items):
+            item = self.items[self.position]
+            self.position += 1
+            try:
+                self.render(item)
+            except Exception as e:
+                print(f"Error rendering item: {e}")
+            if time.perf_counter() >= deadline:
+                break
+
+        if self.position < len(self.items):
+            self.job = self.widget.after(self.frame_ms, self._tick)
+        else:
+            self.items = []
+            if self.on_done is not None:
+                self.on_done()
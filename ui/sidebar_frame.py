@@ -35,7 +35,4 @@ class Sidebar(ctk.CTkFrame):
 
     def switch_screen(self, selected_tab):
         """Switch between screens based on selected tab."""
-        if selected_tab != self.parent.current_screen:
-            self.parent.screens[self.parent.current_screen].grid_remove()
-            self.parent.current_screen = selected_tab
-            self.parent.screens[self.parent.current_screen].grid()
+        self.parent.show_screen(selected_tab)  # Builds the screen on first use
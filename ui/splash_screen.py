@@ -3,24 +3,37 @@ from PIL import Image  # For handling the image
 from config import *
 
 class SplashScreen(ctk.CTkFrame):
+    """Covers the window while App loads its data, showing the loaders' real progress."""
     def __init__(self, master):
-        super().__init__(master)
+        super().__init__(master, corner_radius=0)
         self.master = master
-        self.grid(row=0, column=0, sticky="nsew")
-        
-        # Center the splash screen
-        self.place(relx=0.5, rely=0.5, anchor="center")
+
+        # Cover the whole window, above whatever is gridded underneath
+        self.place(relx=0, rely=0, relwidth=1, relheight=1)
 
         # Load the image using CTkImage
         self.image = ctk.CTkImage(
             Image.open(SPLASH_IMG),
             size=(200, 200)  # Adjust the size if needed
         )
-        
+
         # Display the image
         self.image_label = ctk.CTkLabel(self, image=self.image, text="")
-        self.image_label.place(relx=0.5, rely=0.5, anchor="center")
+        self.image_label.place(relx=0.5, rely=0.45, anchor="center")
+
+        self.progress_bar = ctk.CTkProgressBar(self, width=300)
+        self.progress_bar.set(0)
+        self.progress_bar.place(relx=0.5, rely=0.45, y=130, anchor="center")
+
+        self.status_label = ctk.CTkLabel(self, text="Loading...", font=("Arial", 12))
+        self.status_label.place(relx=0.5, rely=0.45, y=155, anchor="center")
+
+    def set_progress(self, fraction, message):
+        """Show how far loading got, fraction between 0 and 1."""
+        self.progress_bar.set(max(0.0, min(1.0, fraction)))
+        self.status_label.configure(text=message)
 
     def hide(self):
-        """Hide the splash screen."""
-        self.grid_forget()
\ No newline at end of file
+        """Remove the splash screen."""
+        self.place_forget()
+        self.destroy()
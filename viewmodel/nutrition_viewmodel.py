@@ -1,30 +1,154 @@
+from contextlib import contextmanager
+from config import *
+from model.intake_log import IntakeLog
+
+# Percentage keys mirror the consumed keys, e.g. "percentage_protein" for CONSUMED_PROTEIN
+PERCENTAGE_KEYS = {CONSUMED_KEYS[nutrient]: f"percentage_{nutrient}" for nutrient in NUTRIENTS}
+
+
 class NutritionViewModel:
     """
     A ViewModel for managing nutrition progress and providing data for display.
     This class connects user actions with the NutritionModel.
+    Observable values (consumed macros, percentages, log_path, date, weight, can_undo and can_redo)
+    are tracked; subscribers are called once per change, or once per batch(), with only the keys that changed.
     """
-    def __init__(self, user_nutrition_model):
+    def __init__(self, user_nutrition_model, ingredient_catalog=None):
         self.user_nutrition_model = user_nutrition_model
+        self.ingredient_catalog = ingredient_catalog
+        self.intake_log = IntakeLog(user_nutrition_model.snapshot())
+        self.subscribers = []  # (callback, set of keys or None for every key)
+        self.batch_depth = 0
+        self.values = self.observed_values()
 
-    def update_nutrition(self, selected_ingredients):  
-        self.user_nutrition_model.update_nutrition(selected_ingredients)
+    def subscribe(self, callback, keys=None):
+        """
+        Call callback(changes) whenever observed values change.
+        :param keys: Only notify when one of these keys changed; None for every key.
+        :return: A function that removes the subscription.
+        """
+        subscription = (callback, set(keys) if keys is not None else None)
+        self.subscribers.append(subscription)
+        return lambda: self.subscribers.remove(subscription) if subscription in self.subscribers else None
+
+    @contextmanager
+    def batch(self):
+        """Coalesce every change made inside the block into a single notification."""
+        self.batch_depth += 1
+        try:
+            yield self
+        finally:
+            self.batch_depth -= 1
+            if self.batch_depth == 0:
+                self.notify_changes()
+
+    def notify_changes(self):
+        """
+        Compare the observed values with the last notified ones and tell the subscribers which keys
+        changed. Call after changing user_nutrition_model directly; inside a batch() it is deferred.
+        """
+        if self.batch_depth:
+            return
+        values = self.observed_values()
+        changes = {key: value for key, value in values.items() if self.values.get(key) != value}
+        self.values = values
+        if not changes:
+            return
+        for callback, keys in list(self.subscribers):
+            if keys is None:
+                callback(changes)
+            elif not keys.isdisjoint(changes):
+                callback({key: value for key, value in changes.items() if key in keys})
+
+    def observed_values(self):
+        values = self.get_nutrition_data()
+        percentages = self.get_nutrition_percentages()
+        for consumed_key, percentage_key in PERCENTAGE_KEYS.items():
+            values[percentage_key] = percentages.get(consumed_key, 0.0)
+        values["log_path"] = self.get_log_path()
+        values["date"] = self.get_date()
+        values["weight"] = self.get_weight()
+        values["can_undo"] = self.intake_log.can_undo()
+        values["can_redo"] = self.intake_log.can_redo()
+        return values
+
+    def update_nutrition(self, selected_ingredients):
+        totals = None
+        if self.ingredient_catalog is not None and selected_ingredients:
+            totals = self.ingredient_catalog.selection_totals(selected_ingredients)
+        self.user_nutrition_model.update_nutrition(selected_ingredients, totals)
+        self.notify_changes()
+
+    def log_intake(self, selected_ingredients):
+        """Commit an intake: update the nutrition, bump the catalog usage and record it for undo."""
+        totals = None
+        servings_source = selected_ingredients
+        if self.ingredient_catalog is not None and selected_ingredients:
+            totals = self.ingredient_catalog.selection_totals(selected_ingredients)
+            # Recipes count as one vector in the totals but are stored as their components
+            servings_source = self.ingredient_catalog.expand_recipes(selected_ingredients)
+        servings, totals = self.user_nutrition_model.intake_delta(servings_source, totals)
+        usage = self.ingredient_catalog.record_usage(selected_ingredients) if self.ingredient_catalog is not None else []
+        event = self.intake_log.record(servings, totals, usage)
+        self.user_nutrition_model.apply_intake(servings, totals, intake_id=event["id"])
+        self.notify_changes()
+
+    def undo_intake(self):
+        """
+        Take the newest intake back by applying its inverse delta.
+        :return: True if an intake was undone.
+        """
+        event = self.intake_log.undo()
+        if event is None:
+            return False
+        self.user_nutrition_model.apply_intake(event["servings"], event["totals"], sign=-1, intake_id=event["id"])
+        if self.ingredient_catalog is not None:
+            self.ingredient_catalog.revert_usage(event["usage"])
+        self.notify_changes()
+        return True
+
+    def redo_intake(self):
+        """
+        Re-apply the last undone intake.
+        :return: True if an intake was redone.
+        """
+        event = self.intake_log.redo()
+        if event is None:
+            return False
+        self.user_nutrition_model.apply_intake(event["servings"], event["totals"], intake_id=event["id"])
+        if self.ingredient_catalog is not None:
+            self.ingredient_catalog.apply_usage(event["usage"])
+        self.notify_changes()
+        return True
+
+    def set_log_path(self, log_path):
+        self.user_nutrition_model.log_path = log_path
+        self.notify_changes()
+
+    def set_date(self, date):
+        self.user_nutrition_model.date = date
+        self.notify_changes()
+
+    def set_weight(self, weight):
+        self.user_nutrition_model.weight = weight
+        self.notify_changes()
 
     def get_date(self):
         return self.user_nutrition_model.get_date()
-    
+
     def get_weight(self):
         return self.user_nutrition_model.get_weight()
-    
+
     def get_log_path(self):
         return self.user_nutrition_model.get_log_path()
-    
+
     def get_nutrition_data(self):
         """
         Returns the current nutrition data (protein, carbs, calories).
         :return: A dictionary with the current nutrition data.
         """
         return self.user_nutrition_model.get_nutrition_data()
-    
+
     def get_nutrition_percentages(self):
         """
         Returns the current nutrition progress as a percentage.
@@ -32,6 +156,27 @@ class NutritionViewModel:
         """
         return self.user_nutrition_model.get_nutrition_percentages()
 
+    def get_goals(self):
+        return self.user_nutrition_model.get_goals()
+
+    def get_remaining_nutrition(self):
+        return self.user_nutrition_model.get_remaining_nutrition()
+
+    def suggest_portions(self, frequent_only=False):
+        """
+        Suggest ingredient portions that close the gap to today's goals.
+        :return: MacroSolver suggestions, best first; empty without a catalog.
+        """
+        if self.ingredient_catalog is None:
+            return []
+        from model.macro_solver import MacroSolver  # Loads numpy; only needed once suggestions are asked for
+
+        solver = MacroSolver(self.ingredient_catalog)
+        return solver.suggest(self.get_remaining_nutrition(), self.get_goals(), frequent_only=frequent_only)
+
+    def get_recent_servings(self, limit=RECENT_SERVINGS_SHOWN):
+        return self.user_nutrition_model.get_recent_servings(limit)
+
     def get_consumed_ingredients(self):
         return self.user_nutrition_model.get_consumed_ingredients()
-    
\ No newline at end of file
+